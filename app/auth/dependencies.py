@@ -1,149 +1,27 @@
-from fastapi import Depends, HTTPException, status, Header
-from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
-from ..database.database import get_db
-from ..models.user_model import User
-from typing import Optional
-from datetime import datetime
+"""
+Compatibilidad: la resolución del usuario autenticado vive en app.core.security.
 
-security = HTTPBearer(auto_error=False, description="Bearer token authentication")
+Este módulo solo re-exporta esas dependencias con los nombres históricos para
+no romper imports existentes. No agregar lógica aquí.
+"""
+from ..core.security import (
+    security,
+    get_current_user,
+    get_current_active_admin_user as get_current_admin,
+    get_current_principal,
+    get_current_active_principal,
+)
 
-# Configuración del JWT (asegúrate de tener estas variables en tu configuración)
-SECRET_KEY = "tu_clave_secreta_muy_segura"  # Cambia esto por tu clave secreta real
-ALGORITHM = "HS256"
+# Los nombres antiguos validaban el mismo header "Authorization: Bearer <token>"
+get_user_from_header_token = get_current_user
+validate_token_and_get_user = get_current_user
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) ->  User:
-    """
-    Obtiene el usuario actual basado en el token Bearer.
-    Permite usar el token directamente en el header Authorization.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    if not credentials:
-        raise credentials_exception
-    
-    token = credentials.credentials
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
-
-def get_current_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """
-    Verifica que el usuario actual tenga privilegios de administrador.
-    """
-    if current_user.user_type != 'admin':
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="The user doesn't have enough privileges"
-        )
-    return current_user
-
-# Alternativa: Función que acepta token directamente desde header personalizado
-def get_user_from_header_token(
-    authorization: Optional[str] = Header(None, description="Bearer token"),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Alternativa que acepta el token desde un header personalizado.
-    Uso: Authorization: Bearer <token>
-    """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authorization header missing"
-        )
-    
-    try:
-        # Extraer el token del header "Bearer <token>"
-        if not authorization.startswith("Bearer "):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authorization header format. Use: Bearer <token>"
-            )
-        
-        token = authorization.split(" ")[1]
-        
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    return user
-
-def validate_token_and_get_user(
-    credentials: HTTPAuthorizationCredentials,
-    db: Session 
-) -> User:
-    """
-    Función auxiliar para validar el token y obtener el usuario
-    
-    """
-    try:
-        # El token ya viene sin el prefijo "Bearer " gracias a HTTPBearer
-        token = credentials.credentials
-        print(f"Validating token: {token[:20]}...")  # Debug: Imprimir parte del token
-        
-        # Decodificar el token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing user email",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Buscar usuario en la base de datos
-        user = db.query(User).filter(User.email == email).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-            
-        return user
-        
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+__all__ = [
+    "security",
+    "get_current_user",
+    "get_current_admin",
+    "get_user_from_header_token",
+    "validate_token_and_get_user",
+    "get_current_principal",
+    "get_current_active_principal",
+]
@@ -18,6 +18,23 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int = 30
+
+    # Backend JWT ("jose" o "pyjwt") y rotación de claves por kid.
+    # jwt_keys: "kid1:secret1,kid2:secret2" o JSON; sin definir se usa secret_key
+    jwt_backend: str = "jose"
+    jwt_keys: Optional[str] = None
+    jwt_active_kid: Optional[str] = None
+
+    refresh_token_expire_days: int = 7
+
+    # Revocación de tokens (filtro de Bloom en memoria + tabla revoked_tokens)
+    revocation_filter_capacity: int = 100000
+    revocation_filter_error_rate: float = 0.001
+    revocation_sync_interval_seconds: int = 30
+
+    # Autorización solo con claims del token (sin consultar users)
+    auth_claims_only: bool = False
+    auth_claims_max_age_seconds: int = 300
     
      # SMTP Configuration
     smtp_server: str = "smtp.gmail.com"
@@ -33,6 +50,84 @@ class Settings(BaseSettings):
     # Database testing mode
     db_testing_mode: bool = False
 
+    # Aplicar migraciones pendientes al arrancar (solo desarrollo)
+    db_auto_migrate: bool = False
+
+    # Engine asíncrono (rutas de lectura de productos y categorías).
+    # Sin async_database_url se deriva de database_url (pymysql -> aiomysql)
+    db_async_mode: bool = False
+    async_database_url: Optional[str] = None
+
+    # Pool de conexiones. Con db_pool_adaptive el tamaño se ajusta entre
+    # min y max según el p95 de espera de checkout
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_adaptive: bool = False
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 20
+    db_pool_target_wait_ms: float = 50
+    db_pool_adapt_interval_seconds: int = 30
+    # Abrir db_pool_size conexiones en segundo plano al arrancar
+    db_pool_prewarm: bool = True
+    # Espera máxima por una conexión libre del pool (después responde 503)
+    db_pool_timeout_seconds: float = 30
+    # Tiempo máximo por consulta SELECT si la ruta no declara statement_timeout()
+    # (0 desactiva; en MySQL se aplica con el hint MAX_EXECUTION_TIME)
+    db_statement_timeout_ms: int = 5000
+
+    # Header Server-Timing con consultas y tiempo de BD de cada petición
+    # (el SQL de la consulta más lenta solo con db_testing_mode)
+    server_timing_header: bool = True
+
+    # Detector de N+1 y presupuestos de consultas por ruta: off | log | raise
+    # (sin definir: "log" con db_testing_mode, "off" en otro caso)
+    query_detector_mode: Optional[str] = None
+    n_plus_one_threshold: int = 5
+
+    # Búsqueda de productos: fulltext (MySQL) | memory (BM25 por worker) | like
+    # (sin definir: fulltext con MySQL, memory en otro caso)
+    search_backend: Optional[str] = None
+    search_index_sync_interval_seconds: int = 30
+
+    # Autocompletado /products/suggest: reconstrucción completa del índice de
+    # prefijos (popularidad y cambios de otros workers)
+    suggest_rebuild_interval_seconds: int = 300
+
+    # Búsqueda difusa (fuzzy=true): reconstrucción completa del índice de trigramas
+    fuzzy_index_rebuild_interval_seconds: int = 300
+
+    # Réplicas de lectura (URLs separadas por coma) y read-your-writes
+    replica_database_urls: Optional[str] = None
+    replica_retry_seconds: int = 30
+    read_your_writes_seconds: int = 5
+
+    # Límite de intentos de login (ventana deslizante por email y por IP)
+    login_rate_limit_window_seconds: int = 300
+    login_rate_limit_per_email: int = 10
+    login_rate_limit_per_ip: int = 50
+    login_rate_limit_max_keys: int = 100000
+    login_rate_limit_redis_url: Optional[str] = None
+    trust_forwarded_for: bool = False
+
+    # Escritura diferida de users.last_login
+    last_login_flush_interval_seconds: int = 5
+    last_login_flush_batch_size: int = 500
+
+    # Principal cache (usuarios autenticados). El TTL se acota a 60 s: es lo
+    # que tarda otro worker en ver un usuario desactivado o con otro rol
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: int = 60
+
+    # Pool de hashing de contraseñas (bcrypt)
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 16
+
+    # Costo de bcrypt: si bcrypt_rounds no se define se calibra al arrancar
+    bcrypt_rounds: Optional[int] = None
+    bcrypt_target_ms: int = 250
+    bcrypt_min_rounds: int = 10
+    bcrypt_max_rounds: int = 14
+
     class Config:
         env_file = ".env"
         case_sensitive = False
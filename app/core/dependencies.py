@@ -1,5 +1,10 @@
 from fastapi import Depends, HTTPException, status
-from .security import get_current_active_user, get_current_active_admin_user
+from .security import (
+    Principal,
+    get_current_active_user,
+    get_current_active_admin_user,
+    get_current_active_admin_principal,
+)
 from ..models.user_model import User
 
 # Dependencias para usuarios normales (tokens normales)
@@ -58,4 +63,31 @@ def get_current_admin_or_staff_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para realizar esta acción. Se requiere rol ADMIN o STORE_STAFF."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+# Variantes con Principal: con AUTH_CLAIMS_ONLY autorizan sin consultar la base de datos
+def get_current_admin_principal(
+    principal: Principal = Depends(get_current_active_admin_principal)
+) -> Principal:
+    """
+    Igual que get_current_admin_user pero retorna el Principal del token
+    """
+    if principal.user_type != 'admin':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para realizar esta acción. Se requiere rol ADMIN."
+        )
+    return principal
+
+def get_current_admin_or_staff_principal(
+    principal: Principal = Depends(get_current_active_admin_principal)
+) -> Principal:
+    """
+    Igual que get_current_admin_or_staff_user pero retorna el Principal del token
+    """
+    if principal.user_type not in ['admin', 'store_staff']:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para realizar esta acción. Se requiere rol ADMIN o STORE_STAFF."
+        )
+    return principal
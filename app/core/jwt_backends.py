@@ -0,0 +1,164 @@
+# app/core/jwt_backends.py
+"""
+Backends de firma/verificación JWT (python-jose o PyJWT).
+
+Las claves se parsean una sola vez al construir el KeySet (objetos Key de
+jose o claves de PyJWT) en lugar de en cada encode/decode. Cada token lleva
+el header "kid" de la clave con la que se firmó, así se puede rotar la clave
+activa sin invalidar los tokens ya emitidos.
+"""
+import json
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KID = "default"
+
+
+class JWTError(Exception):
+    """Token inválido, expirado o firmado con una clave desconocida"""
+
+
+def parse_keys(raw: Optional[str]) -> Dict[str, str]:
+    """
+    Parsea JWT_KEYS. Acepta JSON ({"kid": "secret"}) o "kid1:secret1,kid2:secret2"
+    """
+    if not raw:
+        return {}
+    raw = raw.strip()
+    if raw.startswith("{"):
+        return {str(kid): str(secret) for kid, secret in json.loads(raw).items()}
+
+    keys = {}
+    for item in raw.split(","):
+        kid, sep, secret = item.strip().partition(":")
+        if not sep or not kid or not secret:
+            raise ValueError(f"Invalid JWT_KEYS entry: {item!r}")
+        keys[kid] = secret
+    return keys
+
+
+class KeySet:
+    """
+    Claves de firma por kid. active_kid firma los tokens nuevos; el resto
+    solo verifica. Los tokens sin kid o con kid "default" (emitidos antes de
+    configurar JWT_KEYS) se verifican con legacy_kid.
+    """
+
+    def __init__(self, keys: Dict[str, str], active_kid: str, legacy_kid: Optional[str] = None):
+        if active_kid not in keys:
+            raise ValueError(f"Active JWT kid {active_kid!r} is not in the key set")
+        self.keys = keys
+        self.active_kid = active_kid
+        self.legacy_kid = legacy_kid if legacy_kid in keys else active_kid
+
+    def resolve_kid(self, kid: Optional[str]) -> str:
+        """kid con el que verificar un token (sin kid o "default" => clave de SECRET_KEY)"""
+        if not kid or (kid == DEFAULT_KID and kid not in self.keys):
+            return self.legacy_kid
+        return kid
+
+    @classmethod
+    def from_settings(cls, settings) -> "KeySet":
+        keys = parse_keys(settings.jwt_keys)
+        if not keys:
+            return cls({DEFAULT_KID: settings.secret_key}, DEFAULT_KID)
+
+        active_kid = settings.jwt_active_kid or next(iter(keys))
+        # Los tokens sin kid se firmaron con SECRET_KEY
+        legacy_kid = next((kid for kid, secret in keys.items() if secret == settings.secret_key), None)
+        return cls(keys, active_kid, legacy_kid)
+
+
+class JoseBackend:
+    """python-jose con objetos Key precomputados"""
+
+    name = "jose"
+
+    def __init__(self, key_set: KeySet, algorithm: str):
+        from jose import jwk, jwt
+        from jose.exceptions import JOSEError
+
+        self._jwt = jwt
+        self._error = JOSEError
+        self.algorithm = algorithm
+        self.key_set = key_set
+        self._keys = {kid: jwk.construct(secret, algorithm) for kid, secret in key_set.keys.items()}
+        # Con una sola clave no hace falta leer el header para elegirla
+        self._single_key = next(iter(self._keys.values())) if len(self._keys) == 1 else None
+
+    def encode(self, claims: dict) -> str:
+        kid = self.key_set.active_kid
+        return self._jwt.encode(claims, self._keys[kid], algorithm=self.algorithm, headers={"kid": kid})
+
+    def decode(self, token: str) -> dict:
+        try:
+            key = self._single_key
+            if key is None:
+                key = self._keys.get(self._kid(token))
+            if key is None:
+                raise JWTError("Unknown key id")
+            return self._jwt.decode(token, key, algorithms=[self.algorithm])
+        except self._error as e:
+            raise JWTError(str(e))
+
+    def _kid(self, token: str) -> str:
+        return self.key_set.resolve_kid(self._jwt.get_unverified_header(token).get("kid"))
+
+
+class PyJWTBackend:
+    """PyJWT con claves preparadas una sola vez por el algoritmo"""
+
+    name = "pyjwt"
+
+    def __init__(self, key_set: KeySet, algorithm: str):
+        import jwt
+
+        self._jwt = jwt
+        self.algorithm = algorithm
+        self.key_set = key_set
+        alg = jwt.get_algorithm_by_name(algorithm)
+        self._signing_keys = {kid: alg.prepare_key(secret) for kid, secret in key_set.keys.items()}
+        # Con claves asimétricas se verifica con la clave pública
+        self._verifying_keys = {
+            kid: key.public_key() if hasattr(key, "public_key") else key
+            for kid, key in self._signing_keys.items()
+        }
+        self._single_key = (
+            next(iter(self._verifying_keys.values())) if len(self._verifying_keys) == 1 else None
+        )
+        self._options = {"verify_aud": False}
+
+    def encode(self, claims: dict) -> str:
+        kid = self.key_set.active_kid
+        return self._jwt.encode(
+            claims, self._signing_keys[kid], algorithm=self.algorithm, headers={"kid": kid}
+        )
+
+    def decode(self, token: str) -> dict:
+        try:
+            key = self._single_key
+            if key is None:
+                kid = self.key_set.resolve_kid(self._jwt.get_unverified_header(token).get("kid"))
+                key = self._verifying_keys.get(kid)
+            if key is None:
+                raise JWTError("Unknown key id")
+            # Mismo comportamiento que jose: "aud" no se valida si no se configura
+            return self._jwt.decode(token, key, algorithms=[self.algorithm], options=self._options)
+        except self._jwt.PyJWTError as e:
+            raise JWTError(str(e))
+
+
+BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+def create_backend(name: str, key_set: KeySet, algorithm: str):
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend {name!r} (expected one of {', '.join(BACKENDS)})")
+    return backend_class(key_set, algorithm)
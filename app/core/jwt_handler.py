@@ -1,18 +1,52 @@
 # app/core/jwt_handler.py
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
+import uuid
 import bcrypt
 from fastapi.security import HTTPBearer
+from ..config import settings
+from .jwt_backends import JWTError, KeySet, create_backend
+from .permissions import permission_registry
 
-# Configuración
-SECRET_KEY = "tu_clave_secreta_muy_segura"  # Cambia esto en producción
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Configuración (una sola fuente: variables de entorno)
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 ADMIN_ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Backend JWT (jose o pyjwt) con las claves ya parseadas; ver jwt_backends.py.
+# Las claves se validan al importar; el backend (que importa jose/cryptography)
+# se crea en el primer uso o en el pre-calentamiento del arranque
+JWT_KEY_SET = KeySet.from_settings(settings)
+_jwt_backend = None
+
+
+def get_jwt_backend():
+    global _jwt_backend
+    if _jwt_backend is None:
+        _jwt_backend = create_backend(settings.jwt_backend, JWT_KEY_SET, ALGORITHM)
+    return _jwt_backend
+
+
 security = HTTPBearer()
 
+def token_claims(user, is_admin: bool = False) -> dict:
+    """
+    Claims de identidad que se firman en los tokens de acceso
+    """
+    claims = {
+        "sub": user.email,
+        "user_id": user.user_id,
+        "username": user.username,
+        "user_type": user.user_type,
+        "active": user.is_active
+    }
+    if is_admin:
+        claims["role"] = user.user_type
+        # Máscara de permisos del rol (ver app/core/permissions.py)
+        claims["perms"] = permission_registry.mask_for_role(user.user_type)
+    return claims
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, is_admin: bool = False) -> str:
     """
     Crear token de acceso con información del rol
@@ -28,21 +62,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, i
     to_encode.update({
         "exp": expire, 
         "iat": datetime.now(timezone.utc),
+        "jti": uuid.uuid4().hex,
         "token_type": "admin" if is_admin else "user"
         })
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = get_jwt_backend().encode(to_encode)
     return encoded_jwt
 
+def create_refresh_token(data: dict, is_admin: bool = False) -> str:
+    """
+    Crear refresh token de larga duración. Solo sirve para /auth/refresh;
+    el scope indica si emite tokens de usuario o de administrador.
+    """
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "sub": data["sub"],
+        "user_id": data["user_id"],
+        "exp": now + timedelta(days=settings.refresh_token_expire_days),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+        "token_type": "refresh",
+        "scope": "admin" if is_admin else "user",
+    }
+    return get_jwt_backend().encode(to_encode)
+
 def create_admin_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crear token específico para administradores
     """
     return create_access_token(data, expires_delta, is_admin=True)
 
+def decode_token(token: str) -> dict:
+    """
+    Decodifica y valida el token. Lanza JWTError si es inválido o expiró
+    """
+    return get_jwt_backend().decode(token)
+
 def verify_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         return payload
     except JWTError:
         return None
@@ -61,11 +119,22 @@ def verify_admin_token(token: str) -> dict:
     
     return payload
 
+def verify_refresh_token(token: str) -> dict:
+    """
+    Verificar que el token es un refresh token válido
+    """
+    payload = verify_token(token)
+    if not payload or payload.get("token_type") != "refresh":
+        return None
+    return payload
+
 def get_password_hash(password: str) -> str:
     """
-    Genera un hash de la contraseña usando bcrypt
+    Genera un hash de la contraseña usando bcrypt con el costo configurado
+    (o el calibrado al arrancar)
     """
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    rounds = settings.bcrypt_rounds or 12
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
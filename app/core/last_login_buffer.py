@@ -0,0 +1,123 @@
+# app/core/last_login_buffer.py
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.database import SessionLocal
+from ..models.user_model import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Buffer write-behind de users.last_login.
+
+    El login solo anota el timestamp en memoria; flush() escribe todos los
+    pendientes con un único UPDATE ... SET last_login = CASE user_id ... por
+    lote. Varios logins del mismo usuario entre flushes se fusionan en una
+    sola escritura (se conserva el más reciente).
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        # Un solo flush a la vez (tarea periódica vs. shutdown)
+        self._flush_lock = threading.Lock()
+        self.recorded = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, user_id: int, logged_in_at: datetime) -> None:
+        with self._lock:
+            self.recorded += 1
+            current = self._pending.get(user_id)
+            if current is not None:
+                self.coalesced += 1
+                if current >= logged_in_at:
+                    return
+            self._pending[user_id] = logged_in_at
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Escribe los timestamps pendientes. Retorna cuántas filas se actualizaron"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            own_session = db is None
+            db = db or SessionLocal()
+            started = time.perf_counter()
+            written = 0
+            items = list(pending.items())
+            try:
+                for start in range(0, len(items), self.batch_size):
+                    batch = dict(items[start:start + self.batch_size])
+                    db.execute(
+                        update(User)
+                        .where(User.user_id.in_(batch.keys()))
+                        .values(last_login=case(batch, value=User.user_id))
+                        .execution_options(synchronize_session=False)
+                    )
+                    written += len(batch)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._requeue(pending)
+                with self._lock:
+                    self.failures += 1
+                logger.warning(f"Failed to flush {len(pending)} last_login updates: {str(e)}")
+                return 0
+            finally:
+                if own_session:
+                    db.close()
+
+            with self._lock:
+                self.flushes += 1
+                self.rows_written += written
+                self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return written
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "recorded": self.recorded,
+                "coalesced": self.coalesced,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "failures": self.failures,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "flush_interval_seconds": settings.last_login_flush_interval_seconds,
+            }
+
+    def _requeue(self, pending: Dict[int, datetime]) -> None:
+        # Devolver al buffer lo que no se pudo escribir sin pisar logins más nuevos
+        with self._lock:
+            for user_id, logged_in_at in pending.items():
+                current = self._pending.get(user_id)
+                if current is None or current < logged_in_at:
+                    self._pending[user_id] = logged_in_at
+
+
+# Instancia global (una por proceso/worker)
+last_login_buffer = LastLoginBuffer(batch_size=settings.last_login_flush_batch_size)
+
+
+async def run_last_login_flush(interval_seconds: int) -> None:
+    """Tarea de fondo: vacía el buffer de last_login cada interval_seconds"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(last_login_buffer.flush)
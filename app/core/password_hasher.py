@@ -0,0 +1,232 @@
+# app/core/password_hasher.py
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import bcrypt
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+from .jwt_handler import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashPoolSaturated(Exception):
+    """El pool de hashing no tiene workers ni cola disponibles"""
+
+
+class _OperationMetrics:
+    """Latencias acumuladas de una operación (hash o verify)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_wait_ms = 0.0
+
+    def record(self, wait_ms: float, duration_ms: float, failed: bool) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.total_wait_ms += wait_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if failed:
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "avg_queue_wait_ms": round(self.total_wait_ms / self.count, 3) if self.count else 0.0,
+        }
+
+
+class PasswordHashPool:
+    """
+    Pool dedicado para el trabajo de bcrypt.
+
+    bcrypt libera el GIL, así que un ThreadPoolExecutor propio basta para
+    sacar el hashing del threadpool de anyio. La admisión está acotada a
+    max_workers + max_queue tareas; cuando se supera se rechaza al instante
+    en lugar de encolar sin límite.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._metrics: Dict[str, _OperationMetrics] = {
+            "hash": _OperationMetrics(),
+            "verify": _OperationMetrics(),
+        }
+
+    async def run(self, operation: str, func: Callable, *args):
+        """Ejecuta func(*args) en el pool. Lanza PasswordHashPoolSaturated si está lleno"""
+        metrics = self._metrics[operation]
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                metrics.rejected += 1
+            raise PasswordHashPoolSaturated()
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            failed = False
+            try:
+                return func(*args)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    metrics.record(
+                        wait_ms=(started - submitted) * 1000,
+                        duration_ms=(finished - started) * 1000,
+                        failed=failed,
+                    )
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self.run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run("verify", verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "operations": {name: m.as_dict() for name, m in self._metrics.items()},
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+# Instancia global (una por proceso/worker)
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_queue_size,
+)
+
+
+def _saturated_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Genera el hash bcrypt en el pool dedicado (503 si está saturado)"""
+    try:
+        return await password_hash_pool.hash(password)
+    except PasswordHashPoolSaturated:
+        raise _saturated_exception()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica la contraseña en el pool dedicado (503 si está saturado)"""
+    try:
+        return await password_hash_pool.verify(plain_password, hashed_password)
+    except PasswordHashPoolSaturated:
+        raise _saturated_exception()
+
+
+def bcrypt_cost(hashed_password: str) -> Optional[int]:
+    """Extrae el work factor de un hash bcrypt ($2b$12$...)"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True si el hash se generó con un costo menor al configurado.
+
+    Solo se sube el costo: cada worker calibra el suyo y pueden diferir en una
+    ronda, así que bajar el costo haría que los workers se pisen rehasheando
+    al mismo usuario en cada login.
+    """
+    if settings.bcrypt_rounds is None:
+        return False
+    cost = bcrypt_cost(hashed_password)
+    return cost is None or cost < settings.bcrypt_rounds
+
+
+def calibrate_bcrypt_rounds(target_ms: Optional[int] = None) -> int:
+    """
+    Elige el mayor costo de bcrypt cuyo hash tarda como máximo target_ms en
+    este host y lo guarda en settings.bcrypt_rounds.
+
+    Se mide el costo mínimo y se extrapola: cada ronda extra duplica el tiempo.
+    """
+    target_ms = target_ms or settings.bcrypt_target_ms
+    min_rounds = settings.bcrypt_min_rounds
+    max_rounds = settings.bcrypt_max_rounds
+
+    sample = b"calibration-password"
+    timings = []
+    for _ in range(3):
+        salt = bcrypt.gensalt(rounds=min_rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(sample, salt)
+        timings.append((time.perf_counter() - started) * 1000)
+    base_ms = min(timings)
+
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+
+    settings.bcrypt_rounds = rounds
+    logger.info(
+        f"bcrypt calibrated: {rounds} rounds (~{base_ms * 2 ** (rounds - min_rounds):.0f} ms, target {target_ms} ms)"
+    )
+    return rounds
+
+
+async def rehash_if_needed(user, plain_password: str) -> bool:
+    """
+    Regenera user.password_hash si su costo es menor al configurado.
+    Debe llamarse después de verificar la contraseña; el commit queda a cargo
+    del llamador. Si el pool está saturado se omite sin afectar el login.
+    """
+    if not needs_rehash(user.password_hash):
+        return False
+    try:
+        user.password_hash = await password_hash_pool.hash(plain_password)
+    except PasswordHashPoolSaturated:
+        return False
+    return True
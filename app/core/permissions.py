@@ -0,0 +1,113 @@
+# app/core/permissions.py
+"""
+Registro de permisos compilado a máscaras de bits.
+
+Cada permiso ocupa un bit y cada rol se compila una sola vez a un entero.
+La máscara del rol viaja en el claim "perms" de los tokens admin, así que
+verificar un permiso es un AND de enteros sobre el Principal, sin listas de
+strings ni lecturas extra a la base de datos.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Depends, HTTPException, status
+
+# Permisos (el orden define el bit; agregar siempre al final)
+MANAGE_USERS = "manage_users"
+MANAGE_BOOKS = "manage_books"
+VIEW_REPORTS = "view_reports"
+MANAGE_ORDERS = "manage_orders"
+MANAGE_INVENTORY = "manage_inventory"
+SYSTEM_SETTINGS = "system_settings"
+
+PERMISSIONS = (
+    MANAGE_USERS,
+    MANAGE_BOOKS,
+    VIEW_REPORTS,
+    MANAGE_ORDERS,
+    MANAGE_INVENTORY,
+    SYSTEM_SETTINGS,
+)
+
+ROLE_PERMISSIONS = {
+    'admin': [
+        MANAGE_USERS,
+        MANAGE_BOOKS,
+        VIEW_REPORTS,
+        MANAGE_ORDERS,
+        MANAGE_INVENTORY,
+        SYSTEM_SETTINGS,
+    ],
+    'store_staff': [
+        MANAGE_BOOKS,
+        MANAGE_ORDERS,
+        MANAGE_INVENTORY,
+        VIEW_REPORTS,
+    ],
+}
+
+
+class PermissionRegistry:
+    """
+    Compila permisos y roles a bits al construirse. Las listas de nombres
+    por rol también se precalculan (se devuelven en login y verify-token).
+    """
+
+    def __init__(self, permissions: Iterable[str], role_permissions: Dict[str, List[str]]):
+        self._bits: Dict[str, int] = {name: 1 << index for index, name in enumerate(permissions)}
+        self._role_masks: Dict[str, int] = {
+            role: self.mask(names) for role, names in role_permissions.items()
+        }
+        self._role_names: Dict[str, Tuple[str, ...]] = {
+            role: tuple(names) for role, names in role_permissions.items()
+        }
+
+    def bit(self, permission: str) -> int:
+        try:
+            return self._bits[permission]
+        except KeyError:
+            raise ValueError(f"Unknown permission: {permission!r}")
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        result = 0
+        for permission in permissions:
+            result |= self.bit(permission)
+        return result
+
+    def mask_for_role(self, role: str) -> int:
+        return self._role_masks.get(role, 0)
+
+    def names_for_role(self, role: str) -> List[str]:
+        return list(self._role_names.get(role, ()))
+
+    def names(self, mask: int) -> List[str]:
+        """Nombres de los permisos activos en la máscara"""
+        return [name for name, bit in self._bits.items() if mask & bit]
+
+
+# Instancia global
+permission_registry = PermissionRegistry(PERMISSIONS, ROLE_PERMISSIONS)
+
+
+def require(*permissions: str):
+    """
+    Dependencia que exige todos los permisos indicados a un token admin.
+
+    Los nombres se validan al declarar la ruta; en cada petición solo se
+    compara la máscara del Principal (claim "perms" o la del rol del usuario).
+    """
+    # Import diferido: security importa este módulo para calcular máscaras
+    from .security import Principal, get_current_active_admin_principal
+
+    required = permission_registry.mask(permissions)
+
+    def check_permissions(
+        principal: Principal = Depends(get_current_active_admin_principal)
+    ) -> Principal:
+        if principal.permissions & required != required:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes permisos para realizar esta acción."
+            )
+        return principal
+
+    return check_permissions
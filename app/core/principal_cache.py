@@ -0,0 +1,186 @@
+# app/core/principal_cache.py
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+
+from ..config import settings
+from ..models.user_model import User
+
+logger = logging.getLogger(__name__)
+
+# Techo del TTL: es la ventana máxima en que otro worker sigue aceptando a un
+# usuario desactivado o con otro rol (los cambios no se propagan entre workers)
+MAX_TTL_SECONDS = 60
+
+
+def snapshot_user(user: User) -> User:
+    """
+    Crea una copia transitoria (sin sesión) del usuario con sus columnas.
+    Se puede compartir entre peticiones sin depender de la sesión original.
+    """
+    data = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    return User(**data)
+
+
+class PrincipalCache:
+    """
+    Cache LRU con TTL de usuarios autenticados, indexada por el digest del token.
+
+    Es por proceso y eventualmente consistente: los eventos del ORM invalidan
+    solo la cache del worker que hizo el cambio, y un update() de Core no
+    dispara ninguno. En los demás casos un usuario desactivado o con otro rol
+    sigue vigente hasta el TTL, acotado a MAX_TTL_SECONDS. Por eso solo se usa
+    con tokens de usuario; las rutas admin leen siempre la tabla users.
+
+    En un hit se evita tanto la decodificación del JWT como la consulta a la
+    tabla users. Cada entrada guarda el jti del token: la revocación se
+    verifica también en los hits (filtro de Bloom, sin consultar la base de
+    datos en el caso común). Las entradas caducan con el TTL configurado o con
+    la expiración del token (lo que ocurra antes).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        if ttl_seconds > MAX_TTL_SECONDS:
+            logger.warning(
+                f"Principal cache TTL of {ttl_seconds}s exceeds the {MAX_TTL_SECONDS}s limit; using {MAX_TTL_SECONDS}s"
+            )
+            ttl_seconds = MAX_TTL_SECONDS
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, User, Optional[str]]]" = OrderedDict()
+        self._keys_by_email: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(token: str, scope: str) -> str:
+        """Clave de cache: ámbito del token (user/admin) + sha256 del token"""
+        return f"{scope}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Tuple[User, Optional[str]]]:
+        """(usuario, jti del token) o None si no hay entrada vigente"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user, jti = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user, jti
+
+    def set(self, key: str, user: User, token_exp: Optional[float] = None, jti: Optional[str] = None) -> None:
+        """
+        Guarda una copia del usuario. token_exp es el claim "exp" (epoch) del
+        token; la entrada nunca sobrevive al token. jti se verifica contra la
+        lista de revocación en cada hit.
+        """
+        if self.max_size <= 0:
+            return
+
+        ttl = float(self.ttl_seconds)
+        if token_exp is not None:
+            ttl = min(ttl, float(token_exp) - time.time())
+        if ttl <= 0:
+            return
+
+        snapshot = snapshot_user(user)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, snapshot, jti)
+            self._keys_by_email.setdefault(snapshot.email, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_email(self, email: str) -> int:
+        """Elimina todas las entradas de un usuario. Retorna cuántas se borraron"""
+        with self._lock:
+            keys = self._keys_by_email.pop(email, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_email.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "db_reads_saved": self.hits,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        # Debe llamarse con el lock adquirido
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        email = entry[1].email
+        keys = self._keys_by_email.get(email)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_email[email]
+
+
+# Instancia global (una por proceso/worker)
+principal_cache = PrincipalCache(
+    max_size=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+
+def _invalidate_on_change(target, value, oldvalue, initiator):
+    # Solo usuarios persistidos; las copias transitorias de la cache se ignoran
+    if not inspect(target).has_identity:
+        return
+    if value == oldvalue:
+        return
+    principal_cache.invalidate_email(target.email)
+
+
+def _invalidate_on_email_change(target, value, oldvalue, initiator):
+    if not inspect(target).has_identity:
+        return
+    if isinstance(oldvalue, str) and oldvalue != value:
+        principal_cache.invalidate_email(oldvalue)
+
+
+def _invalidate_on_delete(mapper, connection, target):
+    principal_cache.invalidate_email(target.email)
+
+
+# Invalidar cuando se desactiva un usuario, cambia su rol o su email
+event.listen(User.is_active, "set", _invalidate_on_change)
+event.listen(User.user_type, "set", _invalidate_on_change)
+event.listen(User.email, "set", _invalidate_on_email_change, active_history=True)
+event.listen(User, "after_delete", _invalidate_on_delete)
@@ -0,0 +1,215 @@
+# app/core/rate_limiter.py
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateLimitBackend:
+    """
+    Contadores de ventana deslizante en memoria (por proceso/worker).
+
+    Se usa la aproximación de dos ventanas fijas: el conteo estimado es
+    previous * (1 - elapsed / window) + current. Memoria O(1) por clave;
+    las claves menos usadas se descartan al superar max_keys.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [índice de ventana, conteo actual, conteo anterior]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, float]:
+        """
+        Registra un intento. Retorna (permitido, segundos hasta reintentar).
+        Los intentos rechazados no se cuentan.
+        """
+        now = time.time()
+        window_index = int(now // window_seconds)
+        elapsed = now - window_index * window_seconds
+
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = [window_index, 0, 0]
+                self._counters[key] = counter
+            elif counter[0] != window_index:
+                # Avanzar la ventana; si pasó más de una, el conteo anterior es 0
+                previous = counter[1] if counter[0] == window_index - 1 else 0
+                counter[:] = [window_index, 0, previous]
+            self._counters.move_to_end(key)
+
+            estimated = counter[2] * (1 - elapsed / window_seconds) + counter[1]
+            if estimated >= limit:
+                return False, _retry_after(counter[1], counter[2], limit, elapsed, window_seconds)
+
+            counter[1] += 1
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return True, 0.0
+
+    def reset(self, key: str, window_seconds: int) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._counters)
+
+
+class RedisRateLimitBackend:
+    """
+    Mismo algoritmo sobre Redis, compartido entre workers/instancias.
+    Requiere el paquete redis (opcional, no está en requirements.txt).
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis  # dependencia opcional
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, float]:
+        now = time.time()
+        window_index = int(now // window_seconds)
+        elapsed = now - window_index * window_seconds
+        current_key, previous_key = self._window_keys(key, window_index)
+
+        current, previous = self._client.mget(current_key, previous_key)
+        current = int(current or 0)
+        previous = int(previous or 0)
+        if previous * (1 - elapsed / window_seconds) + current >= limit:
+            return False, _retry_after(current, previous, limit, elapsed, window_seconds)
+
+        pipe = self._client.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, window_seconds * 2)
+        pipe.execute()
+        return True, 0.0
+
+    def reset(self, key: str, window_seconds: int) -> None:
+        # Solo existen las claves de la ventana actual y la anterior (expiran
+        # a las dos ventanas): se borran por nombre, sin recorrer el keyspace
+        window_index = int(time.time() // window_seconds)
+        self._client.delete(*self._window_keys(key, window_index))
+
+    @staticmethod
+    def _window_keys(key: str, window_index: int) -> Tuple[str, str]:
+        """(clave de la ventana actual, clave de la anterior)"""
+        return f"login-throttle:{key}:{window_index}", f"login-throttle:{key}:{window_index - 1}"
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def _retry_after(current: int, previous: int, limit: int, elapsed: float, window_seconds: int) -> float:
+    """Segundos hasta que el conteo estimado baje del límite"""
+    if current >= limit:
+        # Hay que esperar a que la ventana actual pase a ser la anterior y decaiga
+        return window_seconds - elapsed + window_seconds * (1 - limit / current)
+    if previous == 0:
+        return window_seconds - elapsed
+    # previous * (1 - t / window) + current < limit  =>  t > window * (1 - (limit - current) / previous)
+    target = window_seconds * (1 - (limit - current) / previous)
+    return max(target - elapsed, 0.0) or 1.0
+
+
+class LoginThrottle:
+    """
+    Limita los intentos de login por email y por IP del cliente.
+
+    Se consulta antes de buscar el usuario o verificar la contraseña, así un
+    ataque de credential stuffing no llega a la base de datos ni a bcrypt.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {"email": 0, "ip": 0}
+        self.backend_errors = 0
+
+    def check(self, email: str, client_ip: Optional[str]) -> None:
+        """Lanza HTTP 429 con Retry-After si se superó alguno de los límites"""
+        limits = [("ip", client_ip, settings.login_rate_limit_per_ip)]
+        limits.append(("email", email.strip().lower(), settings.login_rate_limit_per_email))
+
+        for scope, value, limit in limits:
+            if not value or limit <= 0:
+                continue
+            try:
+                allowed, retry_after = self.backend.hit(
+                    f"{scope}:{value}", limit, settings.login_rate_limit_window_seconds
+                )
+            except Exception as e:
+                # Si el backend compartido falla no se bloquea el login
+                with self._lock:
+                    self.backend_errors += 1
+                logger.warning(f"Login throttle backend error: {str(e)}")
+                continue
+
+            if not allowed:
+                with self._lock:
+                    self.rejected[scope] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please retry later",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+
+        with self._lock:
+            self.allowed += 1
+
+    def reset_email(self, email: str) -> None:
+        """Un login exitoso limpia el contador del email (no el de la IP)"""
+        try:
+            self.backend.reset(f"email:{email.strip().lower()}", settings.login_rate_limit_window_seconds)
+        except Exception as e:
+            logger.warning(f"Login throttle backend error: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "window_seconds": settings.login_rate_limit_window_seconds,
+                "limit_per_email": settings.login_rate_limit_per_email,
+                "limit_per_ip": settings.login_rate_limit_per_ip,
+                "tracked_keys": self.backend.size(),
+                "allowed": self.allowed,
+                "rejected": dict(self.rejected),
+                "backend_errors": self.backend_errors,
+            }
+
+
+def _create_backend():
+    if settings.login_rate_limit_redis_url:
+        try:
+            return RedisRateLimitBackend(settings.login_rate_limit_redis_url)
+        except ImportError:
+            logger.warning("redis package not installed, using in-memory login throttle")
+    return MemoryRateLimitBackend(max_keys=settings.login_rate_limit_max_keys)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """IP del cliente; X-Forwarded-For solo si se confía en el proxy"""
+    if settings.trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+# Instancia global (una por proceso/worker salvo que se use Redis)
+login_throttle = LoginThrottle(_create_backend())
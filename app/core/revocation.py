@@ -0,0 +1,207 @@
+# app/core/revocation.py
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.database import SessionLocal
+from ..models.user_model import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+SYNC_OVERLAP_SECONDS = 5
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray. Sin falsos negativos: si un jti no
+    está en el filtro, seguro que no fue revocado.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Doble hashing (Kirsch-Mitzenmacher) a partir de un único blake2b
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationList:
+    """
+    Lista de tokens revocados: tabla revoked_tokens + filtro de Bloom en memoria.
+
+    Un jti que no está en el filtro se acepta sin consultar la base de datos
+    (el caso común). Solo los positivos del filtro se confirman con una
+    lectura por clave primaria. Cada worker sincroniza periódicamente las
+    revocaciones hechas por otros workers (ver sync()).
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._last_sync: Optional[datetime] = None
+        self.checks = 0
+        self.filter_negatives = 0
+        self.db_confirmations = 0
+        self.false_positives = 0
+
+    def load(self, db: Session) -> int:
+        """Reconstruye el filtro con todas las revocaciones aún vigentes"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        jtis = [row[0] for row in db.query(RevokedToken.jti).filter(RevokedToken.expires_at > now)]
+
+        capacity = max(settings.revocation_filter_capacity, 2 * len(jtis))
+        new_filter = BloomFilter(capacity, self.error_rate)
+        for jti in jtis:
+            new_filter.add(jti)
+
+        with self._lock:
+            self._filter = new_filter
+            self._last_sync = now
+        logger.info(f"Revocation filter loaded with {len(jtis)} tokens")
+        return len(jtis)
+
+    def sync(self, db: Session) -> int:
+        """Agrega al filtro las revocaciones registradas desde la última sincronización"""
+        if self._last_sync is None:
+            return self.load(db)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # Margen para commits en vuelo y pequeñas diferencias de reloj entre hosts
+        since = self._last_sync - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        jtis = [
+            row[0] for row in db.query(RevokedToken.jti).filter(RevokedToken.revoked_at >= since)
+        ]
+        with self._lock:
+            for jti in jtis:
+                self._filter.add(jti)
+            self._last_sync = now
+            needs_rebuild = self._filter.count > self._filter.capacity
+
+        if needs_rebuild:
+            return self.load(db)
+        return len(jtis)
+
+    def is_revoked(self, jti: Optional[str], db: Optional[Session] = None) -> bool:
+        """
+        True si el jti fue revocado. Sin lectura a la base de datos salvo que
+        el filtro dé positivo (y se haya pasado una sesión para confirmarlo).
+        """
+        if not jti:
+            return False
+
+        with self._lock:
+            self.checks += 1
+            maybe_revoked = jti in self._filter
+            if not maybe_revoked:
+                self.filter_negatives += 1
+                return False
+            self.db_confirmations += 1
+
+        if db is None:
+            return True
+
+        revoked = db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+        if not revoked:
+            with self._lock:
+                self.false_positives += 1
+        return revoked
+
+    def revoke(
+        self,
+        db: Session,
+        jti: str,
+        user_id: int,
+        token_type: str,
+        expires_at: datetime,
+    ) -> bool:
+        """
+        Registra la revocación. Retorna False si el jti ya estaba revocado
+        (la clave primaria lo detecta aunque otro worker lo haya revocado).
+        """
+        try:
+            db.add(RevokedToken(
+                jti=jti,
+                user_id=user_id,
+                token_type=token_type,
+                revoked_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                expires_at=expires_at.astimezone(timezone.utc).replace(tzinfo=None),
+            ))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            self._add(jti)
+            return False
+
+        self._add(jti)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "filter_bits": self._filter.size_bits,
+                "filter_hashes": self._filter.hash_count,
+                "filter_capacity": self._filter.capacity,
+                "revoked_in_filter": self._filter.count,
+                "checks": self.checks,
+                "filter_negatives": self.filter_negatives,
+                "db_confirmations": self.db_confirmations,
+                "false_positives": self.false_positives,
+                "last_sync": self._last_sync.isoformat() if self._last_sync else None,
+            }
+
+    def _add(self, jti: str) -> None:
+        with self._lock:
+            self._filter.add(jti)
+
+
+# Instancia global (una por proceso/worker)
+revocation_list = RevocationList(
+    capacity=settings.revocation_filter_capacity,
+    error_rate=settings.revocation_filter_error_rate,
+)
+
+
+def sync_revocation_filter() -> int:
+    """Sincroniza el filtro global con la tabla revoked_tokens (abre su propia sesión)"""
+    db = SessionLocal()
+    try:
+        return revocation_list.sync(db)
+    finally:
+        db.close()
+
+
+async def run_revocation_sync(interval_seconds: int) -> None:
+    """Tarea de fondo: incorpora periódicamente las revocaciones de otros workers"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(sync_revocation_filter)
+        except Exception as e:
+            logger.warning(f"Revocation filter sync failed: {str(e)}")
@@ -1,18 +1,43 @@
+"""
+Resolución única del usuario autenticado.
+
+Todas las dependencias de autenticación viven aquí. Los tokens se validan
+con app.core.jwt_handler (clave y algoritmo desde settings). Además de las
+dependencias que retornan el User completo, hay variantes *_principal que,
+con AUTH_CLAIMS_ONLY activo, autorizan solo con los claims firmados del
+token (sin consultar la base de datos).
+"""
+import logging
+import time
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from ..config import settings
 from ..database.database import get_db
 from ..models.user_model import User
-from .jwt_handler import verify_admin_token
+from .jwt_handler import JWTError, decode_token, verify_token, verify_admin_token
+from .permissions import permission_registry
+from .principal_cache import principal_cache
+from .revocation import revocation_list
 
-# USAR DIRECTAMENTE LOS VALORES EN LUGAR DE SETTINGS
-SECRET_KEY = "tu_clave_secreta_muy_segura"  # LA MISMA QUE EN jwt_handler.py
-ALGORITHM = "HS256"
+logger = logging.getLogger(__name__)
 
 # Inicializar HTTPBearer UNA SOLA VEZ
 security = HTTPBearer(auto_error=False)
 
+def ensure_not_revoked(payload: dict, db: Session) -> None:
+    """
+    Rechaza tokens revocados (logout/rotación). El filtro de Bloom resuelve
+    el caso común sin consultar la base de datos.
+    """
+    if revocation_list.is_revoked(payload.get("jti"), db):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -20,10 +45,6 @@ def get_current_user(
     """
     Función base para obtener el usuario actual desde el token.
     """
-    
-    print(f"=== SECURITY DEBUG ===")
-    print(f"Credentials received: {credentials is not None}")
-    
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,13 +52,23 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token = credentials.credentials
+
+    # Hit en cache: sin decodificar el JWT ni consultar la tabla users, pero
+    # la revocación se verifica igual (un logout en otro worker llega por sync)
+    cache_key = principal_cache.make_key(token, "user")
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        cached_user, jti = cached
+        ensure_not_revoked({"jti": jti}, db)
+        return cached_user
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
     
         email: str = payload.get("sub")
         if email is None:
-            print("Email is None in payload")
+            logger.debug("Token without sub claim")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload"
@@ -50,21 +81,32 @@ def get_current_user(
                 detail="Token de administrador no válido para esta ruta"
             )
             
+    except HTTPException:
+        raise
     except JWTError as e:
-        print(f"JWT Error: {str(e)}")
+        logger.debug(f"Invalid token: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.warning(f"Unexpected error validating token: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token validation failed",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if payload.get("token_type") == "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token cannot be used as access token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    ensure_not_revoked(payload, db)
+
     # Buscar usuario en la base de datos
     user = db.query(User).filter(User.email == email).first()
     if user is None:
@@ -73,6 +115,7 @@ def get_current_user(
             detail="User not found"
         )
     
+    principal_cache.set(cache_key, user, payload.get("exp"), payload.get("jti"))
     return user
 
 def get_current_active_user(
@@ -102,9 +145,11 @@ def get_current_admin_user_from_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token = credentials.credentials
+
+    # Sin principal cache: las otras réplicas no se enteran de un cambio de rol
+    # o una desactivación, así que user_type e is_active se leen siempre
     try:
-        token = credentials.credentials
-        
         # Usar la función específica para verificar tokens admin
         payload = verify_admin_token(token)
         if not payload:
@@ -138,6 +183,8 @@ def get_current_admin_user_from_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    ensure_not_revoked(payload, db)
+
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
@@ -165,4 +212,166 @@ def get_current_active_admin_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuario inactivo"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+class Principal:
+    """
+    Identidad autenticada con los datos que usan las rutas (email, user_id,
+    username, user_type, is_active). Puede construirse solo desde los claims
+    del token o desde un User ya cargado; load_user() obtiene la fila completa
+    de forma perezosa cuando la ruta la necesita.
+    """
+
+    def __init__(
+        self,
+        email: str,
+        user_id: int,
+        user_type: str,
+        is_active: bool,
+        username: Optional[str] = None,
+        token_type: str = "user",
+        user: Optional[User] = None,
+        permissions: Optional[int] = None,
+    ):
+        self.email = email
+        self.user_id = user_id
+        self.user_type = user_type
+        self.is_active = is_active
+        self.username = username
+        self.token_type = token_type
+        # Máscara de permisos: claim "perms" del token o la del rol (solo tokens admin)
+        if permissions is None:
+            permissions = permission_registry.mask_for_role(user_type) if token_type == "admin" else 0
+        self.permissions = permissions
+        self.last_login = user.last_login if user is not None else None
+        self._user = user
+
+    @classmethod
+    def from_user(cls, user: User, token_type: str = "user") -> "Principal":
+        return cls(
+            email=user.email,
+            user_id=user.user_id,
+            user_type=user.user_type,
+            is_active=user.is_active,
+            username=user.username,
+            token_type=token_type,
+            user=user,
+        )
+
+    @property
+    def from_claims(self) -> bool:
+        return self._user is None
+
+    def load_user(self, db: Session) -> User:
+        """Retorna la fila completa del usuario (consulta solo la primera vez)"""
+        if self._user is None:
+            user = db.query(User).filter(User.user_id == self.user_id).first()
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found"
+                )
+            self._user = user
+        return self._user
+
+    def __repr__(self):
+        return f"<Principal {self.email} ({self.user_type})>"
+
+
+def principal_from_claims(payload: Optional[dict], token_type: str) -> Optional[Principal]:
+    """
+    Construye el Principal solo con los claims del token. Retorna None si el
+    modo claims-only está desactivado, faltan claims o el token es más viejo
+    que AUTH_CLAIMS_MAX_AGE_SECONDS (en ese caso se consulta la base de datos).
+    """
+    if not settings.auth_claims_only or not payload:
+        return None
+    if payload.get("token_type") != token_type:
+        return None
+
+    required = ("sub", "user_id", "user_type", "active", "iat")
+    if any(payload.get(claim) is None for claim in required):
+        return None
+    if time.time() - float(payload["iat"]) > settings.auth_claims_max_age_seconds:
+        return None
+
+    return Principal(
+        email=payload["sub"],
+        user_id=payload["user_id"],
+        user_type=payload["user_type"],
+        is_active=bool(payload["active"]),
+        username=payload.get("username"),
+        token_type=token_type,
+        permissions=payload.get("perms"),
+    )
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Principal de un token de usuario. Con claims-only no toca la base de datos.
+    """
+    if credentials:
+        payload = verify_token(credentials.credentials)
+        if payload and payload.get("token_type") == "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token de administrador no válido para esta ruta"
+            )
+        principal = principal_from_claims(payload, "user")
+        if principal is not None:
+            ensure_not_revoked(payload, db)
+            return principal
+
+    return Principal.from_user(get_current_user(credentials, db))
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal)
+) -> Principal:
+    """
+    Verifica que el principal esté activo.
+    """
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return principal
+
+def get_current_admin_principal_from_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Principal de un token admin. Con claims-only no toca la base de datos.
+    """
+    if credentials:
+        payload = verify_admin_token(credentials.credentials)
+        principal = principal_from_claims(payload, "admin")
+        if principal is not None:
+            ensure_not_revoked(payload, db)
+            if principal.user_type not in ['admin', 'store_staff']:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Permisos insuficientes"
+                )
+            return principal
+
+    user = get_current_admin_user_from_token(credentials, db)
+    return Principal.from_user(user, token_type="admin")
+
+def get_current_active_admin_principal(
+    principal: Principal = Depends(get_current_admin_principal_from_token)
+) -> Principal:
+    """
+    Verifica que el principal admin esté activo.
+    """
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuario inactivo"
+        )
+    return principal
@@ -0,0 +1,197 @@
+# app/database/bulk_products.py
+"""
+Carga masiva de productos (upsert por SKU).
+
+Cada lote se resuelve con un número fijo de sentencias, sin importar cuántas
+filas tenga:
+- una consulta para validar proveedores y otra para categorías
+- un SELECT de los SKUs existentes (para saber si la fila se crea o se actualiza
+  y detectar SKUs que solo difieren en mayúsculas o acentos)
+- un INSERT ... ON DUPLICATE KEY UPDATE con executemany (PyMySQL lo envía como
+  un único INSERT multi-fila; en SQLite, ON CONFLICT (sku) DO UPDATE)
+- un SELECT de los product_id resultantes
+- un DELETE y un INSERT executemany para los vínculos producto-categoría
+
+Cada fila es el producto completo (como PUT): los campos omitidos toman su
+valor por defecto. Las categorías solo se reemplazan si la fila trae
+category_ids. No hace commit: lo decide quien llama (ruta o script).
+
+La collation de MySQL no distingue mayúsculas ni acentos: "abc" y "ABC" son
+el mismo SKU para el índice único. Las filas se comparan por sku_key(); una
+fila que solo difiere de otra del lote, o de un SKU existente, en mayúsculas
+o acentos se reporta como failed en lugar de pisar otro producto.
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.product_model import Category, Product, ProductCategory, Supplier
+from ..schemas.product_schemas import ProductCreate
+from ..search.changes import PRODUCT, product_document, queue_change
+
+CREATED = "created"
+UPDATED = "updated"
+FAILED = "failed"
+
+# Columnas que reemplaza el upsert cuando el SKU ya existe
+UPSERT_COLUMNS = (
+    "name", "price", "description", "online_stock", "release_date", "is_featured",
+    "is_active", "product_type", "attributes", "product_image", "supplier_id",
+)
+
+
+def sku_key(sku: str) -> str:
+    """SKU como lo compara la collation (_ai_ci): sin mayúsculas ni acentos"""
+    decomposed = unicodedata.normalize("NFKD", sku)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def missing_references(db: Session, supplier_ids: Iterable[int], category_ids: Iterable[int]) -> Tuple[Set[int], Set[int]]:
+    """(proveedores, categorías) que no existen, una consulta por tabla"""
+    supplier_ids, category_ids = set(supplier_ids), set(category_ids)
+    missing_suppliers, missing_categories = set(), set()
+    if supplier_ids:
+        found = db.execute(
+            select(Supplier.supplier_id).where(Supplier.supplier_id.in_(supplier_ids))
+        ).scalars()
+        missing_suppliers = supplier_ids - set(found)
+    if category_ids:
+        found = db.execute(
+            select(Category.category_id).where(Category.category_id.in_(category_ids))
+        ).scalars()
+        missing_categories = category_ids - set(found)
+    return missing_suppliers, missing_categories
+
+
+def insert_category_links(db: Session, links: List[Dict[str, int]]) -> None:
+    """Vínculos producto-categoría en un solo executemany"""
+    if links:
+        db.execute(insert(ProductCategory), links)
+
+
+def _upsert_statement(dialect: str):
+    table = Product.__table__
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(table)
+        values = {column: statement.inserted[column] for column in UPSERT_COLUMNS}
+        return statement.on_duplicate_key_update(**values, updated_at=func.current_timestamp())
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        statement = sqlite_insert(table)
+        values = {column: statement.excluded[column] for column in UPSERT_COLUMNS}
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.sku], set_={**values, "updated_at": func.current_timestamp()}
+        )
+    raise NotImplementedError(f"Bulk upsert is not supported for dialect {dialect!r}")
+
+
+def _validate(row) -> ProductCreate:
+    if isinstance(row, ProductCreate):
+        return row
+    return ProductCreate.model_validate(row)
+
+
+def bulk_upsert_products(db: Session, rows: Iterable, batch_size: int = 500) -> List[dict]:
+    """
+    Crea o actualiza productos por SKU. rows: dicts o ProductCreate.
+
+    Retorna un resultado por fila, en el mismo orden:
+    {"sku", "status": created|updated|failed, "product_id", "error"}
+    """
+    rows = list(rows)
+    results: List[Optional[dict]] = [None] * len(rows)
+    products: List[Tuple[int, ProductCreate]] = []
+    seen_skus: Set[str] = set()
+
+    for index, row in enumerate(rows):
+        sku = row.get("sku") if isinstance(row, dict) else getattr(row, "sku", None)
+        try:
+            product = _validate(row)
+        except ValidationError as e:
+            results[index] = _failed(sku, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+            continue
+        if sku_key(product.sku) in seen_skus:
+            results[index] = _failed(product.sku, "Duplicate SKU in this batch (SKUs ignore case and accents)")
+            continue
+        seen_skus.add(sku_key(product.sku))
+        products.append((index, product))
+
+    for start in range(0, len(products), batch_size):
+        _upsert_batch(db, products[start:start + batch_size], results)
+    return results
+
+
+def _failed(sku: Optional[str], error: str) -> dict:
+    return {"sku": sku, "status": FAILED, "product_id": None, "error": error}
+
+
+def _upsert_batch(db: Session, batch: List[Tuple[int, ProductCreate]], results: List[Optional[dict]]) -> None:
+    missing_suppliers, missing_categories = missing_references(
+        db,
+        (product.supplier_id for _, product in batch if product.supplier_id),
+        (category_id for _, product in batch for category_id in product.category_ids),
+    )
+
+    # SKUs guardados por clave (en MySQL el IN ya compara con la collation)
+    existing = {
+        sku_key(sku): sku
+        for sku in db.execute(select(Product.sku).where(Product.sku.in_([product.sku for _, product in batch]))).scalars()
+    }
+
+    valid = []
+    for index, product in batch:
+        stored_sku = existing.get(sku_key(product.sku))
+        if stored_sku is not None and stored_sku != product.sku:
+            results[index] = _failed(
+                product.sku, f"SKU conflicts with existing SKU {stored_sku!r} (SKUs ignore case and accents)"
+            )
+        elif product.supplier_id and product.supplier_id in missing_suppliers:
+            results[index] = _failed(product.sku, f"Supplier with ID {product.supplier_id} not found")
+        elif missing_categories.intersection(product.category_ids):
+            missing = sorted(missing_categories.intersection(product.category_ids))
+            results[index] = _failed(product.sku, f"Categories with IDs {missing} not found")
+        else:
+            valid.append((index, product))
+    if not valid:
+        return
+
+    skus = [product.sku for _, product in valid]
+    db.execute(
+        _upsert_statement(db.get_bind().dialect.name),
+        [{"sku": product.sku, **product.model_dump(include=set(UPSERT_COLUMNS))} for _, product in valid],
+    )
+    product_ids = {
+        sku_key(sku): product_id
+        for sku, product_id in db.execute(select(Product.sku, Product.product_id).where(Product.sku.in_(skus)))
+    }
+
+    # Solo se reemplazan las categorías de las filas que traen category_ids
+    relinked = [(product_ids[sku_key(product.sku)], product) for _, product in valid if "category_ids" in product.model_fields_set]
+    if relinked:
+        db.execute(delete(ProductCategory).where(
+            ProductCategory.product_id.in_([product_id for product_id, _ in relinked])
+        ))
+        insert_category_links(db, [
+            {"product_id": product_id, "category_id": category_id}
+            for product_id, product in relinked
+            for category_id in dict.fromkeys(product.category_ids)
+        ])
+
+    for index, product in valid:
+        # INSERT de Core: los índices en memoria no ven estos cambios por el ORM
+        product_id = product_ids[sku_key(product.sku)]
+        queue_change(db, PRODUCT, product_id, product_document(product))
+        results[index] = {
+            "sku": product.sku,
+            "status": UPDATED if sku_key(product.sku) in existing else CREATED,
+            "product_id": product_id,
+            "error": None,
+        }
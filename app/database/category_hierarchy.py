@@ -0,0 +1,195 @@
+# app/database/category_hierarchy.py
+"""
+Jerarquía de categorías materializada en category_closure.
+
+Cada categoría tiene una fila (ancestro, descendiente, depth) por cada uno de
+sus ancestros y otra consigo misma (depth 0). Así el árbol, la cadena de
+ancestros, el conjunto de descendientes y la verificación de ciclos son una
+sola consulta por índice, en lugar de una por nivel.
+
+La tabla se mantiene en el mismo flush que cambia parent_category_id (eventos
+de mapper sobre Category), así cualquier escritura con el ORM la actualiza:
+- alta: fila propia más una por cada ancestro del padre
+- cambio de padre: se desvincula el subárbol de sus ancestros anteriores y se
+  vincula con los nuevos (dos sentencias, sin importar el tamaño del subárbol)
+- baja: las subcategorías quedan como raíz (FK ON DELETE SET NULL)
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, delete, event, exists, insert, inspect, literal, select
+from sqlalchemy.orm import Session
+
+from ..models.product_model import Category, CategoryClosure
+
+closure = CategoryClosure.__table__
+
+# Corte de la reconstrucción completa (datos previos con ciclos o muy profundos)
+MAX_REBUILD_DEPTH = 100
+
+
+def _ids(connection, query) -> List[int]:
+    return list(connection.execute(query).scalars())
+
+
+def _attach(connection, category_id: int, parent_id: int) -> None:
+    """Vincula el subárbol de category_id con parent_id y todos sus ancestros"""
+    ancestors = closure.alias("ancestors")
+    subtree = closure.alias("subtree")
+    connection.execute(insert(closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        # Producto cruzado: ancestros del nuevo padre x nodos del subárbol
+        select(ancestors.c.ancestor_id, subtree.c.descendant_id, ancestors.c.depth + subtree.c.depth + 1)
+        .select_from(ancestors.join(subtree, subtree.c.ancestor_id == category_id))
+        .where(ancestors.c.descendant_id == parent_id),
+    ))
+
+
+def _detach(connection, category_id: int, include_self: bool = True) -> None:
+    """
+    Quita los vínculos del subárbol de category_id con sus ancestros (con
+    include_self=False, solo los de las subcategorías con category_id y sus
+    ancestros). Los ids se leen antes: MySQL no permite un DELETE con
+    subconsulta sobre la misma tabla.
+    """
+    min_depth = 0 if include_self else 1
+    subtree = _ids(connection, select(closure.c.descendant_id).where(
+        closure.c.ancestor_id == category_id, closure.c.depth >= min_depth
+    ))
+    ancestors = _ids(connection, select(closure.c.ancestor_id).where(
+        closure.c.descendant_id == category_id, closure.c.depth >= 1 - min_depth
+    ))
+    if subtree and ancestors:
+        connection.execute(delete(closure).where(
+            closure.c.descendant_id.in_(subtree), closure.c.ancestor_id.in_(ancestors)
+        ))
+
+
+def _current_parent(connection, category_id: int) -> Optional[int]:
+    return connection.scalar(select(closure.c.ancestor_id).where(
+        closure.c.descendant_id == category_id, closure.c.depth == 1
+    ))
+
+
+@event.listens_for(Category, "after_insert")
+def _category_inserted(mapper, connection, target):
+    connection.execute(insert(closure).values(
+        ancestor_id=target.category_id, descendant_id=target.category_id, depth=0
+    ))
+    if target.parent_category_id is not None:
+        _attach(connection, target.category_id, target.parent_category_id)
+
+
+@event.listens_for(Category, "after_update")
+def _category_updated(mapper, connection, target):
+    # Sin cambio de padre (is_active, description...) no se toca la tabla: una
+    # desactivación masiva sería una consulta por categoría. Asignar la
+    # relación (parent / subcategories) también deja historial en la columna
+    if not inspect(target).attrs.parent_category_id.history.has_changes():
+        return
+    # El historial puede no tener el valor anterior (atributo no cargado)
+    if _current_parent(connection, target.category_id) == target.parent_category_id:
+        return
+    _detach(connection, target.category_id)
+    if target.parent_category_id is not None:
+        _attach(connection, target.category_id, target.parent_category_id)
+
+
+@event.listens_for(Category, "before_delete")
+def _category_deleted(mapper, connection, target):
+    _detach(connection, target.category_id, include_self=False)
+    connection.execute(delete(closure).where(closure.c.descendant_id == target.category_id))
+
+
+def creates_cycle(db: Session, category_id: int, new_parent_id: int) -> bool:
+    """True si new_parent_id es category_id o uno de sus descendientes (una consulta)"""
+    return bool(db.scalar(select(exists().where(
+        CategoryClosure.ancestor_id == category_id, CategoryClosure.descendant_id == new_parent_id
+    ))))
+
+
+def ancestors_query(category_id: int):
+    """Cadena de ancestros desde la raíz hasta category_id inclusive"""
+    return (
+        select(Category)
+        .join(CategoryClosure, CategoryClosure.ancestor_id == Category.category_id)
+        .where(CategoryClosure.descendant_id == category_id)
+        .order_by(CategoryClosure.depth.desc())
+    )
+
+
+def descendants_query(category_id: int, max_depth: Optional[int] = None, include_self: bool = True):
+    """(Category, depth) del subárbol de category_id, por nivel"""
+    query = (
+        select(Category, CategoryClosure.depth)
+        .join(CategoryClosure, CategoryClosure.descendant_id == Category.category_id)
+        .where(CategoryClosure.ancestor_id == category_id)
+        .order_by(CategoryClosure.depth, Category.category_id)
+    )
+    if max_depth is not None:
+        query = query.where(CategoryClosure.depth < max_depth)
+    if not include_self:
+        query = query.where(CategoryClosure.depth > 0)
+    return query
+
+
+def descendant_ids_query(category_id: int):
+    """Ids del subárbol (para filtros IN / EXISTS)"""
+    return select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+
+
+def build_tree(rows, active_only: bool = True) -> Optional[dict]:
+    """
+    Árbol anidado a partir de descendants_query(). La raíz se incluye siempre;
+    con active_only, una subcategoría inactiva se omite junto con su subárbol.
+    """
+    nodes: Dict[int, dict] = {}
+    root = None
+    for category, depth in rows:
+        node = {
+            "category_id": category.category_id,
+            "name": category.name,
+            "description": category.description,
+            "is_active": category.is_active,
+            "subcategories": [],
+        }
+        if depth == 0:
+            root = node
+        else:
+            parent = nodes.get(category.parent_category_id)
+            if parent is None or (active_only and not category.is_active):
+                continue
+            parent["subcategories"].append(node)
+        nodes[category.category_id] = node
+    return root
+
+
+def rebuild_category_closure(connection) -> int:
+    """Reconstruye la tabla completa desde parent_category_id, un INSERT por nivel"""
+    categories = Category.__table__
+    connection.execute(delete(closure))
+    connection.execute(insert(closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(categories.c.category_id, categories.c.category_id, literal(0)),
+    ))
+    total = 0
+    for depth in range(1, MAX_REBUILD_DEPTH + 1):
+        parent_links = closure.alias("parent_links")
+        existing = closure.alias("existing")
+        result = connection.execute(insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(parent_links.c.ancestor_id, categories.c.category_id, literal(depth))
+            .select_from(categories)
+            .join(parent_links, and_(
+                parent_links.c.descendant_id == categories.c.parent_category_id,
+                parent_links.c.depth == depth - 1,
+            ))
+            # Un ciclo previo en parent_category_id no se materializa
+            .where(~exists().where(
+                existing.c.ancestor_id == parent_links.c.ancestor_id,
+                existing.c.descendant_id == categories.c.category_id,
+            )),
+        ))
+        if not result.rowcount:
+            break
+        total += result.rowcount
+    return total
@@ -1,9 +1,12 @@
 # app/database/database.py
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from . import statement_timeouts  # noqa: F401  (registra los eventos del engine)
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from contextlib import asynccontextmanager
 import logging 
 
 if settings.db_testing_mode:
@@ -14,27 +17,34 @@ if settings.db_testing_mode:
     print(f'📊 Base de datos: {settings.db_name}')
     print(f'👤 Usuario: {settings.db_user}')
 
+def create_db_engine(url: str, name: str = "primary"):
+    """Engine síncrono con la configuración de pool y conexión de Azure MySQL"""
+    db_engine = create_engine(
+        url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,  # Verifica la conexión antes de usarla
+        pool_recycle=3600,   # Recicla conexiones después de una hora
+        
+        # azure SQL config
+        connect_args={
+            "charset": "utf8mb4",
+            "autocommit": False,
+            "ssl_disabled": False,  # SSL requerido en Azure
+            "connect_timeout": 30,   # Timeout de conexión
+            "read_timeout": 30,      # Timeout de lectura
+            "write_timeout": 30,     # Timeout de escritura
+        },
+        # echo to debug
+        #echo=settings.debug, 
+    )
+    instrument_engine(db_engine, name)
+    return db_engine
+
 # Configuración del engine con retry
-engine = create_engine(
-    settings.database_url,
-    pool_size=5,
-    max_overflow=10,
-    poolclass=QueuePool,
-    pool_pre_ping=True,  # Verifica la conexión antes de usarla
-    pool_recycle=3600,   # Recicla conexiones después de una hora
-    
-    # azure SQL config
-    connect_args={
-        "charset": "utf8mb4",
-        "autocommit": False,
-        "ssl_disabled": False,  # SSL requerido en Azure
-        "connect_timeout": 30,   # Timeout de conexión
-        "read_timeout": 30,      # Timeout de lectura
-        "write_timeout": 30,     # Timeout de escritura
-    },
-    # echo to debug
-    #echo=settings.debug, 
-)
+engine = create_db_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -45,6 +55,113 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Engine asíncrono opcional (DB_ASYNC_MODE). Driver aiomysql para MySQL y
+# aiosqlite para ejecuciones locales con SQLite.
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Cambia el driver de la URL por su equivalente async"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def async_database_url() -> str:
+    """URL del engine async: ASYNC_DATABASE_URL o DATABASE_URL con el driver async"""
+    return settings.async_database_url or to_async_url(settings.database_url)
+
+
+def create_async_db_engine(url: str = None, name: str = "primary-async"):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url or async_database_url()
+    if url.startswith("sqlite"):
+        return create_async_engine(url)
+    db_engine = create_async_engine(
+        url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        connect_args={"charset": "utf8mb4", "connect_timeout": 30},
+    )
+    instrument_engine(db_engine.sync_engine, name)
+    return db_engine
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async_mode:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_async_db_engine()
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+class ThreadpoolSession:
+    """
+    Adaptador con la interfaz async de AsyncSession (execute/scalar/get/connection)
+    sobre una Session síncrona: cada consulta corre completa en el threadpool
+    y el resultado se retorna ya leído. Permite que las rutas async funcionen
+    sin DB_ASYNC_MODE.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def execute(self, statement, params=None):
+        def run():
+            result = self.sync_session.execute(statement, params)
+            return result.freeze()
+        frozen = await run_in_threadpool(run)
+        return frozen()
+
+    async def scalar(self, statement, params=None):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params)
+
+    async def connection(self):
+        return await run_in_threadpool(self.sync_session.connection)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+@asynccontextmanager
+async def open_async_session(bind=None, async_bind=None):
+    """
+    AsyncSession si DB_ASYNC_MODE está activo; si no, la sesión síncrona
+    envuelta en ThreadpoolSession. bind/async_bind eligen otro engine
+    (por ejemplo una réplica de lectura).
+    """
+    if AsyncSessionLocal is not None:
+        kwargs = {"bind": async_bind} if async_bind is not None else {}
+        async with AsyncSessionLocal(**kwargs) as db:
+            yield db
+        return
+
+    kwargs = {"bind": bind} if bind is not None else {}
+    db = ThreadpoolSession(SessionLocal(**kwargs))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_db():
+    """Dependencia async sobre el engine principal"""
+    async with open_async_session() as db:
+        yield db
         
 def test_connection():
     """Check the db conection"""
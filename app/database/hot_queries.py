@@ -0,0 +1,67 @@
+# app/database/hot_queries.py
+"""
+Registro de consultas calientes del catálogo.
+
+Las sentencias se construyen una sola vez al importar, con bindparam() para
+los valores de cada petición. Reutilizar el mismo objeto evita armar el
+select() y sus opciones de carga en cada llamada, y SQLAlchemy encuentra la
+compilación en su cache sin recalcular opciones nuevas. Ver
+app/scripts/hot_query_benchmark.py.
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import Integer, bindparam, select
+from sqlalchemy.orm import Session, joinedload
+
+from ..models.product_model import Product
+
+PRODUCT_DETAIL = "product_detail"
+FEATURED_PRODUCTS = "featured_products"
+
+
+def product_detail_query():
+    """SELECT de productos con proveedor y categorías cargados (sin lazy loads en async)"""
+    return select(Product).options(
+        joinedload(Product.supplier),
+        joinedload(Product.categories)
+    )
+
+
+class HotQueryRegistry:
+    """Sentencias precompiladas por nombre"""
+
+    def __init__(self):
+        self._statements: Dict[str, object] = {}
+
+    def register(self, name: str, statement):
+        if name in self._statements:
+            raise ValueError(f"Hot query {name!r} is already registered")
+        self._statements[name] = statement
+        return statement
+
+    def __getitem__(self, name: str):
+        return self._statements[name]
+
+    def names(self):
+        return list(self._statements)
+
+
+# Instancia global
+hot_queries = HotQueryRegistry()
+
+hot_queries.register(
+    PRODUCT_DETAIL,
+    product_detail_query().where(Product.product_id == bindparam("product_id")),
+)
+hot_queries.register(
+    FEATURED_PRODUCTS,
+    product_detail_query()
+    .where(Product.is_featured == True, Product.is_active == True)
+    .limit(bindparam("limit", type_=Integer)),
+)
+
+
+def load_product_detail(db: Session, product_id: int) -> Optional[Product]:
+    """Producto con sus relaciones (recarga para la respuesta tras cada escritura)"""
+    result = db.execute(hot_queries[PRODUCT_DETAIL], {"product_id": product_id})
+    return result.unique().scalars().first()
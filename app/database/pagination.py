@@ -0,0 +1,147 @@
+# app/database/pagination.py
+"""
+Paginación por cursor (keyset).
+
+Con offset(skip) la base de datos lee y descarta todas las filas anteriores,
+así cada página es más lenta que la previa. El cursor guarda la clave de
+orden y la clave primaria de la última fila entregada; la página siguiente
+empieza con un WHERE sobre esas columnas y usa el índice compuesto
+correspondiente (ver migrations/versions/0003_keyset_indexes.py).
+
+El cursor es opaco para el cliente (base64 de JSON) y lleva el nombre del
+orden, así no se puede reutilizar con otro orden. Las columnas de orden
+deben ser NOT NULL en la práctica: un NULL no se compara con < o >.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Cursor mal formado o generado con otro orden"""
+
+
+def _dump(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load(column, value):
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def _encode(name: str, values: List) -> str:
+    payload = json.dumps([name, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(name: str, cursor: str, size: int) -> List:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_name, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if cursor_name != name or not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor(f"Cursor does not match the {name!r} ordering")
+    return values
+
+
+class Keyset:
+    """
+    Orden estable para paginar: columnas de orden seguidas de la clave
+    primaria, que desempata. Ej: Keyset("products-price", Product.price, Product.product_id)
+    """
+
+    def __init__(self, name: str, *columns, descending: bool = False):
+        self.name = name
+        self.columns = columns
+        self.descending = descending
+
+    def encode(self, row) -> str:
+        return _encode(self.name, [_dump(getattr(row, column.key)) for column in self.columns])
+
+    def decode(self, cursor: str) -> Tuple:
+        values = _decode(self.name, cursor, len(self.columns))
+        try:
+            return tuple(_load(column, value) for column, value in zip(self.columns, values))
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise InvalidCursor("Malformed cursor") from e
+
+    def after(self, values: Sequence):
+        """(a, b) > (x, y) expandido, para que MySQL use el índice como rango"""
+        conditions = []
+        for position, column in enumerate(self.columns):
+            boundary = column < values[position] if self.descending else column > values[position]
+            equal = [self.columns[index] == values[index] for index in range(position)]
+            conditions.append(and_(*equal, boundary))
+        return or_(*conditions)
+
+    def apply(self, query, cursor: Optional[str] = None):
+        """Ordena por el keyset y, con cursor, filtra las filas posteriores"""
+        if cursor:
+            query = query.where(self.after(self.decode(cursor)))
+        order = [column.desc() if self.descending else column.asc() for column in self.columns]
+        return query.order_by(*order)
+
+    def page(self, rows: List, limit: int) -> Tuple[List, Optional[str]]:
+        """
+        rows debe venir con limit + 1 filas como máximo: la fila extra solo
+        indica que hay otra página. Retorna (filas, next_cursor).
+        """
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.encode(rows[-1])
+
+
+class RankCursor:
+    """
+    Cursor para resultados ordenados por relevancia: guarda la posición, ya
+    que el puntaje no es una columna. Mantiene el contrato de X-Next-Cursor.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def encode(self, offset: int) -> str:
+        return _encode(self.name, [offset])
+
+    def decode(self, cursor: str) -> int:
+        offset = _decode(self.name, cursor, 1)[0]
+        if not isinstance(offset, int) or offset < 0:
+            raise InvalidCursor("Malformed cursor")
+        return offset
+
+
+def check_pagination(skip: int, cursor: Optional[str]) -> None:
+    if cursor and skip:
+        raise InvalidCursor("Use either skip or cursor, not both")
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Header X-Next-Cursor (la respuesta sigue siendo una lista)"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
@@ -0,0 +1,297 @@
+# app/database/pool_metrics.py
+"""
+Observabilidad del pool de conexiones y ajuste adaptativo de su tamaño.
+
+Cada engine usa un QueuePool instrumentado que mide cuánto tarda cada
+checkout (espera en la cola + conexión nueva + pre-ping). Los eventos del
+pool cuentan conexiones abiertas/cerradas/invalidadas, su edad al
+entregarse y los fallos de pre-ping. Con DB_POOL_ADAPTIVE una tarea de fondo
+agranda el pool cuando el p95 de espera supera DB_POOL_TARGET_WAIT_MS y lo
+achica cuando sobran conexiones ociosas, siempre entre MIN y MAX.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Muestras recientes para avg/p95 en el endpoint de métricas
+RECENT_SAMPLES = 1000
+# Tope de la ventana del ajuste adaptativo (sin autoscaler nadie la vacía)
+INTERVAL_SAMPLES = 10000
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class InstrumentedPoolMixin:
+    """Mide el tiempo de cada checkout y lo reporta al PoolMonitor del engine"""
+
+    monitor: Optional["PoolMonitor"] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_timeout()
+            raise
+        if self.monitor is not None:
+            self.monitor.record_wait(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo; conservar el monitor
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """QueuePool con métricas y cambio de tamaño en caliente"""
+
+    supports_resize = True
+
+    def resize(self, pool_size: int) -> None:
+        """
+        Cambia pool_size conservando el total de conexiones abiertas. Al
+        achicar se cierran las conexiones ociosas que ya no caben en la cola;
+        las que están en uso se cierran al devolverse (cola llena).
+
+        Usa atributos internos de QueuePool (cola, _overflow): SQLAlchemy está
+        fijado en requirements.txt y tests/test_pool_metrics.py verifica
+        size/checkedin/overflow al agrandar y achicar con esa versión.
+        """
+        surplus = []
+        with self._pool.mutex, self._overflow_lock:
+            current = self._pool.maxsize
+            if pool_size == current:
+                return
+            while len(self._pool.queue) > pool_size:
+                surplus.append(self._pool._get())
+            # _overflow = conexiones abiertas - pool_size
+            self._overflow += current - pool_size - len(surplus)
+            self._pool.maxsize = pool_size
+            self._pool.not_full.notify_all()
+
+        for record in surplus:
+            record.close()
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Pool del engine async: solo métricas (asyncio.Queue no cambia de tamaño)"""
+
+    supports_resize = False
+
+
+class PoolMonitor:
+    """Contadores de un engine, alimentados por los eventos de su pool"""
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=RECENT_SAMPLES)
+        self._ages = deque(maxlen=RECENT_SAMPLES)
+        # Ventana del ajuste adaptativo (se vacía en cada tick)
+        self._interval_waits = deque(maxlen=INTERVAL_SAMPLES)
+        self._interval_peak = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.resizes = 0
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "handle_error", self._on_error)
+
+    @property
+    def pool(self):
+        return self.engine.pool
+
+    def record_wait(self, seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._waits.append(seconds)
+            self._interval_waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self._interval_peak = max(self._interval_peak, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+            # Un timeout es la peor espera posible para el ajuste adaptativo
+            self._interval_waits.append(float("inf"))
+
+    def take_interval(self):
+        """(p95 de espera, pico en uso) desde la última llamada"""
+        with self._lock:
+            waits, peak = list(self._interval_waits), self._interval_peak
+            self._interval_waits.clear()
+            self._interval_peak = 0
+        return percentile(waits, 0.95), peak
+
+    def _on_connect(self, dbapi_connection, record) -> None:
+        record.info["created_at"] = time.monotonic()
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, record, proxy) -> None:
+        created_at = record.info.get("created_at")
+        if created_at is not None:
+            with self._lock:
+                self._ages.append(time.monotonic() - created_at)
+
+    def _on_close(self, dbapi_connection, record) -> None:
+        with self._lock:
+            self.connections_closed += 1
+
+    def _on_invalidate(self, dbapi_connection, record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_error(self, context) -> None:
+        if getattr(context, "is_pre_ping", False):
+            with self._lock:
+                self.pre_ping_failures += 1
+
+    def stats(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            waits = list(self._waits)
+            ages = list(self._ages)
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "pool_size": pool.size(),
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow_in_use": max(0, pool.overflow()),
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_ms": {
+                    "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+                    "p95": round(percentile(waits, 0.95) * 1000, 3),
+                    "max": round(self.max_wait * 1000, 3),
+                },
+                "connection_age_seconds": {
+                    "avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+                    "max": round(max(ages), 1) if ages else 0.0,
+                },
+                "connections_opened": self.connections_opened,
+                "connections_closed": self.connections_closed,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "resizes": self.resizes,
+            }
+
+
+# Monitores por engine ("primary", "replica-0", "primary-async", ...)
+pool_monitors: Dict[str, PoolMonitor] = {}
+
+
+def instrument_engine(engine, name: str) -> Optional[PoolMonitor]:
+    """Registra un PoolMonitor si el engine usa un pool instrumentado"""
+    if not isinstance(engine.pool, InstrumentedPoolMixin):
+        return None
+    monitor = PoolMonitor(name, engine)
+    engine.pool.monitor = monitor
+    pool_monitors[name] = monitor
+    return monitor
+
+
+class PoolAutoscaler:
+    """
+    Ajusta pool_size entre min_size y max_size según el p95 de espera del
+    último intervalo: crece un paso si supera el objetivo y baja de a una
+    conexión si el pico en uso dejó la mitad del pool ociosa.
+    """
+
+    def __init__(self, min_size: int, max_size: int, target_wait_ms: float, step: int = 2):
+        if min_size < 1 or max_size < min_size:
+            raise ValueError("DB pool bounds must satisfy 1 <= min_size <= max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_wait = target_wait_ms / 1000
+        self.step = step
+
+    def adapt(self, monitor: PoolMonitor) -> Optional[int]:
+        pool = monitor.pool
+        if not getattr(pool, "supports_resize", False):
+            return None
+        p95, peak = monitor.take_interval()
+        size = pool.size()
+
+        new_size = size
+        if p95 > self.target_wait:
+            new_size = min(self.max_size, size + self.step)
+        elif p95 < self.target_wait / 4 and peak < size // 2:
+            new_size = max(self.min_size, size - 1)
+        # Fuera de los límites (tamaño inicial mal configurado): llevarlo dentro
+        new_size = min(self.max_size, max(self.min_size, new_size))
+
+        if new_size == size:
+            return None
+        pool.resize(new_size)
+        monitor.resizes += 1
+        logger.info(
+            f"DB pool {monitor.name} resized {size} -> {new_size} "
+            f"(p95 wait {p95 * 1000:.1f}ms, peak in use {peak})"
+        )
+        return new_size
+
+
+def prewarm_pools(connections: int) -> int:
+    """
+    Abre hasta `connections` conexiones por pool síncrono y las devuelve, así
+    las primeras peticiones no pagan el handshake (TLS + auth de MySQL).
+    """
+    opened_total = 0
+    for monitor in list(pool_monitors.values()):
+        pool = monitor.pool
+        if not getattr(pool, "supports_resize", False):
+            continue
+        opened = []
+        try:
+            for _ in range(min(connections, pool.size())):
+                opened.append(pool.connect())
+        except Exception as e:
+            logger.warning(f"DB pool {monitor.name} prewarm stopped: {str(e)}")
+        finally:
+            for connection in opened:
+                connection.close()
+        opened_total += len(opened)
+    return opened_total
+
+
+async def run_pool_autoscaler(autoscaler: PoolAutoscaler, interval_seconds: int) -> None:
+    """Tarea de fondo: ajusta los pools instrumentados cada interval_seconds"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for monitor in list(pool_monitors.values()):
+            try:
+                autoscaler.adapt(monitor)
+            except Exception as e:
+                logger.error(f"Error resizing DB pool {monitor.name}: {str(e)}")
@@ -0,0 +1,215 @@
+# app/database/product_facets.py
+"""
+Facetas del catálogo (conteos para la barra de filtros) en una sola consulta.
+
+Cada faceta es una rama GROUP BY de un UNION ALL: total, categoría,
+proveedor, product_type, rango de precio y atributos buscables. Cada rama
+aplica todos los filtros activos excepto el de su propia dimensión, así al
+elegir una categoría las demás categorías siguen mostrando cuántos productos
+tendrían (facetas disyuntivas). El total sí aplica todos los filtros.
+
+product_filters() es también el armado de filtros de GET /products/, para
+que los conteos coincidan con el listado.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import String, and_, case, cast, func, literal, null, select, union_all
+
+from ..models.product_model import (
+    Category, Product, ProductAttributeType, ProductAttributeValue, ProductCategory, Supplier
+)
+
+# Dimensiones con faceta: su filtro no se aplica al contar esa misma faceta
+CATEGORY = "category"
+SUPPLIER = "supplier"
+PRODUCT_TYPE = "product_type"
+PRICE = "price"
+
+DEFAULT_PRICE_EDGES = (25.0, 50.0, 100.0, 250.0, 500.0)
+MAX_PRICE_EDGES = 20
+
+# Valores por atributo que se devuelven (los de más productos)
+MAX_ATTRIBUTE_VALUES = 20
+
+Filters = Dict[str, list]
+
+
+def product_filters(
+    name: Optional[str] = None,
+    category_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    is_featured: Optional[bool] = None,
+    product_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    in_stock: Optional[bool] = None,
+) -> Filters:
+    """Condiciones WHERE de productos agrupadas por dimensión"""
+    filters: Filters = {}
+
+    if name:
+        filters["name"] = [Product.name.ilike(f"%{name}%")]
+    if category_id:
+        filters[CATEGORY] = [Product.categories.any(Category.category_id == category_id)]
+    if supplier_id:
+        filters[SUPPLIER] = [Product.supplier_id == supplier_id]
+    if is_active is not None:
+        filters["is_active"] = [Product.is_active == is_active]
+    if is_featured is not None:
+        filters["is_featured"] = [Product.is_featured == is_featured]
+    if product_type:
+        filters[PRODUCT_TYPE] = [Product.product_type == product_type]
+    if min_price is not None:
+        filters.setdefault(PRICE, []).append(Product.price >= min_price)
+    if max_price is not None:
+        filters.setdefault(PRICE, []).append(Product.price <= max_price)
+    if in_stock is not None:
+        filters["in_stock"] = [Product.online_stock > 0 if in_stock else Product.online_stock == 0]
+    return filters
+
+
+def where_filters(query, filters: Filters, exclude: Optional[str] = None):
+    conditions = [condition for dimension, group in filters.items() if dimension != exclude for condition in group]
+    return query.where(and_(*conditions)) if conditions else query
+
+
+def parse_price_edges(raw: Optional[str]) -> Sequence[float]:
+    """"25,50,100" -> (25.0, 50.0, 100.0); ValueError si no son positivos y crecientes"""
+    if not raw:
+        return DEFAULT_PRICE_EDGES
+    try:
+        edges = tuple(float(part) for part in raw.split(",") if part.strip())
+    except ValueError:
+        raise ValueError("price_edges must be a comma-separated list of numbers")
+    if not edges or len(edges) > MAX_PRICE_EDGES:
+        raise ValueError(f"price_edges must have between 1 and {MAX_PRICE_EDGES} values")
+    if edges[0] <= 0 or any(low >= high for low, high in zip(edges, edges[1:])):
+        raise ValueError("price_edges must be positive and strictly increasing")
+    return edges
+
+
+def _price_bucket(edges: Sequence[float]):
+    """Índice del rango: 0 = menor que edges[0], len(edges) = desde el último límite"""
+    return case(*[(Product.price < edge, index) for index, edge in enumerate(edges)], else_=len(edges))
+
+
+def _attribute_value():
+    """Valor del atributo como texto, sea cual sea su data_type"""
+    return func.coalesce(
+        ProductAttributeValue.text_value,
+        cast(ProductAttributeValue.number_value, String),
+        cast(ProductAttributeValue.date_value, String),
+        case(
+            (ProductAttributeValue.boolean_value == True, "true"),
+            (ProductAttributeValue.boolean_value == False, "false"),
+        ),
+    )
+
+
+def _facet_columns(facet: str, facet_id, value, label, count):
+    return (
+        literal(facet).label("facet"),
+        facet_id.label("id"),
+        value.label("value"),
+        label.label("label"),
+        count.label("count"),
+    )
+
+
+def facet_counts_query(filters: Filters, price_edges: Sequence[float] = DEFAULT_PRICE_EDGES):
+    """UNION ALL de (facet, id, value, label, count) para todas las facetas"""
+    total = where_filters(
+        select(*_facet_columns("total", null(), null(), null(), func.count())).select_from(Product),
+        filters,
+    )
+    categories = where_filters(
+        select(*_facet_columns(CATEGORY, Category.category_id, null(), Category.name, func.count()))
+        .select_from(Product)
+        .join(ProductCategory, ProductCategory.product_id == Product.product_id)
+        .join(Category, Category.category_id == ProductCategory.category_id)
+        .where(Category.is_active == True)
+        .group_by(Category.category_id, Category.name),
+        filters, exclude=CATEGORY,
+    )
+    suppliers = where_filters(
+        select(*_facet_columns(SUPPLIER, Supplier.supplier_id, null(), Supplier.name, func.count()))
+        .select_from(Product)
+        .join(Supplier, Supplier.supplier_id == Product.supplier_id)
+        .group_by(Supplier.supplier_id, Supplier.name),
+        filters, exclude=SUPPLIER,
+    )
+    product_types = where_filters(
+        select(*_facet_columns(PRODUCT_TYPE, null(), Product.product_type, null(), func.count()))
+        .select_from(Product)
+        .group_by(Product.product_type),
+        filters, exclude=PRODUCT_TYPE,
+    )
+
+    # CASE y coalesce en una subconsulta: el GROUP BY agrupa por una columna simple
+    buckets = where_filters(
+        select(_price_bucket(price_edges).label("bucket")).select_from(Product),
+        filters, exclude=PRICE,
+    ).subquery()
+    prices = (
+        select(*_facet_columns(PRICE, buckets.c.bucket, null(), null(), func.count()))
+        .group_by(buckets.c.bucket)
+    )
+    values = where_filters(
+        select(
+            ProductAttributeType.attribute_type_id,
+            ProductAttributeType.name,
+            _attribute_value().label("value"),
+        )
+        .select_from(Product)
+        .join(ProductAttributeValue, ProductAttributeValue.product_id == Product.product_id)
+        .join(ProductAttributeType, ProductAttributeType.attribute_type_id == ProductAttributeValue.attribute_type_id)
+        .where(ProductAttributeType.is_searchable == True),
+        filters,
+    ).subquery()
+    attributes = (
+        select(*_facet_columns("attribute", values.c.attribute_type_id, values.c.value, values.c.name, func.count()))
+        .where(values.c.value.isnot(None))
+        .group_by(values.c.attribute_type_id, values.c.name, values.c.value)
+    )
+    return union_all(total, categories, suppliers, product_types, prices, attributes)
+
+
+def _by_count(item: dict):
+    return -item["count"], str(item.get("label") or item.get("value"))
+
+
+def group_facets(rows, price_edges: Sequence[float] = DEFAULT_PRICE_EDGES) -> dict:
+    """Filas del UNION ALL -> respuesta agrupada por faceta, de más a menos productos"""
+    facets = {"total": 0, "categories": [], "suppliers": [], "product_types": [], "attributes": []}
+    bucket_counts: Dict[int, int] = {}
+    attributes: Dict[int, dict] = {}
+
+    for facet, facet_id, value, label, count in rows:
+        if facet == "total":
+            facets["total"] = count
+        elif facet == CATEGORY:
+            facets["categories"].append({"id": facet_id, "label": label, "count": count})
+        elif facet == SUPPLIER:
+            facets["suppliers"].append({"id": facet_id, "label": label, "count": count})
+        elif facet == PRODUCT_TYPE:
+            if value is not None:
+                facets["product_types"].append({"value": value, "count": count})
+        elif facet == PRICE:
+            bucket_counts[int(facet_id)] = count
+        else:
+            attribute = attributes.setdefault(facet_id, {"attribute_type_id": facet_id, "name": label, "values": []})
+            attribute["values"].append({"value": value, "count": count})
+
+    for key in ("categories", "suppliers", "product_types"):
+        facets[key].sort(key=_by_count)
+    for attribute in attributes.values():
+        attribute["values"] = sorted(attribute["values"], key=_by_count)[:MAX_ATTRIBUTE_VALUES]
+    facets["attributes"] = sorted(attributes.values(), key=lambda attribute: attribute["name"])
+
+    bounds: List[Optional[float]] = [0.0, *price_edges, None]
+    facets["price_ranges"] = [
+        {"min": bounds[index], "max": bounds[index + 1], "count": bucket_counts.get(index, 0)}
+        for index in range(len(price_edges) + 1)
+    ]
+    return facets
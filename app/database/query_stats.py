@@ -0,0 +1,253 @@
+# app/database/query_stats.py
+"""
+Conteo de consultas SQL por petición.
+
+Los eventos before/after_cursor_execute (registrados sobre Engine, así
+cubren el primario, las réplicas y el engine async) suman cada sentencia al
+RequestQueryStats de la petición en curso, guardado en un ContextVar. El
+middleware lo reporta en el header Server-Timing y lo acumula en un
+histograma por ruta (/metrics/queries).
+
+Detector de N+1 (QUERY_DETECTOR_MODE=log|raise, "log" por defecto con
+DB_TESTING_MODE): marca la petición si una misma sentencia se repite
+N_PLUS_ONE_THRESHOLD veces (lazy loads o consultas dentro de un loop) o si
+supera el presupuesto de consultas declarado en la ruta con query_budget().
+En modo "raise" la petición falla, así la suite de tests no deja pasar
+regresiones.
+"""
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DETECTOR_MODES = ("off", "log", "raise")
+QUERY_BUDGET_KEY = "x-query-budget"
+
+# Límites superiores de los buckets (el último es +Inf)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+DB_TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_current_stats: ContextVar[Optional["RequestQueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Petición con N+1 o por encima de su presupuesto de consultas (modo raise)"""
+
+
+def query_budget(max_queries: int) -> dict:
+    """
+    Metadata de ruta con el máximo de consultas por petición (incluye las de
+    autenticación). Uso: @router.get(..., openapi_extra=query_budget(3))
+    """
+    return {QUERY_BUDGET_KEY: max_queries}
+
+
+def detector_mode() -> str:
+    mode = (settings.query_detector_mode or ("log" if settings.db_testing_mode else "off")).lower()
+    if mode not in DETECTOR_MODES:
+        raise ValueError(f"Invalid QUERY_DETECTOR_MODE {mode!r} (expected one of {', '.join(DETECTOR_MODES)})")
+    return mode
+
+
+class RequestQueryStats:
+    """Consultas de una petición: cantidad, tiempo total y la más lenta"""
+
+    __slots__ = ("count", "total", "slowest", "slowest_statement", "statements", "relationship_loads")
+
+    def __init__(self, track_statements: bool = False):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = ""
+        # Repeticiones por sentencia, solo con el detector activo
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+        self.relationship_loads = 0
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds >= self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def most_repeated(self):
+        """(sentencia, repeticiones) de la sentencia más repetida"""
+        if not self.statements:
+            return "", 0
+        return max(self.statements.items(), key=lambda item: item[1])
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    # Lazy loads (y selectin/subquery) de relaciones; en un loop se repiten
+    stats = _current_stats.get()
+    if stats is not None and orm_execute_state.is_relationship_load:
+        stats.relationship_loads += 1
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "avg": round(self.sum / sum(self.counts), 3) if any(self.counts) else 0.0,
+            "max": round(self.max, 3),
+        }
+
+
+class RouteQueryStats:
+    """Histogramas de consultas y de tiempo de BD por ruta ("GET /api/v1/products/{product_id}")"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Histogram]] = {}
+
+    def observe(self, route: str, stats: RequestQueryStats) -> None:
+        with self._lock:
+            histograms = self._routes.get(route)
+            if histograms is None:
+                histograms = self._routes[route] = {
+                    "queries": Histogram(QUERY_COUNT_BUCKETS),
+                    "db_time_ms": Histogram(DB_TIME_BUCKETS_MS),
+                }
+            histograms["queries"].observe(stats.count)
+            histograms["db_time_ms"].observe(stats.total * 1000)
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return sorted(
+                (
+                    {
+                        "route": route,
+                        "requests": sum(histograms["queries"].counts),
+                        "queries": histograms["queries"].snapshot(),
+                        "db_time_ms": histograms["db_time_ms"].snapshot(),
+                    }
+                    for route, histograms in self._routes.items()
+                ),
+                key=lambda item: item["queries"]["avg"],
+                reverse=True,
+            )
+
+
+# Instancia global (una por proceso/worker)
+route_query_stats = RouteQueryStats()
+
+
+def route_name(request: Request) -> str:
+    """Plantilla de la ruta que atendió la petición (sin ids concretos)"""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{request.method} {path}"
+
+
+def route_budget(request: Request) -> Optional[int]:
+    route = request.scope.get("route")
+    extra = getattr(route, "openapi_extra", None) or {}
+    return extra.get(QUERY_BUDGET_KEY)
+
+
+def query_violations(request: Request, stats: RequestQueryStats) -> List[str]:
+    """Problemas detectados en la petición (vacío si no hay ninguno)"""
+    violations = []
+    budget = route_budget(request)
+    if budget is not None and stats.count > budget:
+        violations.append(f"{stats.count} queries exceed the route budget of {budget}")
+
+    statement, repeats = stats.most_repeated()
+    if repeats >= settings.n_plus_one_threshold:
+        kind = "lazy loads" if stats.relationship_loads >= repeats else "queries in a loop"
+        compact = re.sub(r"\s+", " ", statement).strip()
+        violations.append(f"possible N+1 ({kind}): statement executed {repeats} times: {compact[:200]}")
+    return violations
+
+
+def server_timing(stats: RequestQueryStats, include_statement: bool = False) -> str:
+    """
+    Conteo y duraciones de BD. El texto de la sentencia más lenta expone el
+    esquema a cualquier cliente: solo con include_statement (DB_TESTING_MODE)
+    """
+    header = f'db;dur={stats.total * 1000:.2f};desc="{stats.count} queries"'
+    if stats.count:
+        header += f', db-slowest;dur={stats.slowest * 1000:.2f}'
+        if include_statement:
+            # Sin comillas ni saltos de línea: el desc es un quoted-string
+            statement = re.sub(r'[\s"\\]+', " ", stats.slowest_statement).strip()
+            header += f';desc="{statement[:100]}"'
+    return header
+
+
+async def track_request_queries(request: Request, call_next):
+    """
+    Middleware: cuenta las consultas de la petición, agrega Server-Timing y
+    aplica el detector de N+1 / presupuesto de consultas.
+    """
+    mode = detector_mode()
+    stats = RequestQueryStats(track_statements=mode != "off")
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+    route = route_name(request)
+    route_query_stats.observe(route, stats)
+
+    if mode != "off":
+        violations = query_violations(request, stats)
+        if violations:
+            message = f"{route}: " + "; ".join(violations)
+            if mode == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+    if settings.server_timing_header:
+        response.headers.append("Server-Timing", server_timing(stats, include_statement=settings.db_testing_mode))
+    return response
@@ -0,0 +1,198 @@
+# app/database/replicas.py
+"""
+Ruteo de lecturas a réplicas de MySQL.
+
+Las rutas de solo lectura del catálogo usan get_async_read_db: cada petición
+se atiende completa en una réplica sana (round-robin). Una réplica que falla
+al conectar o pierde la conexión queda fuera durante REPLICA_RETRY_SECONDS.
+Después de una escritura exitosa el cliente recibe una cookie que lo fija al
+primario durante READ_YOUR_WRITES_SECONDS, así ve sus propios cambios aunque
+la réplica tenga retraso.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextlib import AsyncExitStack
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from ..config import settings
+from .database import create_async_db_engine, create_db_engine, open_async_session, to_async_url
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class Replica:
+    """Engine(s) de una réplica y su estado de salud"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = create_db_engine(url, name=name)
+        self.async_engine = (
+            create_async_db_engine(to_async_url(url), name=f"{name}-async")
+            if settings.db_async_mode else None
+        )
+        self.healthy = True
+        self.retry_at = 0.0
+        self.selected = 0
+        self.failures = 0
+
+        event.listen(self.engine, "handle_error", self._on_error)
+        if self.async_engine is not None:
+            event.listen(self.async_engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # Solo errores de conexión; un error de SQL no indica una réplica caída
+        if context.is_disconnect or context.connection is None:
+            replica_router.mark_down(self)
+
+    async def dispose(self) -> None:
+        self.engine.dispose()
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+
+
+class ReplicaRouter:
+    """Elige réplicas sanas en round-robin; None si no hay ninguna disponible"""
+
+    def __init__(self, urls: List[str], retry_seconds: int):
+        self.retry_seconds = retry_seconds
+        self.replicas = [Replica(f"replica-{index}", url) for index, url in enumerate(urls)]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self.primary_fallbacks = 0
+        self.pinned_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._cycle)
+                if replica.healthy or replica.retry_at <= now:
+                    replica.selected += 1
+                    return replica
+            self.primary_fallbacks += 1
+            return None
+
+    def mark_down(self, replica: Replica) -> None:
+        with self._lock:
+            replica.failures += 1
+            replica.healthy = False
+            replica.retry_at = time.monotonic() + self.retry_seconds
+        logger.warning(f"Read replica {replica.name} marked down for {self.retry_seconds}s")
+
+    def mark_up(self, replica: Replica) -> None:
+        if replica.healthy:
+            return
+        with self._lock:
+            replica.healthy = True
+        logger.info(f"Read replica {replica.name} is back")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replicas": [
+                    {
+                        "name": replica.name,
+                        "healthy": replica.healthy,
+                        "selected": replica.selected,
+                        "failures": replica.failures,
+                    }
+                    for replica in self.replicas
+                ],
+                "primary_fallbacks": self.primary_fallbacks,
+                "pinned_reads": self.pinned_reads,
+                "retry_seconds": self.retry_seconds,
+                "read_your_writes_seconds": settings.read_your_writes_seconds,
+            }
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+def parse_replica_urls(raw: Optional[str]) -> List[str]:
+    return [url.strip() for url in (raw or "").split(",") if url.strip()]
+
+
+replica_router = ReplicaRouter(
+    parse_replica_urls(settings.replica_database_urls),
+    retry_seconds=settings.replica_retry_seconds,
+)
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    """True si el cliente escribió hace menos de READ_YOUR_WRITES_SECONDS"""
+    try:
+        return float(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_async_read_db(request: Request):
+    """
+    Dependencia async para rutas de solo lectura: réplica sana o, si el
+    cliente está fijado al primario, no hay réplicas o la elegida no
+    conecta, el engine principal.
+    """
+    replica = None
+    if replica_router.enabled:
+        if is_pinned_to_primary(request):
+            replica_router.pinned_reads += 1
+        else:
+            replica = replica_router.choose()
+
+    async with AsyncExitStack() as stack:
+        db = None
+        if replica is not None:
+            db = await stack.enter_async_context(
+                open_async_session(bind=replica.engine, async_bind=replica.async_engine)
+            )
+            try:
+                # Tomar la conexión ya (pre-ping incluido) para caer al primario si falla
+                await db.connection()
+                replica_router.mark_up(replica)
+            except OperationalError:
+                if replica.healthy:
+                    replica_router.mark_down(replica)
+                replica_router.primary_fallbacks += 1
+                db = None
+
+        if db is None:
+            db = await stack.enter_async_context(open_async_session())
+        yield db
+
+
+async def pin_writes_to_primary(request: Request, call_next):
+    """
+    Middleware: tras una escritura exitosa fija al cliente al primario
+    (cookie) para que sus siguientes lecturas vean el cambio.
+    """
+    response = await call_next(request)
+    if (
+        replica_router.enabled
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+    ):
+        window = settings.read_your_writes_seconds
+        response.set_cookie(
+            PIN_COOKIE,
+            str(int(time.time()) + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
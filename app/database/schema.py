@@ -0,0 +1,98 @@
+# app/database/schema.py
+"""
+Versión del esquema (migraciones Alembic en migrations/).
+
+Al arrancar solo se compara la revisión registrada en alembic_version con la
+head de los scripts (una consulta, sin reflejar tablas). La head se obtiene
+leyendo revision/down_revision de los scripts con ast, sin importar Alembic
+ni ejecutar las migraciones. Las migraciones se aplican con
+`python -m app.scripts.migrations upgrade` o, en desarrollo, con
+DB_AUTO_MIGRATE=true.
+"""
+import ast
+import logging
+from pathlib import Path
+from typing import Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = PROJECT_ROOT / "alembic.ini"
+MIGRATIONS_DIR = PROJECT_ROOT / "migrations"
+
+
+def alembic_config(database_url: Optional[str] = None):
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    # "%" escapado: ConfigParser interpola los valores
+    config.set_main_option("sqlalchemy.url", (database_url or settings.database_url).replace("%", "%%"))
+    return config
+
+
+def _revision_ids(path: Path):
+    """(revision, down_revisions) declarados en un script de migración"""
+    values = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.AnnAssign):
+            target, value = node.target, node.value
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id in ("revision", "down_revision") and value is not None:
+            values[target.id] = ast.literal_eval(value)
+
+    down = values.get("down_revision")
+    if down is None:
+        down = ()
+    elif isinstance(down, str):
+        down = (down,)
+    return values.get("revision"), tuple(down)
+
+
+def head_revisions() -> Set[str]:
+    """Revisiones que ningún otro script tiene como down_revision"""
+    revisions, parents = set(), set()
+    for path in (MIGRATIONS_DIR / "versions").glob("*.py"):
+        revision, down = _revision_ids(path)
+        if revision:
+            revisions.add(revision)
+            parents.update(down)
+    return revisions - parents
+
+
+def current_revisions(engine) -> Set[str]:
+    """Revisiones aplicadas en la base de datos (vacío si nunca se migró)"""
+    with engine.connect() as connection:
+        try:
+            rows = connection.execute(text("SELECT version_num FROM alembic_version")).scalars()
+            return set(rows)
+        except SQLAlchemyError:
+            return set()
+
+
+def check_schema_version(engine) -> bool:
+    """True si la base de datos está en la última revisión"""
+    current, heads = current_revisions(engine), head_revisions()
+    if current == heads:
+        logger.info(f"Database schema at revision {', '.join(sorted(current))}")
+        return True
+    logger.error(
+        f"Database schema at revision {', '.join(sorted(current)) or 'none'}, "
+        f"expected {', '.join(sorted(heads))}. Run: python -m app.scripts.migrations upgrade"
+    )
+    return False
+
+
+def upgrade_schema(revision: str = "head") -> None:
+    from alembic import command
+
+    command.upgrade(alembic_config(), revision)
+
@@ -0,0 +1,156 @@
+# app/database/statement_timeouts.py
+"""
+Tiempo máximo por sentencia SQL, configurable por ruta.
+
+Cada ruta puede declarar su límite con statement_timeout(ms) en
+openapi_extra; sin declarar se usa DB_STATEMENT_TIMEOUT_MS (0 lo desactiva).
+En MySQL los SELECT llevan el hint /*+ MAX_EXECUTION_TIME(ms) */: el servidor
+corta la consulta y la conexión vuelve al pool enseguida, en lugar de quedar
+ocupada hasta el read_timeout de 30 s. MySQL solo aplica el hint a SELECT;
+las escrituras siguen limitadas por innodb_lock_wait_timeout y read_timeout.
+En SQLite (desarrollo) se interrumpe la consulta con un progress handler.
+
+Los errores se convierten en respuestas limpias: 504 si la consulta superó
+su tiempo, 503 si no hubo conexión libre en el pool a tiempo.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_TIMEOUT_KEY = "x-statement-timeout-ms"
+
+# ER_QUERY_TIMEOUT: "maximum statement execution time exceeded"
+MYSQL_QUERY_TIMEOUT = 3024
+# CR_SERVER_LOST: la consulta superó el read_timeout del cliente
+MYSQL_SERVER_LOST = 2013
+
+# Instrucciones de VM entre chequeos del progress handler de SQLite
+SQLITE_PROGRESS_STEPS = 1000
+
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+_current_scope: ContextVar[Optional[dict]] = ContextVar("statement_timeout_scope", default=None)
+
+
+def statement_timeout(milliseconds: int) -> dict:
+    """
+    Metadata de ruta con el tiempo máximo de cada consulta. Se combina con
+    query_budget(): openapi_extra={**query_budget(1), **statement_timeout(2000)}
+    """
+    return {STATEMENT_TIMEOUT_KEY: milliseconds}
+
+
+def route_timeout_ms(scope: dict) -> int:
+    extra = getattr(scope.get("route"), "openapi_extra", None) or {}
+    return extra.get(STATEMENT_TIMEOUT_KEY, settings.db_statement_timeout_ms)
+
+
+def current_timeout_ms() -> int:
+    """Límite de la petición en curso (la ruta ya está resuelta al ejecutar SQL)"""
+    scope = _current_scope.get()
+    return route_timeout_ms(scope) if scope is not None else 0
+
+
+def with_max_execution_time(statement: str, milliseconds: int) -> str:
+    """Agrega el hint de MySQL a un SELECT (otras sentencias no cambian)"""
+    match = _SELECT.match(statement)
+    if match is None or "MAX_EXECUTION_TIME" in statement:
+        return statement
+    return f"{statement[:match.end()]} /*+ MAX_EXECUTION_TIME({int(milliseconds)}) */{statement[match.end():]}"
+
+
+def _sqlite_connection(conn):
+    driver_connection = conn.connection.driver_connection
+    # Solo pysqlite; aiosqlite no expone set_progress_handler en el hilo del driver
+    return driver_connection if hasattr(driver_connection, "set_progress_handler") else None
+
+
+@event.listens_for(Engine, "before_cursor_execute", retval=True)
+def _apply_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+    milliseconds = current_timeout_ms()
+    if milliseconds <= 0:
+        return statement, parameters
+
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        statement = with_max_execution_time(statement, milliseconds)
+    elif dialect == "sqlite":
+        driver_connection = _sqlite_connection(conn)
+        if driver_connection is not None:
+            deadline = time.monotonic() + milliseconds / 1000
+            driver_connection.set_progress_handler(
+                lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS
+            )
+            conn.info["statement_deadline"] = True
+    return statement, parameters
+
+
+def _clear_sqlite_deadline(conn):
+    if conn.info.pop("statement_deadline", None):
+        driver_connection = _sqlite_connection(conn)
+        if driver_connection is not None:
+            driver_connection.set_progress_handler(None, SQLITE_PROGRESS_STEPS)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _clear_sqlite_deadline(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and not connection.closed:
+        _clear_sqlite_deadline(connection)
+
+
+def is_statement_timeout(exc: OperationalError) -> bool:
+    """True si la consulta se cortó por tiempo (hint, read_timeout o SQLite)"""
+    orig = exc.orig
+    code = orig.args[0] if getattr(orig, "args", None) else None
+    if code in (MYSQL_QUERY_TIMEOUT, MYSQL_SERVER_LOST):
+        return True
+    return str(orig) == "interrupted"
+
+
+async def apply_statement_timeouts(request: Request, call_next):
+    """Middleware: expone la ruta de la petición a los eventos del engine"""
+    token = _current_scope.set(request.scope)
+    try:
+        return await call_next(request)
+    finally:
+        _current_scope.reset(token)
+
+
+async def statement_timeout_handler(request: Request, exc: OperationalError):
+    """504 para consultas cortadas por tiempo; el resto sigue como error 500"""
+    if not is_statement_timeout(exc):
+        raise exc
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    logger.warning(f"{request.method} {route}: statement timeout ({route_timeout_ms(request.scope)} ms)")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "The database query took too long, please try again"},
+    )
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """503 si no hubo conexión libre en el pool dentro de DB_POOL_TIMEOUT_SECONDS"""
+    logger.warning(f"{request.method} {request.url.path}: database pool timeout: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable, please try again"},
+        headers={"Retry-After": "1"},
+    )
@@ -1,7 +1,7 @@
 # app/models/__init__.py
-from .user_model import User, UserProfile
+from .user_model import User, UserProfile, RevokedToken
 from .payment_model import PaymentMethod, UserPaymentMethod
-from .product_model import Supplier, Product, Category, ProductCategory, ProductReview, ProductAttributeType, ProductAttributeValue
+from .product_model import Supplier, Product, Category, CategoryClosure, ProductCategory, ProductReview, ProductAttributeType, ProductAttributeValue
 from .cart_model import ShoppingCart, CartItem, Wishlist, WishlistItem
 from .order_model import Order, OrderItem
 from .store_model import Store, StoreInventory, StoreStaff, PhysicalSale, PhysicalSaleItem
@@ -10,9 +10,9 @@ from .discount_model import Discount, ProductDiscount, CategoryDiscount
 
 # Para que SQLAlchemy cree todas las tablas en Base.metadata.create_all()
 __all__ = [
-    'User', 'UserProfile', 
+    'User', 'UserProfile', 'RevokedToken',
     'PaymentMethod', 'UserPaymentMethod',
-    'Supplier', 'Product', 'Category', 'ProductCategory', 'ProductReview', 'ProductAttributeType', 'ProductAttributeValue',
+    'Supplier', 'Product', 'Category', 'CategoryClosure', 'ProductCategory', 'ProductReview', 'ProductAttributeType', 'ProductAttributeValue',
     'ShoppingCart', 'CartItem', 'Wishlist', 'WishlistItem',
     'Order', 'OrderItem',
     'Store', 'StoreInventory', 'StoreStaff', 'PhysicalSale', 'PhysicalSaleItem',
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, Enum, DateTime, Text, String, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, Enum, DateTime, Text, String, ForeignKey, DECIMAL, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database.database import Base
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_created", "user_id", "created_at"),
+        Index("ix_orders_status_created", "status", "created_at"),
+    )
     
     order_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
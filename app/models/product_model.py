@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DECIMAL, Date, ForeignKey, TIMESTAMP, Table, DateTime, JSON, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Text, DECIMAL, Date, ForeignKey, TIMESTAMP, Table, DateTime, JSON, Boolean, Enum, Index
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.sql import func
 from ..database.database import Base
@@ -26,6 +26,19 @@ class Supplier(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    # Índices para los filtros del catálogo (migración 0002_catalog_indexes)
+    __table_args__ = (
+        Index("ix_products_active_featured", "is_active", "is_featured"),
+        Index("ix_products_active_type_price", "is_active", "product_type", "price"),
+        Index("ix_products_active_price", "is_active", "price"),
+        Index("ix_products_supplier_active", "supplier_id", "is_active"),
+        # Paginación por cursor (orden + product_id)
+        Index("ix_products_price_id", "price", "product_id"),
+        Index("ix_products_created_id", "created_at", "product_id"),
+        Index("ix_products_active_created_id", "is_active", "created_at", "product_id"),
+        # Búsqueda MATCH ... AGAINST (solo MySQL, ver app/search/product_search.py)
+        Index("ft_products_search", "name", "description", "sku", mysql_prefix="FULLTEXT"),
+    )
     
     product_id = Column(Integer, primary_key=True, autoincrement=True)
     supplier_id = Column(Integer, ForeignKey('suppliers.supplier_id', ondelete="CASCADE"))
@@ -60,6 +73,10 @@ class Product(Base):
     
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_parent_active", "parent_category_id", "is_active"),
+        Index("ix_categories_active_id", "is_active", "category_id"),
+    )
     
     category_id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
@@ -84,9 +101,29 @@ class Category(Base):
     
     
     
+# Jerarquía materializada (closure table): una fila por cada par
+# ancestro-descendiente, incluida cada categoría consigo misma (depth 0).
+# Se mantiene desde los eventos de Category (database/category_hierarchy.py)
+class CategoryClosure(Base):
+    __tablename__ = "category_closure"
+    # La PK (ancestor_id, descendant_id) sirve para árbol y descendientes;
+    # este índice, para la cadena de ancestros
+    __table_args__ = (
+        Index("ix_category_closure_descendant_depth", "descendant_id", "depth"),
+    )
+    
+    ancestor_id = Column(Integer, ForeignKey("categories.category_id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.category_id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+
 # Tabla de relación muchos a muchos entre productos y categorías
 class ProductCategory(Base):
     __tablename__ = "product_categories"
+    # La PK (product_id, category_id) no sirve para filtrar por categoría
+    __table_args__ = (
+        Index("ix_product_categories_category", "category_id", "product_id"),
+    )
     
     product_id = Column(Integer, ForeignKey("products.product_id", ondelete="CASCADE"), primary_key=True)
     category_id = Column(Integer, ForeignKey("categories.category_id", ondelete="CASCADE"), primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, DECIMAL, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, DECIMAL, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,6 +26,10 @@ class SalesStatistics(Base):
 
 class InventoryMovement(Base):
     __tablename__ = "inventory_movements"
+    __table_args__ = (
+        Index("ix_inventory_movements_product_created", "product_id", "created_at"),
+        Index("ix_inventory_movements_store_created", "store_id", "created_at"),
+    )
     
     movement_id = Column(Integer, primary_key=True, autoincrement=True)
     product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False)
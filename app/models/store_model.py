@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Time, ForeignKey, Enum, DECIMAL
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Time, ForeignKey, Enum, DECIMAL, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database.database import Base
@@ -32,6 +32,10 @@ class Store(Base):
 
 class StoreInventory(Base):
     __tablename__ = "store_inventory"
+    __table_args__ = (
+        Index("ix_store_inventory_product_store", "product_id", "store_id"),
+        Index("ix_store_inventory_store_quantity", "store_id", "quantity"),
+    )
     
     inventory_id = Column(Integer, primary_key=True, autoincrement=True)
     store_id = Column(Integer, ForeignKey("stores.store_id"), nullable=False)
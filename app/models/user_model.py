@@ -67,4 +67,18 @@ class UserProfile(Base):
     
     def __repr__(self):
         return f"<UserProfile {self.first_name} {self.last_name}>"
-    
\ No newline at end of file
+
+
+class RevokedToken(Base):
+    """Tokens (refresh o access) revocados antes de su expiración"""
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete="CASCADE"), nullable=False)
+    token_type = Column(String(20), nullable=False)
+    revoked_at = Column(DateTime, server_default=func.current_timestamp())
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
+
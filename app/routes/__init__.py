@@ -9,6 +9,7 @@ from .product import router as product_router
 from .auth import router as auth_router
 from .user import router as user_router
 from .category import router as category_router
+from .metrics import router as metrics_router
 
 main_router = APIRouter(prefix="/api/v1")
 
@@ -36,11 +37,18 @@ main_router.include_router(
     tags=["Categories"]
 )
 
+main_router.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
 __all__ = [
     "product_router",
     "auth_router",
     "user_router",
-    "category_router"
+    "category_router",
+    "metrics_router"
     ]
 
 #metada for the module 
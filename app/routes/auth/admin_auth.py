@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Any
 from ...database.database import get_db
 from ...models.user_model import User
 from ...schemas import user_schemas
-from ...core.jwt_handler import create_admin_access_token, verify_password
+from ...core.jwt_handler import create_admin_access_token, create_refresh_token, token_claims
+from ...core.last_login_buffer import last_login_buffer
+from ...core.rate_limiter import login_throttle, client_ip
+from ...core.password_hasher import verify_password_async, rehash_if_needed
 from datetime import datetime, timezone
-from ...core.dependencies import get_current_admin_or_staff_user
+import logging
+from ...core.dependencies import get_current_admin_or_staff_principal
+from ...core.security import Principal
+from ...core.permissions import permission_registry
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin")
 
@@ -16,14 +26,20 @@ router = APIRouter(prefix="/admin")
     description="Login exclusivo para administradores y staff",
     status_code=status.HTTP_200_OK
 )
-def admin_login(
+async def admin_login(
     form_data: user_schemas.UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     
     try:
+        # Throttle antes de tocar la base de datos o bcrypt
+        login_throttle.check(form_data.email, client_ip(request))
+
         # Buscar usuario por email
-        user = db.query(User).filter(User.email == form_data.email).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == form_data.email).first()
+        )
         
         if not user:
             raise HTTPException(
@@ -33,7 +49,7 @@ def admin_login(
             )
             
         # Verificar contraseña
-        if not verify_password(form_data.password, user.password_hash):
+        if not await verify_password_async(form_data.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Credenciales incorrectas",
@@ -54,25 +70,20 @@ def admin_login(
                 detail="Usuario inactivo"
             )
         
+        # Credenciales correctas: el contador del email vuelve a cero
+        login_throttle.reset_email(form_data.email)
+
+        # Rehash transparente si el costo de bcrypt cambió
+        rehashed = await rehash_if_needed(user, form_data.password)
+
         # Actualizar última fecha de login
-        try:
-            user.last_login = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(user)
-        except Exception as e:
-            db.rollback()
-            print(f"Warning: Failed to update last_login for admin user {user.email}: {str(e)}")
+        await run_in_threadpool(update_admin_last_login, db, user, rehashed)
         
         # Crear token admin con información adicional
-        # CORREGIDO: usar user.user_id en lugar de user.id
-        token_data = {
-            "sub": user.email,
-            "user_id": user.user_id,  # CAMBIO: user.id -> user.user_id
-            "user_type": user.user_type,
-            "role": user.user_type
-        }
+        token_data = token_claims(user, is_admin=True)
         
         access_token = create_admin_access_token(data=token_data)
+        refresh_token = create_refresh_token(data=token_data, is_admin=True)
         
         # CORREGIDO: Usar el objeto user directamente para que Pydantic haga el mapeo
         # En lugar de crear un dict manual, dejar que el schema AdminUserInfo maneje el mapeo
@@ -80,7 +91,8 @@ def admin_login(
             "access_token": access_token,
             "token_type": "bearer",
             "user": user,  # CAMBIO: Pasar el objeto user directamente
-            "permissions": get_user_permissions(user.user_type)
+            "permissions": permission_registry.names_for_role(user.user_type),
+            "refresh_token": refresh_token
         }
         
     except HTTPException:
@@ -91,31 +103,32 @@ def admin_login(
             detail=f"Error interno del servidor: {str(e)}"
         )
         
-def get_user_permissions(user_type: str) -> list:
+def update_admin_last_login(db: Session, user: User, rehashed: bool) -> None:
     """
-    Retorna los permisos según el tipo de usuario
+    Anota el último login en el buffer write-behind (se escribe en lote).
+    Solo hace commit si hubo rehash de la contraseña; nunca hace fallar el login
     """
-    permissions_map = {
-        'admin': [
-            'manage_users',
-            'manage_books',
-            'view_reports',
-            'manage_orders',
-            'manage_inventory',
-            'system_settings'
-        ],
-        'store_staff': [
-            'manage_books',
-            'manage_orders',
-            'manage_inventory',
-            'view_reports'
-        ]
-    }
-    return permissions_map.get(user_type, [])
+    if rehashed:
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to save rehashed password for admin user_id={user.user_id}: {str(e)}")
+        # commit/rollback expiran el objeto: recargarlo aquí, en el threadpool,
+        # y no con un lazy load en el event loop al armar los claims y la respuesta
+        db.refresh(user)
+
+    logged_in_at = datetime.now(timezone.utc)
+    last_login_buffer.record(user.user_id, logged_in_at)
+    # Reflejar el valor en la respuesta sin marcar el objeto como modificado
+    set_committed_value(user, "last_login", logged_in_at)
 
-@router.post("/verify-token")
+@router.post(
+    "/verify-token",
+    response_model=user_schemas.TokenVerification
+)
 def verify_admin_token_endpoint(
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(get_current_admin_or_staff_principal)
 ):
     """
     Verificar que el token admin es válido
@@ -123,5 +136,5 @@ def verify_admin_token_endpoint(
     return {
         "valid": True,
         "user": current_user,  # CAMBIO: Pasar el objeto user directamente
-        "permissions": get_user_permissions(current_user.user_type)
+        "permissions": permission_registry.names(current_user.permissions)
     }
\ No newline at end of file
@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from ...database.database import get_db
+from ...models.user_model import User
+from ...schemas import user_schemas
+from ...core.jwt_handler import (
+    create_access_token,
+    create_admin_access_token,
+    create_refresh_token,
+    token_claims,
+    verify_refresh_token,
+    verify_token,
+)
+from ...core.principal_cache import principal_cache
+from ...core.revocation import revocation_list
+from ...core.security import security
+
+router = APIRouter()
+
+
+def _expiration(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+
+@router.post(
+    "/refresh",
+    response_model=user_schemas.RefreshTokenResponse,
+    description="Emite un nuevo access token a partir de un refresh token (con rotación)",
+    tags=["Authentication"]
+)
+def refresh_access_token(
+    request: user_schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Intercambia un refresh token por un nuevo par access/refresh token.
+
+    El refresh token presentado queda revocado (rotación): si se vuelve a
+    usar se rechaza. No requiere verificar la contraseña de nuevo.
+
+    - **refresh_token**: Refresh token recibido en el login o en un refresh anterior
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = verify_refresh_token(request.refresh_token)
+    if not payload or not payload.get("jti") or payload.get("user_id") is None:
+        raise credentials_exception
+
+    # Filtro de Bloom: sin lectura a la base de datos en el caso común
+    if revocation_list.is_revoked(payload["jti"], db):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = db.query(User).filter(User.user_id == payload["user_id"]).first()
+    if user is None or user.email != payload.get("sub"):
+        raise credentials_exception
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    is_admin = payload.get("scope") == "admin"
+    if is_admin and user.user_type not in ['admin', 'store_staff']:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acceso denegado. Se requieren permisos de administrador."
+        )
+
+    # Rotación: la clave primaria de revoked_tokens detecta la reutilización
+    # aunque otro worker haya rotado el mismo token
+    if not revocation_list.revoke(db, payload["jti"], user.user_id, "refresh", _expiration(payload)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token already used",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    token_data = token_claims(user, is_admin=is_admin)
+    if is_admin:
+        access_token = create_admin_access_token(data=token_data)
+    else:
+        access_token = create_access_token(data=token_data)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(data=token_data, is_admin=is_admin),
+        "token_type": "bearer"
+    }
+
+
+@router.post(
+    "/logout",
+    response_model=dict,
+    description="Revoca el refresh token y, si se envía, el access token actual",
+    tags=["Authentication"]
+)
+def logout(
+    request: user_schemas.RefreshTokenRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """
+    Cierra la sesión revocando el refresh token.
+
+    Si además se envía el header Authorization con el access token, este
+    también queda revocado hasta su expiración.
+
+    - **refresh_token**: Refresh token a revocar
+    """
+    payload = verify_refresh_token(request.refresh_token)
+    if not payload or not payload.get("jti") or payload.get("user_id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    revoked = 0
+    if revocation_list.revoke(db, payload["jti"], payload["user_id"], "refresh", _expiration(payload)):
+        revoked += 1
+
+    if credentials:
+        access_payload = verify_token(credentials.credentials)
+        if (
+            access_payload
+            and access_payload.get("jti")
+            and access_payload.get("token_type") in ("user", "admin")
+            and access_payload.get("sub") == payload.get("sub")
+        ):
+            if revocation_list.revoke(
+                db,
+                access_payload["jti"],
+                payload["user_id"],
+                access_payload["token_type"],
+                _expiration(access_payload),
+            ):
+                revoked += 1
+
+    principal_cache.invalidate_email(payload.get("sub"))
+
+    return {
+        "message": "Successfully logged out",
+        "revoked_tokens": revoked
+    }
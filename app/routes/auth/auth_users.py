@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Any
 from ...database.database import get_db
 from ...models.user_model import User
 from ...schemas import user_schemas
-from ...core.jwt_handler import create_access_token, get_password_hash, verify_password
+from ...core.jwt_handler import create_access_token, create_refresh_token, token_claims
+from ...core.last_login_buffer import last_login_buffer
+from ...core.rate_limiter import login_throttle, client_ip
+from ...core.password_hasher import hash_password_async, verify_password_async, rehash_if_needed
 import bcrypt
+import logging
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -20,44 +28,53 @@ router = APIRouter()
     description="Registro de nuevos usuarios",
     tags=["Authentication"]
 )
-def register_user(
+async def register_user(
     user: user_schemas.UserCreate,
     db: Session = Depends(get_db)
 ) -> Any:
-    # Verificar si el email ya existe
-    if db.query(User).filter(User.email == user.email).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Verificar si el username ya existe
-    if db.query(User).filter(User.username == user.username).first():
+    # Las consultas se ejecutan en el threadpool; bcrypt va al pool dedicado
+    def find_conflict():
+        # Verificar si el email ya existe
+        if db.query(User).filter(User.email == user.email).first():
+            return "Email already registered"
+        
+        # Verificar si el username ya existe
+        if db.query(User).filter(User.username == user.username).first():
+            return "Username already taken"
+        return None
+
+    conflict = await run_in_threadpool(find_conflict)
+    if conflict:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
+            detail=conflict
         )
     
+    password_hash = await hash_password_async(user.password)
+
     # Crear el usuario con el tipo especificado o 'common' por defecto
-    try:
-        db_user = User(
-            username=user.username,
-            email=user.email,
-            password_hash=get_password_hash(user.password),
-            user_type=user.user_type,  # Esto ahora usará string directamente
-            is_active=True
-        )
-        
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    def save_user():
+        try:
+            db_user = User(
+                username=user.username,
+                email=user.email,
+                password_hash=password_hash,
+                user_type=user.user_type,  # Esto ahora usará string directamente
+                is_active=True
+            )
+            
+            db.add(db_user)
+            db.commit()
+            db.refresh(db_user)
+            return db_user
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    return await run_in_threadpool(save_user)
 
 @router.post(
     "/login",
@@ -65,19 +82,23 @@ def register_user(
     description="Login de usuarios",
     tags=["Authentication"]
 )
-def login(
+async def login(
     form_data: user_schemas.UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     try:
-        print("helloo eso se esta trqueriando")
+        # Throttle antes de tocar la base de datos o bcrypt
+        login_throttle.check(form_data.email, client_ip(request))
+
         # Buscar usuario por email
-        user = db.query(User).filter(User.email == form_data.email).first()
-        print(f"Attempting login for user: {form_data.email}")
-        print(f"User found: {form_data.password}")
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == form_data.email).first()
+        )
+        logger.info(f"Login attempt for user_id={user.user_id if user else None}")
         
         # Verificar si el usuario existe y la contraseña es correcta
-        if not user or not verify_password(form_data.password, user.password_hash):
+        if not user or not await verify_password_async(form_data.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -91,25 +112,26 @@ def login(
                 headers={"WWW-Authenticate": "Bearer"}
             )    
             
+        # Credenciales correctas: el contador del email vuelve a cero
+        login_throttle.reset_email(form_data.email)
+
+        # Rehash transparente si el costo de bcrypt cambió
+        rehashed = await rehash_if_needed(user, form_data.password)
+
         # Actualizar última fecha de login
-        try:
-            user.last_login = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(user)
-            print(f"User {user.email} logged in at {user.last_login}")
-        except Exception as e:
-            db.rollback()
-            # Si falla la actualización, registrar pero no fallar el login
-            print(f"Warning: Failed to update last_login for user {user.email}: {str(e)}")  
+        await run_in_threadpool(update_last_login, db, user, rehashed)
         
         # Crear el token de acceso
-        access_token = create_access_token(data={"sub": user.email})
+        token_data = token_claims(user)
+        access_token = create_access_token(data=token_data)
+        refresh_token = create_refresh_token(data=token_data)
         
         # Retornar el token y la información del usuario
         return {
             "access_token": access_token,
             "token_type": "bearer",
-            "user": user
+            "user": user,
+            "refresh_token": refresh_token
         }   
     except HTTPException as he:
         raise 
@@ -117,4 +139,25 @@ def login(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+def update_last_login(db: Session, user: User, rehashed: bool) -> None:
+    """
+    Anota el último login en el buffer write-behind (se escribe en lote).
+    Solo hace commit si hubo rehash de la contraseña; nunca hace fallar el login
+    """
+    if rehashed:
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to save rehashed password for user_id={user.user_id}: {str(e)}")
+        # commit/rollback expiran el objeto: recargarlo aquí, en el threadpool,
+        # y no con un lazy load en el event loop al armar los claims y la respuesta
+        db.refresh(user)
+
+    logged_in_at = datetime.now(timezone.utc)
+    last_login_buffer.record(user.user_id, logged_in_at)
+    # Reflejar el valor en la respuesta sin marcar el objeto como modificado
+    set_committed_value(user, "last_login", logged_in_at)
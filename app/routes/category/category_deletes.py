@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from ...database.database import get_db
+from ...database.query_stats import query_budget
 from ...models.product_model import Category, Product, ProductCategory
 from ...schemas import product_schemas
-from ...core.dependencies import get_current_admin_or_staff_user
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -18,7 +21,7 @@ router = APIRouter()
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Desactiva una categoría (soft delete) estableciendo is_active = False.
@@ -107,7 +110,7 @@ def hard_delete_category(
     category_id: int,
     force: bool = False,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Elimina permanentemente una categoría de la base de datos (hard delete).
@@ -206,12 +209,13 @@ def hard_delete_category(
     "/bulk/deactivate",
     response_model=dict,
     description="Desactiva múltiples categorías en una sola operación",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(5)
 )
 def bulk_deactivate_categories(
     category_ids: list[int],
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Desactiva múltiples categorías en una sola operación.
@@ -239,53 +243,55 @@ def bulk_deactivate_categories(
     deactivated = []
     errors = []
     
+    # Cargar las categorías y contar sus subcategorías activas en dos consultas
+    categories = {
+        category.category_id: category
+        for category in db.query(Category).filter(Category.category_id.in_(category_ids)).all()
+    }
+    active_subcategories_by_parent = dict(
+        db.query(Category.parent_category_id, func.count(Category.category_id))
+        .filter(
+            Category.parent_category_id.in_(list(categories)),
+            Category.is_active == True
+        )
+        .group_by(Category.parent_category_id)
+        .all()
+    ) if categories else {}
+    
     for category_id in category_ids:
-        try:
-            # Verificar que existe
-            db_category = db.query(Category).filter(
-                Category.category_id == category_id
-            ).first()
-            
-            if not db_category:
-                errors.append({
-                    "category_id": category_id,
-                    "error": "Category not found"
-                })
-                continue
-            
-            # Verificar si ya está inactiva
-            if not db_category.is_active:
-                errors.append({
-                    "category_id": category_id,
-                    "error": "Category is already inactive"
-                })
-                continue
-            
-            # Verificar subcategorías activas
-            active_subcategories = db.query(Category).filter(
-                Category.parent_category_id == category_id,
-                Category.is_active == True
-            ).count()
-            
-            if active_subcategories > 0:
-                errors.append({
-                    "category_id": category_id,
-                    "error": f"Has {active_subcategories} active subcategories"
-                })
-                continue
-            
-            # Desactivar
-            db_category.is_active = False
-            deactivated.append({
+        db_category = categories.get(category_id)
+        
+        if not db_category:
+            errors.append({
+                "category_id": category_id,
+                "error": "Category not found"
+            })
+            continue
+        
+        # Verificar si ya está inactiva
+        if not db_category.is_active:
+            errors.append({
                 "category_id": category_id,
-                "category_name": db_category.name
+                "error": "Category is already inactive"
             })
-            
-        except Exception as e:
+            continue
+        
+        # Verificar subcategorías activas
+        active_subcategories = active_subcategories_by_parent.get(category_id, 0)
+        
+        if active_subcategories > 0:
             errors.append({
                 "category_id": category_id,
-                "error": str(e)
+                "error": f"Has {active_subcategories} active subcategories"
             })
+            continue
+        
+        # Desactivar
+        db_category.is_active = False
+        deactivated.append({
+            "category_id": category_id,
+            "category_name": db_category.name
+        })
     
     try:
         db.commit()
@@ -1,23 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, select
 from typing import List, Optional
-from ...database.database import get_db
+from ...database.replicas import get_async_read_db
+from ...database.query_stats import query_budget
+from ...database.statement_timeouts import statement_timeout
+from ...database.pagination import Keyset, check_pagination, set_next_cursor
+from ...database.category_hierarchy import ancestors_query, descendants_query, build_tree
+from ...search.changes import CATEGORY
+from ...search.fuzzy import fuzzy_index
+from ...search.product_search import order_by_ids
 from ...models.product_model import Category, Product
 from ...schemas import product_schemas
 
 router = APIRouter()
 
+CATEGORIES_BY_ID = Keyset("categories:category_id:asc", Category.category_id)
+
+
+async def fetch_categories(db: AsyncSession, query) -> List[Category]:
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def fetch_category(db: AsyncSession, category_id: int) -> Optional[Category]:
+    result = await db.execute(select(Category).where(Category.category_id == category_id))
+    return result.scalars().first()
+
+
 @router.get(
     "/",
     response_model=List[product_schemas.CategoryResponse],
     description="Obtiene una lista de categorías con filtros opcionales",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(2)
 )
-def get_categories(
-    db: Session = Depends(get_db),
+async def get_categories(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=500, description="Número máximo de registros a retornar"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor), alternativa a skip"),
     name: Optional[str] = Query(None, description="Buscar por nombre de la categoría"),
     is_active: Optional[bool] = Query(None, description="Filtrar por categorías activas/inactivas"),
     parent_category_id: Optional[int] = Query(None, description="Filtrar por categoría padre")
@@ -27,12 +50,15 @@ def get_categories(
     
     - **skip**: Número de registros a omitir (para paginación)
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente; más rápido que skip en páginas profundas
     - **name**: Buscar categorías que contengan este texto en el nombre
     - **is_active**: Filtrar solo categorías activas o inactivas
     - **parent_category_id**: Filtrar por categoría padre específica
     """
     
-    query = db.query(Category)
+    check_pagination(skip, cursor)
+
+    query = select(Category)
     filters = []
     
     if name:
@@ -42,9 +68,9 @@ def get_categories(
         filters.append(Category.is_active == is_active)
     
     if parent_category_id is not None:
-        parent_exists = db.query(Category).filter(
-            Category.category_id == parent_category_id
-        ).first()
+        parent_exists = await db.scalar(
+            select(Category.category_id).where(Category.category_id == parent_category_id)
+        )
         
         if not parent_exists:
             raise HTTPException(
@@ -55,9 +81,11 @@ def get_categories(
         filters.append(Category.parent_category_id == parent_category_id)
     
     if filters:
-        query = query.filter(and_(*filters))
+        query = query.where(and_(*filters))
     
-    categories = query.offset(skip).limit(limit).all()
+    categories = await fetch_categories(db, CATEGORIES_BY_ID.apply(query, cursor).offset(skip).limit(limit + 1))
+    categories, next_cursor = CATEGORIES_BY_ID.page(categories, limit)
+    set_next_cursor(response, next_cursor)
     
     return categories
 
@@ -66,11 +94,12 @@ def get_categories(
     "/{category_id}",
     response_model=product_schemas.CategoryResponse,
     description="Obtiene una categoría específica por su ID",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(1)
 )
-def get_category_by_id(
+async def get_category_by_id(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Obtiene una categoría específica por su ID.
@@ -78,9 +107,7 @@ def get_category_by_id(
     - **category_id**: ID de la categoría a obtener
     """
     
-    category = db.query(Category).filter(
-        Category.category_id == category_id
-    ).first()
+    category = await fetch_category(db, category_id)
     
     if not category:
         raise HTTPException(
@@ -95,11 +122,12 @@ def get_category_by_id(
     "/{category_id}/subcategories",
     response_model=List[product_schemas.CategoryResponse],
     description="Obtiene las subcategorías de una categoría",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(2)
 )
-def get_subcategories(
+async def get_subcategories(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     is_active: Optional[bool] = Query(None, description="Filtrar por subcategorías activas/inactivas")
@@ -113,9 +141,9 @@ def get_subcategories(
     - **is_active**: Filtrar solo subcategorías activas o inactivas
     """
     
-    parent_category = db.query(Category).filter(
-        Category.category_id == category_id
-    ).first()
+    parent_category = await db.scalar(
+        select(Category.category_id).where(Category.category_id == category_id)
+    )
     
     if not parent_category:
         raise HTTPException(
@@ -123,14 +151,14 @@ def get_subcategories(
             detail=f"Parent category with ID {category_id} not found"
         )
     
-    query = db.query(Category).filter(
+    query = select(Category).where(
         Category.parent_category_id == category_id
     )
     
     if is_active is not None:
-        query = query.filter(Category.is_active == is_active)
+        query = query.where(Category.is_active == is_active)
     
-    subcategories = query.offset(skip).limit(limit).all()
+    subcategories = await fetch_categories(db, query.offset(skip).limit(limit))
     
     return subcategories
 
@@ -139,10 +167,11 @@ def get_subcategories(
     "/root/all",
     response_model=List[product_schemas.CategoryResponse],
     description="Obtiene las categorías raíz (sin padre)",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(1)
 )
-def get_root_categories(
-    db: Session = Depends(get_db),
+async def get_root_categories(
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     is_active: Optional[bool] = Query(True, description="Filtrar por categorías activas/inactivas")
@@ -155,14 +184,14 @@ def get_root_categories(
     - **is_active**: Filtrar solo categorías activas o inactivas (default: True)
     """
     
-    query = db.query(Category).filter(
+    query = select(Category).where(
         Category.parent_category_id.is_(None)
     )
     
     if is_active is not None:
-        query = query.filter(Category.is_active == is_active)
+        query = query.where(Category.is_active == is_active)
     
-    categories = query.offset(skip).limit(limit).all()
+    categories = await fetch_categories(db, query.offset(skip).limit(limit))
     
     return categories
 
@@ -171,14 +200,16 @@ def get_root_categories(
     "/search/{search_term}",
     response_model=List[product_schemas.CategoryResponse],
     description="Busca categorías por término de búsqueda",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra={**query_budget(1), **statement_timeout(2000)}
 )
-def search_categories(
+async def search_categories(
     search_term: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    is_active: Optional[bool] = Query(True, description="Filtrar por categorías activas")
+    is_active: Optional[bool] = Query(True, description="Filtrar por categorías activas"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo (por nombre, ordenado por similitud)")
 ):
     """
     Busca categorías por término de búsqueda en nombre y descripción.
@@ -187,6 +218,8 @@ def search_categories(
     - **skip**: Número de registros a omitir
     - **limit**: Número máximo de registros a retornar
     - **is_active**: Filtrar solo categorías activas (default: True)
+    - **fuzzy**: Búsqueda por similitud de trigramas sobre el nombre; solo
+      cubre categorías activas (mientras el índice carga se usa la búsqueda normal)
     """
     
     if len(search_term.strip()) < 2:
@@ -195,7 +228,17 @@ def search_categories(
             detail="Search term must be at least 2 characters long"
         )
     
-    query = db.query(Category).filter(
+    if fuzzy and fuzzy_index.ready:
+        category_ids = fuzzy_index.search(CATEGORY, search_term, skip, limit)
+        if not category_ids:
+            return []
+        query = select(Category).where(Category.category_id.in_(category_ids))
+        if is_active is not None:
+            query = query.where(Category.is_active == is_active)
+        categories = await fetch_categories(db, query)
+        return order_by_ids(categories, category_ids, key="category_id")
+    
+    query = select(Category).where(
         or_(
             Category.name.ilike(f"%{search_term}%"),
             Category.description.ilike(f"%{search_term}%")
@@ -203,9 +246,9 @@ def search_categories(
     )
     
     if is_active is not None:
-        query = query.filter(Category.is_active == is_active)
+        query = query.where(Category.is_active == is_active)
     
-    categories = query.offset(skip).limit(limit).all()
+    categories = await fetch_categories(db, query.offset(skip).limit(limit))
     
     return categories
 
@@ -214,11 +257,12 @@ def search_categories(
     "/{category_id}/products-count",
     response_model=dict,
     description="Obtiene el conteo de productos en una categoría",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(2)
 )
-def get_category_products_count(
+async def get_category_products_count(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     include_inactive: bool = Query(False, description="Incluir productos inactivos en el conteo")
 ):
     """
@@ -228,9 +272,7 @@ def get_category_products_count(
     - **include_inactive**: Incluir productos inactivos en el conteo (default: False)
     """
     
-    category = db.query(Category).filter(
-        Category.category_id == category_id
-    ).first()
+    category = await fetch_category(db, category_id)
     
     if not category:
         raise HTTPException(
@@ -238,14 +280,14 @@ def get_category_products_count(
             detail=f"Category with ID {category_id} not found"
         )
     
-    query = db.query(Product).filter(
+    query = select(func.count(Product.product_id)).where(
         Product.categories.any(Category.category_id == category_id)
     )
     
     if not include_inactive:
-        query = query.filter(Product.is_active == True)
+        query = query.where(Product.is_active == True)
     
-    products_count = query.count()
+    products_count = await db.scalar(query)
     
     return {
         "category_id": category_id,
@@ -259,53 +301,58 @@ def get_category_products_count(
     "/{category_id}/tree",
     response_model=dict,
     description="Obtiene el árbol jerárquico de una categoría",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(1)
 )
-def get_category_tree(
+async def get_category_tree(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     max_depth: int = Query(3, ge=1, le=10, description="Profundidad máxima del árbol")
 ):
     """
-    Obtiene el árbol jerárquico de una categoría, incluyendo sus subcategorías.
+    Obtiene el árbol jerárquico de una categoría, incluyendo sus subcategorías
+    activas, en una sola consulta sobre category_closure.
     
     - **category_id**: ID de la categoría raíz
     - **max_depth**: Profundidad máxima del árbol (default: 3, max: 10)
     """
     
-    def build_tree(category, current_depth=0):
-        """Función recursiva para construir el árbol de categorías"""
-        if current_depth >= max_depth:
-            return None
-        
-        tree = {
-            "category_id": category.category_id,
-            "name": category.name,
-            "description": category.description,
-            "is_active": category.is_active,
-            "subcategories": []
-        }
-        
-        subcategories = db.query(Category).filter(
-            Category.parent_category_id == category.category_id,
-            Category.is_active == True
-        ).all()
-        
-        for subcat in subcategories:
-            subtree = build_tree(subcat, current_depth + 1)
-            if subtree:
-                tree["subcategories"].append(subtree)
-        
-        return tree
+    result = await db.execute(descendants_query(category_id, max_depth=max_depth))
+    tree = build_tree(result.all())
+    
+    if not tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category with ID {category_id} not found"
+        )
+    
+    return tree
+
+
+@router.get(
+    "/{category_id}/ancestors",
+    response_model=List[product_schemas.CategoryResponse],
+    description="Obtiene la cadena de categorías desde la raíz (breadcrumb)",
+    tags=["Categories"],
+    openapi_extra=query_budget(1)
+)
+async def get_category_ancestors(
+    category_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Obtiene los ancestros de una categoría desde la raíz hasta ella misma
+    inclusive, en una sola consulta sobre category_closure.
+    
+    - **category_id**: ID de la categoría
+    """
     
-    category = db.query(Category).filter(
-        Category.category_id == category_id
-    ).first()
+    categories = await fetch_categories(db, ancestors_query(category_id))
     
-    if not category:
+    if not categories:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Category with ID {category_id} not found"
         )
     
-    return build_tree(category)
\ No newline at end of file
+    return categories
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ...database.database import get_db
+from ...database.query_stats import query_budget
+from ...database.category_hierarchy import creates_cycle
 from ...models.product_model import Category
 from ...schemas import product_schemas
-from ...core.dependencies import get_current_admin_or_staff_user
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -13,13 +16,14 @@ router = APIRouter()
     "/{category_id}",
     response_model=product_schemas.CategoryResponse,
     description="Actualiza parcialmente una categoría",
-    tags=["Categories"]
+    tags=["Categories"],
+    openapi_extra=query_budget(10)
 )
 def update_category_partial(
     category_id: int,
     category_update: product_schemas.CategoryUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Actualiza parcialmente los campos de una categoría existente.
@@ -89,18 +93,8 @@ def update_category_partial(
                 detail=f"Parent category with ID {update_data['parent_category_id']} is not active"
             )
         
-        # Verificar que no crearía una referencia circular
-        def check_circular_reference(parent_id, original_id):
-            parent = db.query(Category).filter(Category.category_id == parent_id).first()
-            if not parent:
-                return False
-            if parent.parent_category_id == original_id:
-                return True
-            if parent.parent_category_id:
-                return check_circular_reference(parent.parent_category_id, original_id)
-            return False
-        
-        if check_circular_reference(update_data["parent_category_id"], category_id):
+        # Verificar que no crearía una referencia circular (una consulta)
+        if creates_cycle(db, category_id, update_data["parent_category_id"]):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot set parent category: would create circular reference"
@@ -155,7 +149,7 @@ def update_category_partial(
 def toggle_category_status(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Cambia el estado activo/inactivo de una categoría.
@@ -4,7 +4,8 @@ from sqlalchemy.exc import IntegrityError
 from ...database.database import get_db
 from ...models.product_model import Category
 from ...schemas import product_schemas
-from ...core.dependencies import get_current_admin_or_staff_user
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -18,7 +19,7 @@ router = APIRouter()
 def create_category(
     category: product_schemas.CategoryCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user),
+    current_user: Principal = Depends(require(MANAGE_INVENTORY)),
 ):
     
     """
@@ -104,7 +105,7 @@ def create_category(
 def restore_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Reactiva una categoría que fue desactivada anteriormente.
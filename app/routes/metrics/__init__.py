@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from .metrics_gets import router as metrics_gets
+
+# main router for runtime metrics endpoints
+router = APIRouter()
+
+router.include_router(metrics_gets)
+
+
+# Metadata
+__version__ = "1.0.0"
+__description__ = "Runtime metrics endpoints for the e-commerce API"
+
+# Export the router
+__all__ = ["router"]
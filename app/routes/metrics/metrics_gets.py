@@ -0,0 +1,197 @@
+from fastapi import APIRouter, Depends
+from ...core.dependencies import get_current_admin_principal
+from ...core.principal_cache import principal_cache
+from ...core.password_hasher import password_hash_pool
+from ...core.revocation import revocation_list
+from ...core.rate_limiter import login_throttle
+from ...core.last_login_buffer import last_login_buffer
+from ...database.replicas import replica_router
+from ...database.pool_metrics import pool_monitors
+from ...database.query_stats import route_query_stats
+from ...search.product_index import product_search_index
+from ...search.product_search import configured_backend, search_backend
+from ...search.suggest import suggestion_index
+from ...search.fuzzy import fuzzy_index
+from ...config import settings
+from ...core.security import Principal
+
+router = APIRouter()
+
+@router.get(
+    "/principal-cache",
+    response_model=dict,
+    description="Estadísticas de la cache de usuarios autenticados",
+    tags=["Metrics"]
+)
+def get_principal_cache_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna los contadores de la cache de principals (hits, misses, evictions).
+
+    Cada hit corresponde a una consulta a la tabla users que no se ejecutó.
+    Los contadores son por proceso (worker).
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return principal_cache.stats()
+
+
+@router.get(
+    "/password-hashing",
+    response_model=dict,
+    description="Estadísticas del pool de hashing de contraseñas",
+    tags=["Metrics"]
+)
+def get_password_hashing_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna latencias por operación (hash/verify), tareas en curso y rechazos
+    por saturación del pool de bcrypt.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return password_hash_pool.stats()
+
+
+@router.get(
+    "/token-revocation",
+    response_model=dict,
+    description="Estadísticas del filtro de tokens revocados",
+    tags=["Metrics"]
+)
+def get_token_revocation_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna el tamaño del filtro de Bloom y cuántas verificaciones se
+    resolvieron sin consultar la base de datos (filter_negatives).
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return revocation_list.stats()
+
+
+@router.get(
+    "/login-throttle",
+    response_model=dict,
+    description="Contadores del límite de intentos de login",
+    tags=["Metrics"]
+)
+def get_login_throttle_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna intentos permitidos, rechazos por email y por IP, y claves activas.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return login_throttle.stats()
+
+
+@router.get(
+    "/last-login-buffer",
+    response_model=dict,
+    description="Estadísticas de la escritura diferida de last_login",
+    tags=["Metrics"]
+)
+def get_last_login_buffer_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna logins pendientes de escribir, logins fusionados y flushes realizados.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return last_login_buffer.stats()
+
+
+@router.get(
+    "/replicas",
+    response_model=dict,
+    description="Estado de las réplicas de lectura",
+    tags=["Metrics"]
+)
+def get_replica_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna por réplica si está sana, cuántas lecturas atendió y cuántos
+    fallos de conexión tuvo, más las lecturas enviadas al primario.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return replica_router.stats()
+
+
+@router.get(
+    "/db-pool",
+    response_model=dict,
+    description="Estado del pool de conexiones de cada engine",
+    tags=["Metrics"]
+)
+def get_db_pool_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna por engine las conexiones en uso, el overflow, la espera de
+    checkout (avg/p95/max), la edad de las conexiones y los fallos de pre-ping.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return {
+        "adaptive": settings.db_pool_adaptive,
+        "bounds": {
+            "min_size": settings.db_pool_min_size,
+            "max_size": settings.db_pool_max_size,
+            "target_wait_ms": settings.db_pool_target_wait_ms,
+        },
+        "pools": [monitor.stats() for monitor in pool_monitors.values()],
+    }
+
+
+@router.get(
+    "/queries",
+    response_model=dict,
+    description="Consultas SQL por petición agrupadas por ruta",
+    tags=["Metrics"]
+)
+def get_query_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna por ruta el histograma de consultas por petición y de tiempo de
+    BD, ordenado por promedio de consultas (las rutas más costosas primero).
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return {"routes": route_query_stats.stats()}
+
+
+
+@router.get(
+    "/search",
+    response_model=dict,
+    description="Estado del índice de búsqueda de productos",
+    tags=["Metrics"]
+)
+def get_search_metrics(
+    current_user: Principal = Depends(get_current_admin_principal)
+):
+    """
+    Retorna el backend de búsqueda configurado y el que se está usando (memory
+    cae a fulltext/like mientras el índice carga), más el tamaño del índice en
+    memoria, búsquedas, actualizaciones incrementales y recargas, y el estado
+    de los índices de autocompletado y de búsqueda difusa (con la memoria
+    estimada por documento). Por worker.
+
+    **Solo usuarios admin pueden acceder a este endpoint**
+    """
+    return {
+        "configured_backend": configured_backend(),
+        "active_backend": search_backend(),
+        "memory_index": product_search_index.stats(),
+        "suggest_index": suggestion_index.stats(),
+        "fuzzy_index": fuzzy_index.stats(),
+    }
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ...database.database import get_db
 from ...models.product_model import Product, ProductCategory
-from ...core.dependencies import get_current_admin_or_staff_user
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -17,7 +18,7 @@ router = APIRouter()
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Elimina permanentemente un producto de la base de datos.
@@ -87,7 +88,7 @@ def delete_product(
 def soft_delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Desactiva un producto en lugar de eliminarlo permanentemente (soft delete).
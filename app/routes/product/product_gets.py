@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, select
 from typing import List, Optional
-from ...database.database import get_db
+from ...database.replicas import get_async_read_db
+from ...database.query_stats import query_budget
+from ...database.statement_timeouts import statement_timeout
+from ...database.pagination import Keyset, RankCursor, check_pagination, set_next_cursor
+from ...search.product_search import search_backend, ranked_search, like_filter, FUZZY
+from ...search.fuzzy import fuzzy_index
+from ...search.suggest import suggestion_index, MAX_SUGGESTIONS
+from ...database.product_facets import product_filters, where_filters, facet_counts_query, group_facets, parse_price_edges
+from ...database.hot_queries import hot_queries, product_detail_query, PRODUCT_DETAIL, FEATURED_PRODUCTS
 from ...models.product_model import Product, Category, Supplier
 from ...schemas import product_schemas
 from ...core.dependencies import get_current_client_user, get_current_admin_user
@@ -10,16 +18,49 @@ from ...models.user_model import User
 
 router = APIRouter()
 
+# Órdenes para paginar con cursor; la clave primaria desempata
+PRODUCT_SORT_COLUMNS = {
+    "product_id": (Product.product_id,),
+    "price": (Product.price, Product.product_id),
+    "created_at": (Product.created_at, Product.product_id),
+}
+PRODUCT_KEYSETS = {
+    (sort_by, order): Keyset(f"products:{sort_by}:{order}", *columns, descending=order == "desc")
+    for sort_by, columns in PRODUCT_SORT_COLUMNS.items()
+    for order in ("asc", "desc")
+}
+PRODUCTS_BY_ID = PRODUCT_KEYSETS[("product_id", "asc")]
+SEARCH_RANK_CURSOR = RankCursor("products:search:rank")
+FUZZY_RANK_CURSOR = RankCursor("products:search:fuzzy")
+
+
+def check_price_range(min_price: Optional[float], max_price: Optional[float]) -> None:
+    if max_price is not None and min_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_price cannot be greater than max_price"
+        )
+
+
+async def fetch_products(db: AsyncSession, query, params: Optional[dict] = None) -> List[Product]:
+    result = await db.execute(query, params)
+    return result.unique().scalars().all()
+
 @router.get(
     "/",
     response_model=List[product_schemas.ProductDetailResponse],
     description="Obtiene una lista de productos con filtros opcionales",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra={**query_budget(3), **statement_timeout(3000)}
 )
-def get_products(
-    db: Session = Depends(get_db),
+async def get_products(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0, description="Número de registros a omitir"),
     limit: int = Query(100, ge=1, le=500, description="Número máximo de registros a retornar"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor), alternativa a skip"),
+    sort_by: str = Query("product_id", pattern="^(product_id|price|created_at)$", description="Orden: product_id, price o created_at"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Dirección del orden"),
     name: Optional[str] = Query(None, description="Buscar por nombre del producto"),
     category_id: Optional[int] = Query(None, description="Filtrar por ID de categoría"),
     supplier_id: Optional[int] = Query(None, description="Filtrar por ID de proveedor"),
@@ -35,6 +76,8 @@ def get_products(
     
     - **skip**: Número de registros a omitir (para paginación)
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente; más rápido que skip en páginas profundas
+    - **sort_by** / **order**: Orden del listado (el cursor solo vale para el mismo orden)
     - **name**: Buscar productos que contengan este texto en el nombre
     - **category_id**: Filtrar por categoría específica
     - **supplier_id**: Filtrar por proveedor específico
@@ -46,84 +89,133 @@ def get_products(
     - **in_stock**: Filtrar solo productos con stock disponible
     """
     
+    check_pagination(skip, cursor)
+
     # query base for products
-    query = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    )
-    
-    # add filters
-    filters = []
-    
-    if name:
-        filters.append(Product.name.ilike(f"%{name}%"))
+    query = product_detail_query()
     
     if category_id:
         # check if category exists
-        category_exists = db.query(Category).filter(Category.category_id == category_id).first()
+        category_exists = await db.scalar(
+            select(Category.category_id).where(Category.category_id == category_id)
+        )
         if not category_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Category with ID {category_id} not found"
             )
-        filters.append(Product.categories.any(Category.category_id == category_id))
     
     if supplier_id:
         # check if supplier exists
-        supplier_exists = db.query(Supplier).filter(Supplier.supplier_id == supplier_id).first()
+        supplier_exists = await db.scalar(
+            select(Supplier.supplier_id).where(Supplier.supplier_id == supplier_id)
+        )
         if not supplier_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Supplier with ID {supplier_id} not found"
             )
-        filters.append(Product.supplier_id == supplier_id)
     
-    if is_active is not None:
-        filters.append(Product.is_active == is_active)
+    check_price_range(min_price, max_price)
     
-    if is_featured is not None:
-        filters.append(Product.is_featured == is_featured)
+    # add filters (los mismos que usa /products/facets)
+    query = where_filters(query, product_filters(
+        name=name, category_id=category_id, supplier_id=supplier_id, is_active=is_active,
+        is_featured=is_featured, product_type=product_type, min_price=min_price,
+        max_price=max_price, in_stock=in_stock,
+    ))
     
-    if product_type:
-        filters.append(Product.product_type == product_type)
+    # add pagination: limit + 1 para saber si hay otra página
+    keyset = PRODUCT_KEYSETS[(sort_by, order)]
+    products = await fetch_products(db, keyset.apply(query, cursor).offset(skip).limit(limit + 1))
+    products, next_cursor = keyset.page(products, limit)
+    set_next_cursor(response, next_cursor)
     
-    if min_price is not None:
-        filters.append(Product.price >= min_price)
+    return products
+
+
+# Debe declararse antes de /{product_id}
+@router.get(
+    "/suggest",
+    response_model=List[product_schemas.ProductSuggestion],
+    description="Sugerencias de autocompletado por prefijo",
+    tags=["Products"],
+    openapi_extra=query_budget(0)
+)
+async def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS)
+):
+    """
+    Sugerencias de productos (nombre o SKU) y categorías cuyo texto empieza
+    con el prefijo, ordenadas por popularidad. Se responde desde el índice en
+    memoria, sin consultar la base de datos (lista vacía mientras carga).
     
-    if max_price is not None:
-        filters.append(Product.price <= max_price)
-        
-    if max_price is not None and min_price is not None and min_price > max_price:
+    - **q**: Texto escrito hasta ahora
+    - **limit**: Número máximo de sugerencias
+    """
+    return suggestion_index.suggest(q, limit)
+
+
+# Debe declararse antes de /{product_id}
+@router.get(
+    "/facets",
+    response_model=product_schemas.ProductFacetsResponse,
+    description="Conteos por categoría, proveedor, tipo, rango de precio y atributo",
+    tags=["Products"],
+    openapi_extra={**query_budget(1), **statement_timeout(3000)}
+)
+async def get_product_facets(
+    db: AsyncSession = Depends(get_async_read_db),
+    name: Optional[str] = Query(None, description="Buscar por nombre del producto"),
+    category_id: Optional[int] = Query(None, description="Filtrar por ID de categoría"),
+    supplier_id: Optional[int] = Query(None, description="Filtrar por ID de proveedor"),
+    is_active: Optional[bool] = Query(True, description="Filtrar por productos activos/inactivos"),
+    is_featured: Optional[bool] = Query(None, description="Filtrar por productos destacados"),
+    product_type: Optional[str] = Query(None, description="Filtrar por tipo de producto"),
+    min_price: Optional[float] = Query(None, ge=0, description="Precio mínimo"),
+    max_price: Optional[float] = Query(None, ge=0, description="Precio máximo"),
+    in_stock: Optional[bool] = Query(None, description="Filtrar productos con stock disponible"),
+    price_edges: Optional[str] = Query(None, description="Límites de los rangos de precio, ej: 25,50,100")
+):
+    """
+    Retorna, para los mismos filtros de GET /products/, el total y los conteos
+    por categoría, proveedor, product_type, rango de precio y atributo
+    buscable, en una sola consulta. Cada faceta ignora su propio filtro (al
+    elegir una categoría se siguen viendo los conteos de las demás).
+    
+    - **is_active**: Por defecto solo productos activos
+    - **price_edges**: Límites de los rangos de precio (default: 25,50,100,250,500)
+    """
+    check_price_range(min_price, max_price)
+    try:
+        edges = parse_price_edges(price_edges)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="min_price cannot be greater than max_price"
+            detail=str(e)
         )
     
-    if in_stock is not None:
-        if in_stock:
-            filters.append(Product.online_stock > 0)
-        else:
-            filters.append(Product.online_stock == 0)
-    
-    # add active filter by default
-    if filters:
-        query = query.filter(and_(*filters))
-    
-    # add pagination 
-    products = query.offset(skip).limit(limit).all()
+    filters = product_filters(
+        name=name, category_id=category_id, supplier_id=supplier_id, is_active=is_active,
+        is_featured=is_featured, product_type=product_type, min_price=min_price,
+        max_price=max_price, in_stock=in_stock,
+    )
+    result = await db.execute(facet_counts_query(filters, edges))
     
-    return products
+    return group_facets(result.all(), edges)
+
 
-        
 @router.get(
     "/{product_id}",
     response_model=product_schemas.ProductDetailResponse,
     description="Obtiene un producto específico por su ID",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra=query_budget(1)
 )
-def get_product_by_id(
+async def get_product_by_id(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Obtiene un producto específico por su ID con toda la información relacionada.
@@ -131,10 +223,8 @@ def get_product_by_id(
     - **product_id**: ID del producto a obtener
     """
     
-    product = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    ).filter(Product.product_id == product_id).first()
+    products = await fetch_products(db, hot_queries[PRODUCT_DETAIL], {"product_id": product_id})
+    product = products[0] if products else None
     
     if not product:
         raise HTTPException(
@@ -149,21 +239,30 @@ def get_product_by_id(
     "/search/{search_term}",
     response_model=List[product_schemas.ProductDetailResponse],
     description="Busca productos por término de búsqueda",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra={**query_budget(1), **statement_timeout(2000)}
 )
-def search_products(
+async def search_products(
     search_term: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo (por nombre, ordenado por similitud)")
 ):
     """
-    Busca productos por término de búsqueda en nombre y descripción.
+    Busca productos por término de búsqueda en nombre, descripción y SKU,
+    ordenados por relevancia (SEARCH_BACKEND fulltext o memory).
     
     - **search_term**: Término a buscar en nombre y descripción
     - **skip**: Número de registros a omitir
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente, alternativa a skip
+    - **fuzzy**: Búsqueda por similitud de trigramas sobre el nombre (mientras
+      el índice carga se usa la búsqueda normal)
     """
+    check_pagination(skip, cursor)
     
     if len(search_term.strip()) < 2:
         raise HTTPException(
@@ -171,20 +270,22 @@ def search_products(
             detail="Search term must be at least 2 characters long"
         )
     
+    backend = FUZZY if fuzzy and fuzzy_index.ready else search_backend()
+    if backend != "like":
+        # fulltext / memory / fuzzy: ordenados por relevancia
+        rank_cursor = FUZZY_RANK_CURSOR if backend == FUZZY else SEARCH_RANK_CURSOR
+        offset = rank_cursor.decode(cursor) if cursor else skip
+        products, has_more = await ranked_search(db, backend, search_term, offset, limit)
+        set_next_cursor(response, rank_cursor.encode(offset + limit) if has_more else None)
+        return products
+
     # search name and description
-    products = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    ).filter(
-        and_(
-            Product.is_active == True,
-            or_(
-                Product.name.ilike(f"%{search_term}%"),
-                Product.description.ilike(f"%{search_term}%"),
-                Product.sku.ilike(f"%{search_term}%")
-            )
-        )
-    ).offset(skip).limit(limit).all()
+    query = product_detail_query().where(
+        and_(Product.is_active == True, like_filter(search_term))
+    )
+    products = await fetch_products(db, PRODUCTS_BY_ID.apply(query, cursor).offset(skip).limit(limit + 1))
+    products, next_cursor = PRODUCTS_BY_ID.page(products, limit)
+    set_next_cursor(response, next_cursor)
     
     return products
 
@@ -193,10 +294,11 @@ def search_products(
     "/featured/",
     response_model=List[product_schemas.ProductDetailResponse],
     description="Obtiene productos destacados",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra=query_budget(1)
 )
-def get_featured_products(
-    db: Session = Depends(get_db),
+async def get_featured_products(
+    db: AsyncSession = Depends(get_async_read_db),
     limit: int = Query(20, ge=1, le=100, description="Número máximo de productos destacados")
 ):
     """
@@ -205,15 +307,7 @@ def get_featured_products(
     - **limit**: Número máximo de productos a retornar
     """
     
-    products = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    ).filter(
-        and_(
-            Product.is_featured == True,
-            Product.is_active == True
-        )
-    ).limit(limit).all()
+    products = await fetch_products(db, hot_queries[FEATURED_PRODUCTS], {"limit": limit})
     
     return products
 
@@ -222,13 +316,16 @@ def get_featured_products(
     "/by-category/{category_id}",
     response_model=List[product_schemas.ProductDetailResponse],
     description="Obtiene productos de una categoría específica",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra=query_budget(2)
 )
-def get_products_by_category(
+async def get_products_by_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (header X-Next-Cursor)")
 ):
     """
     Obtiene productos de una categoría específica.
@@ -236,25 +333,29 @@ def get_products_by_category(
     - **category_id**: ID de la categoría
     - **skip**: Número de registros a omitir
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente, alternativa a skip
     """
+    check_pagination(skip, cursor)
     
     # cheack if category exists
-    category = db.query(Category).filter(Category.category_id == category_id).first()
+    category = await db.scalar(
+        select(Category.category_id).where(Category.category_id == category_id)
+    )
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Category with ID {category_id} not found"
         )
     
-    products = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    ).filter(
+    query = product_detail_query().where(
         and_(
             Product.categories.any(Category.category_id == category_id),
             Product.is_active == True
         )
-    ).offset(skip).limit(limit).all()
+    )
+    products = await fetch_products(db, PRODUCTS_BY_ID.apply(query, cursor).offset(skip).limit(limit + 1))
+    products, next_cursor = PRODUCTS_BY_ID.page(products, limit)
+    set_next_cursor(response, next_cursor)
     
     return products
 
@@ -263,11 +364,12 @@ def get_products_by_category(
     "/by-supplier/{supplier_id}",
     response_model=List[product_schemas.ProductDetailResponse],
     description="Obtiene productos de un proveedor específico",
-    tags=["Products"]
+    tags=["Products"],
+    openapi_extra=query_budget(2)
 )
-def get_products_by_supplier(
+async def get_products_by_supplier(
     supplier_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200)
 ):
@@ -280,16 +382,17 @@ def get_products_by_supplier(
     """
     
     # Verificar que el proveedor existe
-    supplier = db.query(Supplier).filter(Supplier.supplier_id == supplier_id).first()
+    supplier = await db.scalar(
+        select(Supplier.supplier_id).where(Supplier.supplier_id == supplier_id)
+    )
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Supplier with ID {supplier_id} not found"
         )
     
-    products = db.query(Product).options(
-        joinedload(Product.supplier),
-        joinedload(Product.categories)
-    ).filter(Product.supplier_id == supplier_id).offset(skip).limit(limit).all()
+    products = await fetch_products(
+        db, product_detail_query().where(Product.supplier_id == supplier_id).offset(skip).limit(limit)
+    )
     
     return products    
\ No newline at end of file
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ...database.database import get_db
+from ...database.hot_queries import load_product_detail
 from ...models.product_model import Product, Category, ProductCategory, Supplier
 from ...schemas import product_schemas
-from ...core.dependencies import get_current_admin_or_staff_user
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -19,7 +21,7 @@ def patch_product(
     product_id: int,
     product_update: product_schemas.ProductUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Actualiza parcialmente un producto existente.
@@ -42,7 +44,7 @@ def patch_product(
 def toggle_product_status(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Alterna el estado activo/inactivo de un producto.
@@ -66,10 +68,7 @@ def toggle_product_status(
         db.refresh(db_product)
         
         # Cargar las relaciones para la respuesta
-        product_with_relations = db.query(Product).options(
-            joinedload(Product.supplier),
-            joinedload(Product.categories)
-        ).filter(Product.product_id == product_id).first()
+        product_with_relations = load_product_detail(db, product_id)
         
         status_text = "activated" if db_product.is_active else "deactivated"
         print(f"Product {product_id} {status_text} (was {old_status}) by {current_user.user_type} {current_user.email}")
@@ -94,7 +93,7 @@ def update_product_stock(
     product_id: int,
     new_stock: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Actualiza únicamente el stock de un producto.
@@ -124,10 +123,7 @@ def update_product_stock(
         db.refresh(db_product)
         
         # Cargar las relaciones para la respuesta
-        product_with_relations = db.query(Product).options(
-            joinedload(Product.supplier),
-            joinedload(Product.categories)
-        ).filter(Product.product_id == product_id).first()
+        product_with_relations = load_product_detail(db, product_id)
         
         print(f"Product {product_id} stock updated from {old_stock} to {new_stock} by {current_user.user_type} {current_user.email}")
         
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Security
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Any
 from ...database.database import get_db
+from ...database.hot_queries import load_product_detail
+from ...database.bulk_products import bulk_upsert_products, insert_category_links, missing_references, CREATED, UPDATED, FAILED
 from ...models.product_model import Product, Category
 from ...schemas import product_schemas
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from ...core.dependencies import get_current_admin_or_staff_user
-from ...models.product_model import ProductCategory 
+from ...core.permissions import require, MANAGE_INVENTORY
+from ...core.security import Principal
 from ...models.user_model import User
 
 router = APIRouter()
@@ -21,7 +23,7 @@ router = APIRouter()
 def create_product(
     product: product_schemas.ProductCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user),
+    current_user: Principal = Depends(require(MANAGE_INVENTORY)),
 ): 
     """
     Crea un nuevo producto.
@@ -44,28 +46,20 @@ def create_product(
             detail=f"Product with this SKU '{product.sku}' already exists"
         ) 
         
-    if product.supplier_id:
-        supplier = db.query(Supplier).filter(Supplier.supplier_id == product.supplier_id).first()
-        if not supplier:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Supplier with ID {product.supplier_id} not found"
-            )
-    
-    # Verificar que las categorías existen
-    if product.category_ids:
-        existing_categories = db.query(Category).filter(
-            Category.category_id.in_(product.category_ids)
-        ).all()
-        
-        existing_category_ids = {cat.category_id for cat in existing_categories}
-        missing_category_ids = set(product.category_ids) - existing_category_ids
-        
-        if missing_category_ids:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Categories with IDs {list(missing_category_ids)} not found"
-            )
+    # Proveedor y categorías en una consulta por tabla
+    missing_suppliers, missing_categories = missing_references(
+        db, [product.supplier_id] if product.supplier_id else [], product.category_ids
+    )
+    if missing_suppliers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Supplier with ID {product.supplier_id} not found"
+        )
+    if missing_categories:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Categories with IDs {sorted(missing_categories)} not found"
+        )
             
     try:
         db_product = Product(
@@ -86,21 +80,15 @@ def create_product(
         db.add(db_product)
         db.flush()
         
-        if product.category_ids:
-            for category_id in product.category_ids:
-                product_category = ProductCategory(
-                    product_id=db_product.product_id,
-                    category_id=category_id
-                )
-                db.add(product_category)
+        insert_category_links(db, [
+            {"product_id": db_product.product_id, "category_id": category_id}
+            for category_id in dict.fromkeys(product.category_ids)
+        ])
         db.commit()
         db.refresh(db_product)
         
         # Cargar las relaciones para la respuesta
-        product_with_relations = db.query(Product).options(
-            joinedload(Product.supplier),
-            joinedload(Product.categories)
-        ).filter(Product.product_id == db_product.product_id).first()
+        product_with_relations = load_product_detail(db, db_product.product_id)
         
         print(f"Product created by admin {current_user.email}: {db_product.name}")
         
@@ -122,6 +110,46 @@ def create_product(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=product_schemas.ProductBulkUpsertResponse,
+    description="Crea o actualiza productos en lote por SKU",
+    tags=["Products"]
+)
+def bulk_upsert(
+    payload: product_schemas.ProductBulkUpsert,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require(MANAGE_INVENTORY)),
+):
+    """
+    Crea o actualiza hasta 5000 productos por SKU con INSERT ... ON DUPLICATE KEY UPDATE.
+
+    Solo usuarios con rol ADMIN o STORE_STAFF pueden cargar productos.
+
+    - **products**: Productos completos (los campos omitidos toman su valor por defecto)
+    - Las categorías de un producto existente solo se reemplazan si se envía **category_ids**
+
+    Returns:
+        Totales y un resultado por fila (created, updated o failed con el motivo)
+    """
+    try:
+        results = bulk_upsert_products(db, payload.products)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error in bulk upsert: {str(e.orig)}"
+        )
+
+    counts = {outcome: sum(1 for result in results if result["status"] == outcome) for outcome in (CREATED, UPDATED, FAILED)}
+    print(
+        f"Bulk upsert by {current_user.email}: {counts[CREATED]} created, "
+        f"{counts[UPDATED]} updated, {counts[FAILED]} failed"
+    )
+    return {**counts, "results": results}
+
+
 @router.post(
     "/{product_id}/restore",
     response_model=dict,
@@ -131,7 +159,7 @@ def create_product(
 def restore_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_or_staff_user)
+    current_user: Principal = Depends(require(MANAGE_INVENTORY))
 ):
     """
     Reactiva un producto que fue desactivado anteriormente.
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ...database.database import get_db
+from ...database.pagination import Keyset
 from ...models.user_model import User
 from ...schemas.user_schemas import PaginatedUserResponse
-from ...core.dependencies import get_current_admin_user
+from ...core.permissions import require, MANAGE_USERS
+from ...core.security import Principal
 
 router = APIRouter()
 
+USERS_BY_ID = Keyset("users:user_id:asc", User.user_id)
+
 
 @router.get(
     "/",
@@ -19,8 +23,9 @@ router = APIRouter()
 async def get_users(
     page: int = Query(1, ge=1, description="Page number for pagination"),
     items_per_page: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor, alternative to page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: Principal = Depends(require(MANAGE_USERS))
 ):
     """
     Obtiene una lista paginada de usuarios.
@@ -31,6 +36,7 @@ async def get_users(
     **Parámetros opcionales:**
     - **page**: Número de página (default: 1)
     - **items_per_page**: Elementos por página (default: 10)
+    - **cursor**: `next_cursor` de la respuesta anterior; evita el offset en páginas profundas (ignora page)
 
     **Pasos para usar en FastAPI Docs:**
     1. Haz login en /auth/login para obtener el access_token
@@ -43,13 +49,15 @@ async def get_users(
     """
 
     # Lógica de paginación
-    skip = (page - 1) * items_per_page
+    skip = 0 if cursor else (page - 1) * items_per_page
 
     # Obtener total de usuarios
     total = db.query(User).count()
 
-    # Obtener usuarios paginados
-    users = db.query(User).offset(skip).limit(items_per_page).all()
+    # Obtener usuarios paginados (uno extra para saber si hay otra página)
+    query = USERS_BY_ID.apply(db.query(User), cursor)
+    users = query.offset(skip).limit(items_per_page + 1).all()
+    users, next_cursor = USERS_BY_ID.page(users, items_per_page)
 
     return {
         "items": users,
@@ -57,6 +65,7 @@ async def get_users(
         "page": page,
         "items_per_page": items_per_page,
         "total_pages": (total + items_per_page - 1) // items_per_page,
+        "next_cursor": next_cursor,
         "current_user": {
             "username": current_user.username,
             "user_type": current_user.user_type
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from ...database.database import get_db
 from ...models.user_model import User, UserProfile
 from ...schemas.user_schemas import UserProfileResponse
-from ...core.security import get_current_active_user
+from ...core.security import Principal, get_current_active_principal
 
 router = APIRouter()
 
@@ -14,7 +14,7 @@ router = APIRouter()
 )
 def get_user_profile(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Obtiene el perfil del usuario actual.
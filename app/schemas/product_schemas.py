@@ -103,6 +103,57 @@ class ProductDetailResponse(ProductResponse):
     class Config:
         from_attributes = True
 
+# Bulk upsert (por SKU)
+class ProductBulkUpsert(BaseModel):
+    products: List[ProductCreate] = Field(..., min_length=1, max_length=5000)
+
+class ProductBulkResult(BaseModel):
+    sku: Optional[str] = None
+    status: str  # created | updated | failed
+    product_id: Optional[int] = None
+    error: Optional[str] = None
+
+class ProductBulkUpsertResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[ProductBulkResult]
+
+# Autocompletado (type-ahead)
+class ProductSuggestion(BaseModel):
+    type: str  # product | category
+    id: int
+    label: str
+    sku: Optional[str] = None
+
+# Facetas (conteos para filtros)
+class FacetCount(BaseModel):
+    id: int
+    label: str
+    count: int
+
+class FacetValueCount(BaseModel):
+    value: str
+    count: int
+
+class PriceRangeCount(BaseModel):
+    min: float
+    max: Optional[float] = None  # None: sin límite superior
+    count: int
+
+class AttributeFacet(BaseModel):
+    attribute_type_id: int
+    name: str
+    values: List[FacetValueCount]
+
+class ProductFacetsResponse(BaseModel):
+    total: int
+    categories: List[FacetCount]
+    suppliers: List[FacetCount]
+    product_types: List[FacetValueCount]
+    price_ranges: List[PriceRangeCount]
+    attributes: List[AttributeFacet]
+
 # Product Review Schemas
 class ReviewStatusEnum(str, Enum):
     PENDING = "pending"
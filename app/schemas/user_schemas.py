@@ -52,6 +52,15 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     user: UserResponse
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token emitido en el login")
+
+class RefreshTokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
 
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -78,6 +87,7 @@ class AdminTokenResponse(BaseModel):
     token_type: str
     user: AdminUserInfo
     permissions: List[str]
+    refresh_token: Optional[str] = None
 
 # Schema para verificar tokens admin
 class TokenVerification(BaseModel):
@@ -143,4 +153,5 @@ class PaginatedUserResponse(BaseModel):
     items: List[UserResponse]
     total: int
     page: int
-    items_per_page: int
\ No newline at end of file
+    items_per_page: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,91 @@
+# scripts/hot_query_benchmark.py
+"""
+Microbenchmark de las consultas calientes del catálogo.
+
+Uso: python -m app.scripts.hot_query_benchmark [--iterations 5000] [--products 50]
+
+Ejecuta cada consulta del registro (app/database/hot_queries.py) contra una
+base SQLite en memoria y la compara con armar el mismo select() en cada
+llamada, como hacían las rutas. La diferencia es el costo por petición de
+construir la sentencia y sus opciones de carga.
+"""
+import argparse
+import time
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.database.hot_queries import hot_queries, product_detail_query, PRODUCT_DETAIL, FEATURED_PRODUCTS
+import app.models  # noqa: F401
+from app.models.product_model import Category, Product, Supplier
+
+
+def seed(session: Session, products: int) -> None:
+    supplier = Supplier(name="Proveedor")
+    categories = [Category(name=f"Categoría {index}") for index in range(3)]
+    session.add_all([supplier, *categories])
+    for index in range(products):
+        session.add(Product(
+            name=f"Producto {index}",
+            price=Decimal("10.00"),
+            sku=f"SKU-{index}",
+            supplier=supplier,
+            is_featured=index % 2 == 0,
+            categories=categories[:index % 3 + 1],
+        ))
+    session.commit()
+
+
+def measure(run, iterations: int) -> float:
+    """Microsegundos por llamada"""
+    for _ in range(min(200, iterations)):
+        run()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_benchmark(iterations: int, products: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    seed(session, products)
+
+    cases = {
+        PRODUCT_DETAIL: (
+            lambda: session.execute(
+                product_detail_query().where(Product.product_id == 1)
+            ).unique().scalars().first(),
+            lambda: session.execute(
+                hot_queries[PRODUCT_DETAIL], {"product_id": 1}
+            ).unique().scalars().first(),
+        ),
+        FEATURED_PRODUCTS: (
+            lambda: session.execute(
+                product_detail_query().where(
+                    Product.is_featured == True, Product.is_active == True
+                ).limit(20)
+            ).unique().scalars().all(),
+            lambda: session.execute(
+                hot_queries[FEATURED_PRODUCTS], {"limit": 20}
+            ).unique().scalars().all(),
+        ),
+    }
+
+    print(f"Hot query benchmark: {iterations} iteraciones, {products} productos (SQLite en memoria)")
+    print(f"{'consulta':<20}{'select() por llamada':>22}{'registro':>12}{'ahorro':>12}")
+    for name, (built, registered) in cases.items():
+        built_us = measure(built, iterations)
+        registered_us = measure(registered, iterations)
+        print(f"{name:<20}{built_us:>19.1f} us{registered_us:>9.1f} us{built_us - registered_us:>9.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara consultas del registro con select() por llamada")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=50)
+    args = parser.parse_args()
+    run_benchmark(args.iterations, args.products)
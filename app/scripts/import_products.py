@@ -0,0 +1,72 @@
+# scripts/import_products.py
+"""
+Carga masiva de productos desde un archivo JSON o CSV (upsert por SKU).
+
+Uso: python -m app.scripts.import_products productos.csv [--batch-size 500] [--dry-run]
+
+JSON: lista de objetos con los campos de ProductCreate.
+CSV: una columna por campo; category_ids separados por "|" y attributes como JSON.
+Cada lote se confirma por separado, así un error no descarta lo ya cargado.
+"""
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+
+from app.database.database import SessionLocal
+from app.database.bulk_products import bulk_upsert_products, CREATED, UPDATED, FAILED
+import app.models  # noqa: F401
+
+
+def read_rows(path: Path):
+    if path.suffix.lower() == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    rows = []
+    with path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            # Celdas vacías: se usa el valor por defecto del schema
+            row = {key: value for key, value in row.items() if value not in (None, "")}
+            if "category_ids" in row:
+                row["category_ids"] = [int(value) for value in row["category_ids"].split("|") if value]
+            if "attributes" in row:
+                row["attributes"] = json.loads(row["attributes"])
+            rows.append(row)
+    return rows
+
+
+def import_products(path: Path, batch_size: int, dry_run: bool = False):
+    rows = read_rows(path)
+    counts = {CREATED: 0, UPDATED: 0, FAILED: 0}
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        for start in range(0, len(rows), batch_size):
+            results = bulk_upsert_products(db, rows[start:start + batch_size], batch_size=batch_size)
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+            for offset, result in enumerate(results):
+                counts[result["status"]] += 1
+                if result["status"] == FAILED:
+                    print(f"❌ Fila {start + offset + 1} ({result['sku']}): {result['error']}")
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'(dry run) ' if dry_run else ''}✅ {len(rows)} filas en {elapsed:.2f} s: "
+        f"{counts[CREATED]} creadas, {counts[UPDATED]} actualizadas, {counts[FAILED]} con error"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga masiva de productos por SKU")
+    parser.add_argument("path", type=Path, help="Archivo .json o .csv")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Valida y ejecuta sin confirmar los cambios")
+    args = parser.parse_args()
+    import_products(args.path, args.batch_size, args.dry_run)
@@ -0,0 +1,65 @@
+# scripts/import_profile.py
+"""
+Reporte del tiempo de import de un worker (python -X importtime).
+
+Uso: python -m app.scripts.import_profile [--module main] [--top 25] [--depth 1]
+
+Importa el módulo en un proceso nuevo y muestra el total, los módulos más
+costosos (tiempo acumulado) y el costo agrupado por paquete de primer nivel,
+para seguir el tiempo de arranque de los workers entre versiones.
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def run_importtime(module: str) -> list:
+    """[(módulo, self_us, cumulative_us, nivel)] en el orden que reporta Python"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de tiempo de import")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--depth", type=int, default=1,
+                        help="Profundidad máxima de los módulos listados en el top")
+    args = parser.parse_args()
+
+    rows = run_importtime(args.module)
+    total = next((cumulative for name, _, cumulative, _ in rows if name == args.module), 0)
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: {total / 1000:.1f} ms ({len(rows)} modules)\n")
+
+    print(f"Top {args.top} (cumulative, depth <= {args.depth})")
+    top = sorted((row for row in rows if row[3] <= args.depth), key=lambda row: row[2], reverse=True)
+    for name, self_us, cumulative, level in top[:args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {self_us / 1000:8.1f} ms self  {name}")
+
+    print("\nPer package (self time)")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
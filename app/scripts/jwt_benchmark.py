@@ -0,0 +1,94 @@
+# scripts/jwt_benchmark.py
+"""
+Microbenchmark de encode/decode JWT por backend.
+
+Uso: python -m app.scripts.jwt_benchmark [--iterations 20000] [--algorithm HS256]
+
+Usa el mismo conjunto de claims que un token admin (token_claims + exp, iat,
+jti y token_type) y compara cada backend con claves precomputadas contra la
+llamada directa a la librería con la clave en texto.
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.jwt_backends import BACKENDS, DEFAULT_KID, KeySet
+from app.core.jwt_handler import token_claims
+from app.models.user_model import User
+
+
+def sample_claims() -> dict:
+    # Usuario transitorio (sin sesión): los claims incluyen role y perms
+    admin = User(
+        user_id=1, email="admin@cryptocommerce.com", username="admin", user_type="admin", is_active=True
+    )
+    now = datetime.now(timezone.utc)
+    return {
+        **token_claims(admin, is_admin=True),
+        "exp": now + timedelta(minutes=60),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+        "token_type": "admin",
+    }
+
+
+def raw_library_calls(name: str, secret: str, algorithm: str):
+    """encode/decode como se hacía antes: la clave se parsea en cada llamada"""
+    if name == "jose":
+        from jose import jwt
+        return (
+            lambda claims: jwt.encode(claims, secret, algorithm=algorithm),
+            lambda token: jwt.decode(token, secret, algorithms=[algorithm]),
+        )
+    import jwt
+    return (
+        lambda claims: jwt.encode(claims, secret, algorithm=algorithm),
+        lambda token: jwt.decode(token, secret, algorithms=[algorithm]),
+    )
+
+
+def measure(encode, decode, iterations: int) -> tuple:
+    claims = sample_claims()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        token = encode(claims)
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode(token)
+    decode_seconds = time.perf_counter() - started
+
+    return iterations / encode_seconds, iterations / decode_seconds
+
+
+def run_benchmark(iterations: int, algorithm: str, secret: str):
+    key_set = KeySet({DEFAULT_KID: secret}, DEFAULT_KID)
+
+    print(f"JWT benchmark: {iterations} iteraciones, {algorithm}")
+    print(f"{'backend':<22}{'encode/s':>12}{'decode/s':>12}")
+    for name, backend_class in BACKENDS.items():
+        try:
+            backend = backend_class(key_set, algorithm)
+        except ImportError:
+            print(f"{name:<22}{'(no instalado)':>24}")
+            continue
+
+        rows = [
+            (f"{name} (texto)", *raw_library_calls(name, secret, algorithm)),
+            (f"{name} (precomputado)", backend.encode, backend.decode),
+        ]
+        for label, encode, decode in rows:
+            encode_rate, decode_rate = measure(encode, decode, iterations)
+            print(f"{label:<22}{encode_rate:>12,.0f}{decode_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara backends JWT")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--secret", default="benchmark-secret-key-with-32-bytes!")
+    args = parser.parse_args()
+    run_benchmark(args.iterations, args.algorithm, args.secret)
@@ -1,30 +1,71 @@
 # scripts/migrations.py
+"""
+Migraciones versionadas del esquema (Alembic, scripts en migrations/versions).
+
+Uso:
+    python -m app.scripts.migrations upgrade [revision]
+    python -m app.scripts.migrations downgrade <revision>
+    python -m app.scripts.migrations stamp <revision>
+    python -m app.scripts.migrations current
+    python -m app.scripts.migrations history
+    python -m app.scripts.migrations revision -m "mensaje" [--autogenerate]
+"""
+import argparse
+
 from alembic import command
-from alembic.config import Config
-from pathlib import Path
-import os
-
-def run_migrations():
-    """Ejecuta las migraciones de la base de datos"""
-    # Crear directorio de migraciones si no existe
-    migrations_dir = Path("migrations")
-    if not migrations_dir.exists():
-        migrations_dir.mkdir()
-    
-    # Configurar alembic
-    alembic_cfg = Config("alembic.ini")
-    alembic_cfg.set_main_option("script_location", "migrations")
-    alembic_cfg.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
-    
+
+from app.database.schema import alembic_config
+
+
+def run_migrations(revision: str = "head"):
+    """Aplica las migraciones pendientes hasta revision"""
     try:
-        # Generar migración
-        command.revision(alembic_cfg, autogenerate=True, message="Initial migration")
-        # Ejecutar migración
-        command.upgrade(alembic_cfg, "head")
+        command.upgrade(alembic_config(), revision)
         print("✅ Migraciones ejecutadas correctamente")
     except Exception as e:
         print(f"❌ Error ejecutando migraciones: {str(e)}")
         raise
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones de la base de datos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = subparsers.add_parser("upgrade", help="Aplica migraciones")
+    upgrade.add_argument("revision", nargs="?", default="head")
+
+    downgrade = subparsers.add_parser("downgrade", help="Revierte migraciones")
+    downgrade.add_argument("revision")
+
+    stamp = subparsers.add_parser(
+        "stamp", help="Registra una revisión sin ejecutarla (base creada con data.sql: 0001)"
+    )
+    stamp.add_argument("revision")
+
+    subparsers.add_parser("current", help="Revisión aplicada en la base de datos")
+    subparsers.add_parser("history", help="Lista de revisiones")
+
+    revision = subparsers.add_parser("revision", help="Crea un script de migración nuevo")
+    revision.add_argument("-m", "--message", required=True)
+    revision.add_argument("--autogenerate", action="store_true",
+                          help="Compara los modelos con la base de datos")
+
+    args = parser.parse_args()
+    config = alembic_config()
+
+    if args.command == "upgrade":
+        run_migrations(args.revision)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+
+
 if __name__ == "__main__":
-    run_migrations()
\ No newline at end of file
+    main()
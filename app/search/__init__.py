@@ -0,0 +1,10 @@
+# app/search/__init__.py
+"""
+Búsqueda de productos.
+
+- text.py: normalización y tokens (minúsculas, sin acentos)
+- bm25.py: índice invertido en memoria con ranking BM25
+- product_index.py: índice de productos por worker, actualizado al confirmar
+  cambios y sincronizado periódicamente con la tabla products
+- product_search.py: backends (FULLTEXT de MySQL, índice en memoria, LIKE)
+"""
@@ -0,0 +1,90 @@
+# app/search/bm25.py
+"""
+Índice invertido con ranking BM25.
+
+Cada documento es un dict término -> frecuencia (ponderada por campo). Las
+listas de postings se actualizan por documento, así agregar, reemplazar o
+quitar un producto cuesta lo proporcional a sus términos y no a todo el
+índice. No es thread-safe: ProductSearchIndex lo protege con un lock.
+"""
+import heapq
+import math
+from typing import Dict, Iterable, List, Tuple
+
+# Parámetros estándar de BM25: saturación de tf y normalización por largo
+K1 = 1.2
+B = 0.75
+
+
+class InvertedIndex:
+    """Postings término -> {doc_id: frecuencia} y largo de cada documento"""
+
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._documents: Dict[int, Dict[str, float]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._documents
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def terms(self) -> Iterable[str]:
+        return self._postings.keys()
+
+    def add(self, doc_id: int, terms: Dict[str, float]) -> None:
+        """Agrega o reemplaza un documento"""
+        self.remove(doc_id)
+        if not terms:
+            return
+        self._documents[doc_id] = terms
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id: int) -> None:
+        terms = self._documents.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def idf(self, term: str) -> float:
+        frequency = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._documents) - frequency + 0.5) / (frequency + 0.5))
+
+    def scores(self, terms: Iterable[str]) -> Dict[int, float]:
+        """Puntaje BM25 de cada documento que contiene al menos un término"""
+        if not self._documents:
+            return {}
+        average_length = self._total_length / len(self._documents)
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, terms: Iterable[str], limit: int) -> List[Tuple[int, float]]:
+        """Los limit mejores (doc_id, puntaje); a igual puntaje, menor doc_id primero"""
+        scores = self.scores(terms)
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return best
@@ -0,0 +1,88 @@
+# app/search/changes.py
+"""
+Cambios confirmados del catálogo para los índices en memoria.
+
+Los eventos de Session registran en cada flush los productos y categorías
+creados, modificados o eliminados, y al hacer commit los entregan a cada
+índice registrado que esté cargado (se descartan con rollback). Las
+escrituras con Core (carga masiva) los registran con queue_change().
+
+Los cambios llegan como {(tipo, id): documento}; documento None indica que
+la entidad ya no está activa o fue eliminada.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..models.product_model import Category, Product
+
+PRODUCT = "product"
+CATEGORY = "category"
+
+PENDING_KEY = "catalog_index_changes"
+
+Changes = Dict[Tuple[str, int], Optional[dict]]
+
+_indexes: List = []
+
+
+def register_index(index) -> None:
+    """index: objeto con ready y apply(changes)"""
+    _indexes.append(index)
+
+
+def tracking() -> bool:
+    return any(index.ready for index in _indexes)
+
+
+def product_document(product) -> Optional[dict]:
+    if not product.is_active:
+        return None
+    return {
+        "name": product.name, "description": product.description,
+        "sku": product.sku, "is_featured": product.is_featured,
+    }
+
+
+def category_document(category) -> Optional[dict]:
+    if not category.is_active:
+        return None
+    return {"name": category.name}
+
+
+def queue_change(session: Session, kind: str, entity_id: int, document: Optional[dict]) -> None:
+    """Registra un cambio; se aplica a los índices al confirmar la sesión"""
+    if tracking():
+        session.info.setdefault(PENDING_KEY, {})[(kind, entity_id)] = document
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    if not tracking():
+        return
+    for instance in session.new | session.dirty:
+        if isinstance(instance, Product) and instance.product_id is not None:
+            queue_change(session, PRODUCT, instance.product_id, product_document(instance))
+        elif isinstance(instance, Category) and instance.category_id is not None:
+            queue_change(session, CATEGORY, instance.category_id, category_document(instance))
+    for instance in session.deleted:
+        if isinstance(instance, Product):
+            queue_change(session, PRODUCT, instance.product_id, None)
+        elif isinstance(instance, Category):
+            queue_change(session, CATEGORY, instance.category_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    changes = session.info.pop(PENDING_KEY, None)
+    if not changes:
+        return
+    for index in _indexes:
+        if index.ready:
+            index.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,133 @@
+# app/search/fuzzy.py
+"""
+Búsqueda difusa (fuzzy=true) por nombre de productos y categorías activos,
+con un índice de trigramas por tipo, uno por worker.
+
+- load(): construye ambos índices; se repite cada
+  FUZZY_INDEX_REBUILD_INTERVAL_SECONDS para recoger los cambios de otros workers
+- cambios locales: llegan al confirmar cada sesión (ver changes.py)
+
+Como en la búsqueda en memoria, las rutas releen los ids con is_active = true.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..database.database import SessionLocal
+from ..models.product_model import Category, Product
+from .changes import CATEGORY, PRODUCT, Changes, register_index
+from .trigram import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH_SIZE = 2000
+
+# Clave de cada tipo en stats()
+STATS_KEYS = {PRODUCT: "products", CATEGORY: "categories"}
+
+
+class FuzzyNameIndex:
+    """Un TrigramIndex por tipo (product, category) con lock y contadores"""
+
+    def __init__(self):
+        self._indexes: Dict[str, TrigramIndex] = {PRODUCT: TrigramIndex(), CATEGORY: TrigramIndex()}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.searches = 0
+        self.incremental_updates = 0
+        self.reloads = 0
+        self.last_load_ms = 0.0
+
+    def load(self, db: Session) -> int:
+        """Reconstruye los índices con los nombres de productos y categorías activos"""
+        started = time.perf_counter()
+        indexes = {PRODUCT: TrigramIndex(), CATEGORY: TrigramIndex()}
+        for kind, model, id_column in (
+            (PRODUCT, Product, Product.product_id),
+            (CATEGORY, Category, Category.category_id),
+        ):
+            rows = db.execute(
+                select(id_column, model.name)
+                .where(model.is_active == True)
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
+            )
+            for entity_id, name in rows:
+                indexes[kind].add(entity_id, name)
+
+        with self._lock:
+            self._indexes = indexes
+            self.ready = True
+            self.reloads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Fuzzy index loaded with {len(indexes[PRODUCT])} products and "
+            f"{len(indexes[CATEGORY])} categories in {self.last_load_ms:.0f} ms"
+        )
+        return sum(len(index) for index in indexes.values())
+
+    def apply(self, changes: Changes) -> None:
+        with self._lock:
+            for (kind, entity_id), document in changes.items():
+                index = self._indexes.get(kind)
+                if index is None:
+                    continue
+                if document is None:
+                    index.remove(entity_id)
+                else:
+                    index.add(entity_id, document["name"])
+                self.incremental_updates += 1
+
+    def search(self, kind: str, query: str, offset: int, limit: int) -> List[int]:
+        """Ids ordenados por similitud (página offset..offset+limit)"""
+        with self._lock:
+            self.searches += 1
+            ranked = self._indexes[kind].search(query, offset + limit)
+        return [entity_id for entity_id, _ in ranked[offset:]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"ready": self.ready}
+            for kind, index in self._indexes.items():
+                memory = index.memory_bytes()
+                stats[STATS_KEYS[kind]] = {
+                    "documents": len(index),
+                    "trigrams": index.trigram_count,
+                    "memory_bytes": memory,
+                    "bytes_per_document": round(memory / len(index)) if len(index) else 0,
+                }
+            stats.update({
+                "searches": self.searches,
+                "incremental_updates": self.incremental_updates,
+                "reloads": self.reloads,
+                "last_load_ms": round(self.last_load_ms, 1),
+            })
+            return stats
+
+
+# Instancia global (una por proceso/worker)
+fuzzy_index = FuzzyNameIndex()
+register_index(fuzzy_index)
+
+
+def load_fuzzy_index() -> int:
+    """Carga el índice global (abre su propia sesión)"""
+    db = SessionLocal()
+    try:
+        return fuzzy_index.load(db)
+    finally:
+        db.close()
+
+
+async def run_fuzzy_index_rebuild(interval_seconds: int) -> None:
+    """Tarea de fondo: construye el índice y lo reconstruye periódicamente"""
+    while True:
+        try:
+            await asyncio.to_thread(load_fuzzy_index)
+        except Exception as e:
+            logger.warning(f"Fuzzy index rebuild failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
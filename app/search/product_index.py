@@ -0,0 +1,177 @@
+# app/search/product_index.py
+"""
+Índice BM25 de productos activos, uno por worker (SEARCH_BACKEND=memory).
+
+- load(): construye el índice completo en segundo plano al arrancar
+- cambios locales: llegan al confirmar cada sesión (ver changes.py)
+- cambios de otros workers: sync() relee los productos con updated_at
+  posterior a la última sincronización y recarga todo si la cantidad de
+  productos activos no coincide (eliminaciones físicas)
+
+Los ids del índice se releen de la base de datos con is_active = true, así un
+producto ya eliminado que siga en el índice nunca llega a la respuesta.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..database.database import SessionLocal
+from ..models.product_model import Product
+from .bm25 import InvertedIndex
+from .changes import PRODUCT, Changes, register_index
+from .text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Peso de cada campo en la frecuencia de términos
+FIELD_WEIGHTS = (("name", 3.0), ("sku", 2.0), ("description", 1.0))
+
+# Margen para commits en vuelo al sincronizar por updated_at
+SYNC_OVERLAP_SECONDS = 5
+
+LOAD_BATCH_SIZE = 2000
+
+
+def product_terms(document: dict) -> Dict[str, float]:
+    """Términos de {name, description, sku} con su frecuencia ponderada"""
+    terms: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(document.get(field)):
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+class ProductSearchIndex:
+    """Índice invertido de productos con lock y contadores"""
+
+    def __init__(self):
+        self._index = InvertedIndex()
+        self._lock = threading.Lock()
+        self._last_seen: Optional[datetime] = None
+        self.ready = False
+        self.searches = 0
+        self.incremental_updates = 0
+        self.reloads = 0
+        self.last_load_ms = 0.0
+
+    def load(self, db: Session) -> int:
+        """Reconstruye el índice con todos los productos activos"""
+        started = time.perf_counter()
+        last_seen = db.execute(select(func.max(Product.updated_at))).scalar()
+        rows = db.execute(
+            select(Product.product_id, Product.name, Product.description, Product.sku)
+            .where(Product.is_active == True)
+            .execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        index = InvertedIndex()
+        for product_id, name, description, sku in rows:
+            index.add(product_id, product_terms({"name": name, "description": description, "sku": sku}))
+
+        with self._lock:
+            self._index = index
+            self._last_seen = last_seen
+            self.ready = True
+            self.reloads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Product search index loaded with {len(index)} products in {self.last_load_ms:.0f} ms")
+        return len(index)
+
+    def sync(self, db: Session) -> int:
+        """Aplica los cambios hechos por otros workers desde la última sincronización"""
+        if not self.ready:
+            return self.load(db)
+
+        query = select(
+            Product.product_id, Product.name, Product.description, Product.sku,
+            Product.is_active, Product.updated_at,
+        )
+        if self._last_seen is not None:
+            query = query.where(Product.updated_at >= self._last_seen - timedelta(seconds=SYNC_OVERLAP_SECONDS))
+
+        changes: Changes = {}
+        last_seen = self._last_seen
+        for product_id, name, description, sku, is_active, updated_at in db.execute(query):
+            document = {"name": name, "description": description, "sku": sku}
+            changes[(PRODUCT, product_id)] = document if is_active else None
+            if updated_at is not None and (last_seen is None or updated_at > last_seen):
+                last_seen = updated_at
+        self.apply(changes)
+
+        active = db.execute(select(func.count()).where(Product.is_active == True)).scalar()
+        with self._lock:
+            self._last_seen = last_seen
+            in_sync = active == len(self._index)
+        if not in_sync:
+            return self.load(db)
+        return len(changes)
+
+    def apply(self, changes: Changes) -> None:
+        with self._lock:
+            for (kind, product_id), document in changes.items():
+                if kind != PRODUCT:
+                    continue
+                if document is None:
+                    self._index.remove(product_id)
+                else:
+                    self._index.add(product_id, product_terms(document))
+                self.incremental_updates += 1
+
+    def search(self, query: str, offset: int, limit: int) -> List[int]:
+        """Ids de producto ordenados por relevancia (página offset..offset+limit)"""
+        terms = tokenize(query)
+        with self._lock:
+            self.searches += 1
+            ranked = self._index.search(terms, offset + limit)
+        return [product_id for product_id, _ in ranked[offset:]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "products": len(self._index),
+                "terms": self._index.term_count,
+                "searches": self.searches,
+                "incremental_updates": self.incremental_updates,
+                "reloads": self.reloads,
+                "last_load_ms": round(self.last_load_ms, 1),
+                "last_seen_update": self._last_seen.isoformat() if self._last_seen else None,
+            }
+
+
+# Instancia global (una por proceso/worker)
+product_search_index = ProductSearchIndex()
+register_index(product_search_index)
+
+
+def load_product_search_index() -> int:
+    """Carga el índice global (abre su propia sesión)"""
+    db = SessionLocal()
+    try:
+        return product_search_index.load(db)
+    finally:
+        db.close()
+
+
+def sync_product_search_index() -> int:
+    """Sincroniza el índice global (la primera vez lo carga completo)"""
+    db = SessionLocal()
+    try:
+        return product_search_index.sync(db)
+    finally:
+        db.close()
+
+
+async def run_product_search_sync(interval_seconds: int) -> None:
+    """Tarea de fondo: carga el índice y luego incorpora los cambios de otros workers"""
+    while True:
+        try:
+            await asyncio.to_thread(sync_product_search_index)
+        except Exception as e:
+            logger.warning(f"Product search index sync failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
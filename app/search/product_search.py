@@ -0,0 +1,112 @@
+# app/search/product_search.py
+"""
+Backends de búsqueda de productos (SEARCH_BACKEND):
+
+- fulltext: MATCH ... AGAINST sobre el índice FULLTEXT (name, description,
+  sku) de MySQL, ordenado por relevancia. Default con MySQL.
+- memory: índice BM25 en memoria del worker (product_index.py). Default con
+  otras bases (SQLite en desarrollo).
+- like: los tres ILIKE '%term%' originales, ordenados por product_id.
+
+Todos respetan skip/limit. fulltext y memory retornan los productos ordenados
+por relevancia; mientras el índice en memoria carga se usa fulltext o like.
+
+Con fuzzy=true se usa el índice de trigramas (fuzzy.py), ordenado por
+similitud y tolerante a errores de tipeo.
+"""
+from typing import List, Tuple
+
+from sqlalchemy import or_
+
+from ..config import settings
+from ..database.database import engine
+from ..database.hot_queries import product_detail_query
+from ..models.product_model import Product
+from .changes import PRODUCT
+from .fuzzy import fuzzy_index
+from .product_index import product_search_index
+from .text import tokenize
+
+BACKENDS = ("fulltext", "memory", "like")
+FUZZY = "fuzzy"
+
+# Tokens más cortos que innodb_ft_min_token_size no están en el índice FULLTEXT
+FULLTEXT_MIN_TOKEN = 3
+
+
+def configured_backend(dialect: str = None) -> str:
+    dialect = dialect or engine.dialect.name
+    backend = (settings.search_backend or ("fulltext" if dialect == "mysql" else "memory")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Invalid SEARCH_BACKEND {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if backend == "fulltext" and dialect != "mysql":
+        return "like"
+    return backend
+
+
+def search_backend(dialect: str = None) -> str:
+    """Backend a usar ahora (memory cae a fulltext/like si el índice no cargó)"""
+    dialect = dialect or engine.dialect.name
+    backend = configured_backend(dialect)
+    if backend == "memory" and not product_search_index.ready:
+        return "fulltext" if dialect == "mysql" else "like"
+    return backend
+
+
+def like_filter(term: str):
+    return or_(
+        Product.name.ilike(f"%{term}%"),
+        Product.description.ilike(f"%{term}%"),
+        Product.sku.ilike(f"%{term}%")
+    )
+
+
+def boolean_query(term: str) -> str:
+    """Consulta BOOLEAN MODE: cualquier palabra, la última como prefijo (búsqueda al tipear)"""
+    tokens = [token for token in tokenize(term) if len(token) >= FULLTEXT_MIN_TOKEN]
+    if not tokens:
+        return ""
+    return " ".join(tokens[:-1] + [tokens[-1] + "*"])
+
+
+def fulltext_query(term: str):
+    """SELECT de productos activos ordenados por relevancia FULLTEXT"""
+    from sqlalchemy.dialects.mysql import match
+
+    query = product_detail_query().where(Product.is_active == True)
+    against = boolean_query(term)
+    if not against:
+        # Solo palabras cortas: no están en el índice FULLTEXT
+        return query.where(like_filter(term)).order_by(Product.product_id)
+
+    relevance = match(Product.name, Product.description, Product.sku, against=against).in_boolean_mode()
+    return query.where(or_(relevance, Product.sku == term)).order_by(relevance.desc(), Product.product_id)
+
+
+def order_by_ids(rows: List, ids: List[int], key: str = "product_id") -> List:
+    """Reordena las filas leídas con IN (...) según el ranking"""
+    position = {row_id: index for index, row_id in enumerate(ids)}
+    return sorted(rows, key=lambda row: position[getattr(row, key)])
+
+
+async def ranked_search(db, backend: str, term: str, offset: int, limit: int) -> Tuple[List[Product], bool]:
+    """
+    Página de productos por relevancia (backends fulltext, memory y fuzzy), en
+    una consulta. Retorna (productos, hay_más).
+    """
+    if backend in ("memory", FUZZY):
+        if backend == FUZZY:
+            product_ids = fuzzy_index.search(PRODUCT, term, offset, limit + 1)
+        else:
+            product_ids = product_search_index.search(term, offset, limit + 1)
+        page_ids = product_ids[:limit]
+        if not page_ids:
+            return [], False
+        result = await db.execute(product_detail_query().where(
+            Product.product_id.in_(page_ids), Product.is_active == True
+        ))
+        return order_by_ids(result.unique().scalars().all(), page_ids), len(product_ids) > limit
+
+    result = await db.execute(fulltext_query(term).offset(offset).limit(limit + 1))
+    products = result.unique().scalars().all()
+    return products[:limit], len(products) > limit
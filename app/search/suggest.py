@@ -0,0 +1,270 @@
+# app/search/suggest.py
+"""
+Autocompletado (type-ahead) de productos y categorías, uno por worker.
+
+Índice de prefijos en un arreglo ordenado de claves normalizadas: cada
+nombre se indexa desde el inicio de cada palabra ("Manzana roja" responde a
+"man" y a "roj") y el SKU con y sin separadores. Un prefijo es el rango
+[bisect_left(prefijo), primera clave que ya no empieza con él), así cada
+consulta es una búsqueda binaria más un recorrido del rango, sin tocar la
+base de datos. Los prefijos cortos (rangos grandes) se cachean hasta que
+cambia una entrada con una clave que empieza con ellos.
+
+Orden: popularidad (ventas online + físicas, vistas, destacado; en
+categorías, cantidad de productos activos), más un extra si el prefijo
+coincide con el inicio del nombre.
+
+- load(): construye el índice completo; se repite cada
+  SUGGEST_REBUILD_INTERVAL_SECONDS para recoger la popularidad y los cambios
+  de otros workers
+- cambios locales: llegan al confirmar cada sesión (ver changes.py); una
+  entrada nueva empieza sin popularidad hasta la siguiente reconstrucción
+"""
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from ..database.database import SessionLocal
+from ..models.product_model import Category, Product, ProductCategory
+from ..models.stats_model import SalesStatistics
+from .changes import CATEGORY, PRODUCT, Changes, register_index
+from .text import tokenize
+
+logger = logging.getLogger(__name__)
+
+MAX_SUGGESTIONS = 20
+
+# Palabras desde las que se indexa cada nombre y largo máximo de clave
+MAX_WORD_STARTS = 6
+MAX_KEY_LENGTH = 64
+
+# Prefijos de hasta 3 caracteres se cachean (son los de rangos más grandes)
+CACHE_PREFIX_LENGTH = 3
+CACHE_MAX_ENTRIES = 10000
+
+VIEWS_WEIGHT = 0.25
+FEATURED_BOOST = 1.0
+LABEL_START_BOOST = 0.5
+
+EntryKey = Tuple[str, int]
+
+
+def popularity(sales: Optional[int], views: Optional[int], featured: bool = False) -> float:
+    """Escala logarítmica: un producto muy vendido no tapa a todo el resto"""
+    return (
+        math.log1p(max(sales or 0, 0))
+        + VIEWS_WEIGHT * math.log1p(max(views or 0, 0))
+        + (FEATURED_BOOST if featured else 0.0)
+    )
+
+
+def normalize_prefix(text: Optional[str]) -> str:
+    return " ".join(tokenize(text))
+
+
+def entry_keys(label: str, sku: Optional[str] = None) -> List[Tuple[str, bool]]:
+    """(clave, es_inicio_del_nombre) desde cada palabra del nombre, más el SKU"""
+    tokens = tokenize(label)
+    keys = [
+        (" ".join(tokens[start:])[:MAX_KEY_LENGTH], start == 0)
+        for start in range(min(len(tokens), MAX_WORD_STARTS))
+    ]
+    sku_tokens = tokenize(sku)
+    if sku_tokens:
+        keys.append((" ".join(sku_tokens)[:MAX_KEY_LENGTH], True))
+        if len(sku_tokens) > 1:
+            keys.append(("".join(sku_tokens)[:MAX_KEY_LENGTH], True))
+    return list(dict.fromkeys(keys))
+
+
+def _cached_prefixes(label: str, sku: Optional[str]) -> set:
+    """Prefijos cacheables (hasta CACHE_PREFIX_LENGTH) cuyo rango incluye la entrada"""
+    return {
+        key[:length]
+        for key, _ in entry_keys(label, sku)
+        for length in range(1, CACHE_PREFIX_LENGTH + 1)
+    }
+
+
+class SuggestionIndex:
+    """Arreglo ordenado de (clave, tipo, id, es_inicio) con lock y contadores"""
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, int, bool]] = []
+        # (tipo, id) -> (label, sku, peso)
+        self._entries: Dict[EntryKey, Tuple[str, Optional[str], float]] = {}
+        self._cache: Dict[str, List[Tuple[float, EntryKey]]] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.queries = 0
+        self.cache_hits = 0
+        self.incremental_updates = 0
+        self.reloads = 0
+        self.last_load_ms = 0.0
+
+    def load(self, db: Session) -> int:
+        """Reconstruye el índice con productos y categorías activos y su popularidad"""
+        started = time.perf_counter()
+        entries: Dict[EntryKey, Tuple[str, Optional[str], float]] = {}
+
+        stats = (
+            select(
+                SalesStatistics.product_id,
+                func.sum(
+                    func.coalesce(SalesStatistics.total_online_sales, 0)
+                    + func.coalesce(SalesStatistics.total_physical_sales, 0)
+                ).label("sales"),
+                func.sum(func.coalesce(SalesStatistics.views_count, 0)).label("views"),
+            )
+            .group_by(SalesStatistics.product_id)
+            .subquery()
+        )
+        products = db.execute(
+            select(Product.product_id, Product.name, Product.sku, Product.is_featured, stats.c.sales, stats.c.views)
+            .outerjoin(stats, stats.c.product_id == Product.product_id)
+            .where(Product.is_active == True)
+        )
+        for product_id, name, sku, is_featured, sales, views in products:
+            entries[(PRODUCT, product_id)] = (name, sku, popularity(sales, views, bool(is_featured)))
+
+        categories = db.execute(
+            select(Category.category_id, Category.name, func.count(Product.product_id))
+            .outerjoin(ProductCategory, ProductCategory.category_id == Category.category_id)
+            .outerjoin(Product, and_(
+                Product.product_id == ProductCategory.product_id, Product.is_active == True
+            ))
+            .where(Category.is_active == True)
+            .group_by(Category.category_id, Category.name)
+        )
+        for category_id, name, product_count in categories:
+            entries[(CATEGORY, category_id)] = (name, None, popularity(product_count, 0))
+
+        keys = sorted(
+            (key, kind, entity_id, at_start)
+            for (kind, entity_id), (label, sku, _) in entries.items()
+            for key, at_start in entry_keys(label, sku)
+        )
+        with self._lock:
+            self._keys = keys
+            self._entries = entries
+            self._cache = {}
+            self.ready = True
+            self.reloads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Suggestion index loaded with {len(entries)} entries ({len(keys)} keys) "
+            f"in {self.last_load_ms:.0f} ms"
+        )
+        return len(entries)
+
+    def apply(self, changes: Changes) -> None:
+        with self._lock:
+            # Prefijos cacheables de las claves viejas y nuevas de cada entrada
+            stale_prefixes = set()
+            for (kind, entity_id), document in changes.items():
+                previous = self._entries.get((kind, entity_id))
+                if previous is not None:
+                    stale_prefixes.update(_cached_prefixes(previous[0], previous[1]))
+                self._remove(kind, entity_id)
+                if document is not None:
+                    weight = previous[2] if previous else popularity(0, 0, bool(document.get("is_featured")))
+                    self._add(kind, entity_id, document["name"], document.get("sku"), weight)
+                    stale_prefixes.update(_cached_prefixes(document["name"], document.get("sku")))
+                self.incremental_updates += 1
+            for prefix in stale_prefixes:
+                self._cache.pop(prefix, None)
+
+    def _add(self, kind: str, entity_id: int, label: str, sku: Optional[str], weight: float) -> None:
+        self._entries[(kind, entity_id)] = (label, sku, weight)
+        for key, at_start in entry_keys(label, sku):
+            bisect.insort(self._keys, (key, kind, entity_id, at_start))
+
+    def _remove(self, kind: str, entity_id: int) -> None:
+        entry = self._entries.pop((kind, entity_id), None)
+        if entry is None:
+            return
+        label, sku, _ = entry
+        for key, at_start in entry_keys(label, sku):
+            position = bisect.bisect_left(self._keys, (key, kind, entity_id, at_start))
+            if position < len(self._keys) and self._keys[position] == (key, kind, entity_id, at_start):
+                del self._keys[position]
+
+    def _ranked(self, prefix: str) -> List[Tuple[float, EntryKey]]:
+        """Mejor puntaje por entrada dentro del rango del prefijo, de mayor a menor"""
+        best: Dict[EntryKey, float] = {}
+        position = bisect.bisect_left(self._keys, (prefix,))
+        keys = self._keys
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            _, kind, entity_id, at_start = keys[position]
+            score = self._entries[(kind, entity_id)][2] + (LABEL_START_BOOST if at_start else 0.0)
+            if score > best.get((kind, entity_id), -1.0):
+                best[(kind, entity_id)] = score
+            position += 1
+        ranked = sorted(((score, entry) for entry, score in best.items()), key=lambda item: (-item[0], item[1]))
+        return ranked[:MAX_SUGGESTIONS]
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        prefix = normalize_prefix(query)
+        if not prefix:
+            return []
+        with self._lock:
+            self.queries += 1
+            ranked = self._cache.get(prefix)
+            if ranked is not None:
+                self.cache_hits += 1
+            else:
+                ranked = self._ranked(prefix)
+                if len(prefix) <= CACHE_PREFIX_LENGTH:
+                    if len(self._cache) >= CACHE_MAX_ENTRIES:
+                        self._cache = {}
+                    self._cache[prefix] = ranked
+            suggestions = []
+            for _, (kind, entity_id) in ranked[:limit]:
+                label, sku, _ = self._entries[(kind, entity_id)]
+                suggestions.append({"type": kind, "id": entity_id, "label": label, "sku": sku})
+        return suggestions
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "entries": len(self._entries),
+                "keys": len(self._keys),
+                "queries": self.queries,
+                "cache_hits": self.cache_hits,
+                "cached_prefixes": len(self._cache),
+                "incremental_updates": self.incremental_updates,
+                "reloads": self.reloads,
+                "last_load_ms": round(self.last_load_ms, 1),
+            }
+
+
+# Instancia global (una por proceso/worker)
+suggestion_index = SuggestionIndex()
+register_index(suggestion_index)
+
+
+def load_suggestion_index() -> int:
+    """Carga el índice global (abre su propia sesión)"""
+    db = SessionLocal()
+    try:
+        return suggestion_index.load(db)
+    finally:
+        db.close()
+
+
+async def run_suggestion_rebuild(interval_seconds: int) -> None:
+    """Tarea de fondo: construye el índice y lo reconstruye periódicamente"""
+    while True:
+        try:
+            await asyncio.to_thread(load_suggestion_index)
+        except Exception as e:
+            logger.warning(f"Suggestion index rebuild failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
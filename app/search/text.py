@@ -0,0 +1,20 @@
+# app/search/text.py
+"""Normalización de texto compartida por el índice y las consultas"""
+import re
+import unicodedata
+from typing import List, Optional
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Minúsculas y sin acentos ("Café" -> "cafe")"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Palabras alfanuméricas normalizadas ("SKU-123 Café" -> ["sku", "123", "cafe"])"""
+    return _TOKEN.findall(normalize(text))
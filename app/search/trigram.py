@@ -0,0 +1,94 @@
+# app/search/trigram.py
+"""
+Índice de trigramas para búsqueda tolerante a errores de tipeo.
+
+Cada palabra normalizada se rellena como en pg_trgm ("  cafe ") y se parte
+en trigramas; una palabra con una letra de más, de menos o cambiada sigue
+compartiendo la mayoría de ellos. Buscar cuesta recorrer las postings de
+los trigramas de la consulta (no una distancia de edición contra cada
+nombre).
+
+Puntaje: trigramas compartidos / trigramas de la consulta (cuánto de lo
+escrito aparece en el nombre); desempata Jaccard, que favorece los nombres
+más parecidos en largo. No es thread-safe: FuzzyNameIndex lo protege.
+"""
+import sys
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .text import tokenize
+
+# Cobertura mínima de la consulta para considerar un candidato
+MIN_SIMILARITY = 0.5
+
+
+def trigrams(text: Optional[str]) -> FrozenSet[str]:
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Postings trigrama -> {doc_id} y trigramas de cada documento"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._documents: Dict[int, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def trigram_count(self) -> int:
+        return len(self._postings)
+
+    def add(self, doc_id: int, text: Optional[str]) -> None:
+        """Agrega o reemplaza un documento"""
+        self.remove(doc_id)
+        grams = trigrams(text)
+        if not grams:
+            return
+        self._documents[doc_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        grams = self._documents.pop(doc_id, None)
+        if grams is None:
+            return
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int, min_similarity: float = MIN_SIMILARITY) -> List[Tuple[int, float]]:
+        """(doc_id, similitud) de mayor a menor, hasta limit resultados"""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for doc_id in self._postings.get(gram, ()):
+                shared[doc_id] = shared.get(doc_id, 0) + 1
+
+        minimum = min_similarity * len(query_grams)
+        ranked = []
+        for doc_id, count in shared.items():
+            if count < minimum:
+                continue
+            jaccard = count / (len(query_grams) + len(self._documents[doc_id]) - count)
+            ranked.append((count / len(query_grams), jaccard, doc_id))
+        ranked.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [(doc_id, round(similarity, 4)) for similarity, _, doc_id in ranked[:limit]]
+
+    def memory_bytes(self) -> int:
+        """Estimación (sys.getsizeof) de postings y documentos; los trigramas se comparten"""
+        total = sys.getsizeof(self._postings) + sys.getsizeof(self._documents)
+        for gram, postings in self._postings.items():
+            total += sys.getsizeof(gram) + sys.getsizeof(postings)
+        for grams in self._documents.values():
+            total += sys.getsizeof(grams)
+        return total
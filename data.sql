@@ -362,6 +362,17 @@ CREATE TABLE IF NOT EXISTS WISHLIST_ITEMS (
     FOREIGN KEY (product_id) REFERENCES PRODUCTS(product_id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Tabla REVOKED_TOKENS (revocación de refresh/access tokens)
+CREATE TABLE IF NOT EXISTS REVOKED_TOKENS (
+    jti VARCHAR(64) PRIMARY KEY,
+    user_id INT NOT NULL,
+    token_type VARCHAR(20) NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    INDEX idx_revoked_tokens_expires_at (expires_at),
+    FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Reactivar las restricciones de clave foránea
 SET FOREIGN_KEY_CHECKS = 1;
 
@@ -1,26 +1,129 @@
+import time
+_boot_started = time.perf_counter()  # tiempo de arranque del worker (imports + lifespan)
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.database import engine, Base
+from app.database.database import engine, async_engine
+from app.database.schema import check_schema_version, upgrade_schema
+from app.database.replicas import replica_router, pin_writes_to_primary
+from app.database.pool_metrics import PoolAutoscaler, run_pool_autoscaler, prewarm_pools
+from app.database.query_stats import track_request_queries
+from app.database.pagination import InvalidCursor, invalid_cursor_handler, NEXT_CURSOR_HEADER
+from app.database.statement_timeouts import (
+    apply_statement_timeouts, statement_timeout_handler, pool_timeout_handler
+)
 from app.routes import main_router
+from app.core.password_hasher import password_hash_pool, calibrate_bcrypt_rounds
+from app.core.revocation import sync_revocation_filter, run_revocation_sync
+from app.core.last_login_buffer import last_login_buffer, run_last_login_flush
+from app.core.jwt_handler import get_jwt_backend
+from app.search.product_index import run_product_search_sync
+from app.search.product_search import configured_backend
+from app.search.suggest import run_suggestion_rebuild
+from app.search.fuzzy import run_fuzzy_index_rebuild
+from app.config import settings
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
+IMPORT_SECONDS = time.perf_counter() - _boot_started
+
+
+def prewarm_worker():
+    """Trabajo diferido del arranque: backend JWT y conexiones del pool"""
+    get_jwt_backend()
+    if settings.db_pool_prewarm:
+        opened = prewarm_pools(settings.db_pool_size)
+        logger.info(f"Prewarmed {opened} database connections")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Crear tablas en la base de datos
+    # Startup: verificar la versión del esquema (las migraciones se aplican
+    # con app/scripts/migrations.py; DB_AUTO_MIGRATE solo para desarrollo)
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        if settings.db_auto_migrate:
+            await run_in_threadpool(upgrade_schema)
+        if not await run_in_threadpool(check_schema_version, engine):
+            logger.warning("API will start but database operations may fail")
     except Exception as e:
-        logger.error(f"Error creating database tables: {str(e)}")
+        logger.error(f"Error checking database schema: {str(e)}")
         logger.warning("API will start but database operations may fail")
 
+    # Calibrar el costo de bcrypt para este host (salvo que venga fijado)
+    if settings.bcrypt_rounds is None:
+        await run_in_threadpool(calibrate_bcrypt_rounds)
+
+    # Cargar el filtro de tokens revocados y sincronizarlo periódicamente
+    try:
+        await run_in_threadpool(sync_revocation_filter)
+    except Exception as e:
+        logger.error(f"Error loading revoked tokens: {str(e)}")
+    revocation_task = asyncio.create_task(
+        run_revocation_sync(settings.revocation_sync_interval_seconds)
+    )
+
+    last_login_task = asyncio.create_task(
+        run_last_login_flush(settings.last_login_flush_interval_seconds)
+    )
+
+    # Ajuste adaptativo del tamaño de los pools
+    pool_task = None
+    if settings.db_pool_adaptive:
+        autoscaler = PoolAutoscaler(
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            target_wait_ms=settings.db_pool_target_wait_ms,
+        )
+        pool_task = asyncio.create_task(
+            run_pool_autoscaler(autoscaler, settings.db_pool_adapt_interval_seconds)
+        )
+
+    # Índice de búsqueda en memoria: se carga en segundo plano (mientras
+    # tanto las búsquedas usan FULLTEXT o LIKE)
+    search_task = None
+    if configured_backend() == "memory":
+        search_task = asyncio.create_task(
+            run_product_search_sync(settings.search_index_sync_interval_seconds)
+        )
+
+    # Índices de autocompletado y búsqueda difusa: se construyen en segundo plano
+    suggest_task = asyncio.create_task(
+        run_suggestion_rebuild(settings.suggest_rebuild_interval_seconds)
+    )
+    fuzzy_task = asyncio.create_task(
+        run_fuzzy_index_rebuild(settings.fuzzy_index_rebuild_interval_seconds)
+    )
+
+    # Pre-calentar en segundo plano sin demorar el arranque
+    prewarm_task = asyncio.create_task(asyncio.to_thread(prewarm_worker))
+    logger.info(
+        f"Worker ready in {(time.perf_counter() - _boot_started) * 1000:.0f} ms "
+        f"(imports {IMPORT_SECONDS * 1000:.0f} ms)"
+    )
+
     yield
 
     # Shutdown: Limpiar recursos si es necesario
     logger.info("Shutting down application")
+    revocation_task.cancel()
+    last_login_task.cancel()
+    prewarm_task.cancel()
+    suggest_task.cancel()
+    fuzzy_task.cancel()
+    if pool_task is not None:
+        pool_task.cancel()
+    if search_task is not None:
+        search_task.cancel()
+    # Escribir los last_login pendientes antes de cerrar
+    await run_in_threadpool(last_login_buffer.flush)
+    password_hash_pool.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    await replica_router.dispose()
 
 app = FastAPI(
     title="e-commerce API",
@@ -47,20 +150,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-app.include_router(
-    main_router
-)
+# Read-your-writes: fijar al primario a los clientes que acaban de escribir
+if replica_router.enabled:
+    app.middleware("http")(pin_writes_to_primary)
+
+# Consultas SQL por petición (header Server-Timing y /metrics/queries)
+app.middleware("http")(track_request_queries)
+
+# Tiempo máximo por consulta (statement_timeout() en la ruta): 504 si se
+# supera, 503 si no hay conexión libre en el pool
+app.middleware("http")(apply_statement_timeouts)
+app.add_exception_handler(OperationalError, statement_timeout_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
 
+# Cursor de paginación inválido: 400
+app.add_exception_handler(InvalidCursor, invalid_cursor_handler)
 
-"""
 app.include_router(
-    books.router,
-    prefix="/api/v1",
-    tags=["Books"]
+    main_router
 )
-"""
+
 # Health check endpoint
 @app.get("/")
 async def root():
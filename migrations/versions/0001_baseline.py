@@ -0,0 +1,390 @@
+"""baseline: tablas existentes antes de las migraciones versionadas
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 10:00:00
+
+DDL congelado del esquema previo a las migraciones (el de data.sql y el del
+create_all que corría al arrancar). No depende de los modelos: los índices y
+tablas posteriores viven en sus propias revisiones. Una base ya creada con
+data.sql se marca sin ejecutar nada:
+    python -m app.scripts.migrations stamp 0001
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'categories',
+        sa.Column('category_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('category_image', sa.String(length=255), nullable=True),
+        sa.Column('parent_category_id', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['parent_category_id'], ['categories.category_id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('category_id')
+    )
+    op.create_table(
+        'discounts',
+        sa.Column('discount_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('discount_type', sa.Enum('percentage', 'fixed_amount'), nullable=False),
+        sa.Column('discount_value', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=False),
+        sa.Column('min_purchase', sa.DECIMAL(precision=10, scale=2), nullable=True),
+        sa.Column('max_uses', sa.Integer(), nullable=True),
+        sa.Column('current_uses', sa.Integer(), nullable=True),
+        sa.Column('coupon_code', sa.String(length=50), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('discount_id'),
+        sa.UniqueConstraint('coupon_code')
+    )
+    op.create_table(
+        'payment_methods',
+        sa.Column('payment_type_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('payment_type_id')
+    )
+    op.create_table(
+        'product_attribute_types',
+        sa.Column('attribute_type_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('product_type', sa.String(length=100), nullable=False),
+        sa.Column('data_type', sa.Enum('text', 'number', 'date', 'boolean'), nullable=False),
+        sa.Column('is_required', sa.Boolean(), nullable=True),
+        sa.Column('is_searchable', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('attribute_type_id')
+    )
+    op.create_table(
+        'stores',
+        sa.Column('store_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('address', sa.Text(), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('email', sa.String(length=150), nullable=True),
+        sa.Column('opening_hours', sa.Time(), nullable=True),
+        sa.Column('closing_hours', sa.Time(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('store_id')
+    )
+    op.create_table(
+        'suppliers',
+        sa.Column('supplier_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('supplier_image', sa.String(length=255), nullable=True),
+        sa.Column('contact_info', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('supplier_id')
+    )
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=150), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('user_type', sa.Enum('common', 'admin', 'store_staff', name='user_type_enum'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+    )
+    op.create_table(
+        'admin_actions_log',
+        sa.Column('log_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action_type', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('log_id')
+    )
+    op.create_table(
+        'category_discounts',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('discount_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['discount_id'], ['discounts.discount_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id', 'discount_id')
+    )
+    op.create_table(
+        'orders',
+        sa.Column('order_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payment_type_id', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'processing', 'paid', 'shipped', 'delivered', 'cancelled'), nullable=True),
+        sa.Column('shipping_address', sa.Text(), nullable=False),
+        sa.Column('tracking_number', sa.String(length=100), nullable=True),
+        sa.Column('delivery_method', sa.Enum('shipping', 'store_pickup'), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['payment_type_id'], ['payment_methods.payment_type_id']),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.store_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('order_id')
+    )
+    op.create_table(
+        'physical_sales',
+        sa.Column('sale_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('payment_method', sa.Enum('efectivo', 'tarjeta', 'otro'), nullable=False),
+        sa.Column('receipt_number', sa.String(length=50), nullable=False),
+        sa.Column('is_invoice_required', sa.Boolean(), nullable=True),
+        sa.Column('customer_tax_info', sa.String(length=150), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.store_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('sale_id')
+    )
+    op.create_table(
+        'products',
+        sa.Column('product_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('supplier_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('product_image', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('online_stock', sa.Integer(), nullable=False),
+        sa.Column('sku', sa.String(length=50), nullable=False),
+        sa.Column('release_date', sa.Date(), nullable=True),
+        sa.Column('is_featured', sa.Boolean(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('product_type', sa.String(length=100), nullable=True),
+        sa.Column('attributes', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.supplier_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id'),
+        sa.UniqueConstraint('sku')
+    )
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_type', sa.String(length=20), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_table(
+        'shopping_carts',
+        sa.Column('cart_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('cart_id')
+    )
+    op.create_table(
+        'store_staff',
+        sa.Column('staff_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.Enum('manager', 'cashier', 'inventory'), nullable=False),
+        sa.Column('hire_date', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.store_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('staff_id')
+    )
+    op.create_table(
+        'user_payment_methods',
+        sa.Column('payment_method_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payment_type_id', sa.Integer(), nullable=False),
+        sa.Column('account_details', sa.String(length=255), nullable=False),
+        sa.Column('is_default', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['payment_type_id'], ['payment_methods.payment_type_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('payment_method_id')
+    )
+    op.create_table(
+        'user_profiles',
+        sa.Column('profile_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=True),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('address', sa.Text(), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('profile_image', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('profile_id')
+    )
+    op.create_table(
+        'wishlists',
+        sa.Column('wishlist_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('is_public', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('wishlist_id')
+    )
+    op.create_table(
+        'cart_items',
+        sa.Column('cart_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('added_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['cart_id'], ['shopping_carts.cart_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.PrimaryKeyConstraint('cart_id', 'product_id')
+    )
+    op.create_table(
+        'inventory_movements',
+        sa.Column('movement_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('movement_type', sa.Enum('entrada', 'salida', 'transferencia', 'ajuste', 'online_reserva'), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('reference', sa.String(length=100), nullable=True),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.store_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('movement_id')
+    )
+    op.create_table(
+        'order_items',
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('price_at_time', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.PrimaryKeyConstraint('order_id', 'product_id')
+    )
+    op.create_table(
+        'physical_sale_items',
+        sa.Column('sale_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('price_at_time', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('discount_amount', sa.DECIMAL(precision=10, scale=2), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.ForeignKeyConstraint(['sale_id'], ['physical_sales.sale_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sale_id', 'product_id')
+    )
+    op.create_table(
+        'product_attribute_values',
+        sa.Column('value_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('attribute_type_id', sa.Integer(), nullable=False),
+        sa.Column('text_value', sa.Text(), nullable=True),
+        sa.Column('number_value', sa.DECIMAL(precision=10, scale=2), nullable=True),
+        sa.Column('date_value', sa.Date(), nullable=True),
+        sa.Column('boolean_value', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['attribute_type_id'], ['product_attribute_types.attribute_type_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('value_id')
+    )
+    op.create_table(
+        'product_categories',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'category_id')
+    )
+    op.create_table(
+        'product_discounts',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('discount_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['discount_id'], ['discounts.discount_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'discount_id')
+    )
+    op.create_table(
+        'product_reviews',
+        sa.Column('review_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.DECIMAL(precision=3, scale=1), nullable=False),
+        sa.Column('review_text', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('status', sa.Enum('pending', 'approved', 'rejected'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('review_id')
+    )
+    op.create_table(
+        'sales_statistics',
+        sa.Column('stat_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('total_online_sales', sa.Integer(), nullable=True),
+        sa.Column('total_physical_sales', sa.Integer(), nullable=True),
+        sa.Column('online_revenue', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('physical_revenue', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('views_count', sa.Integer(), nullable=True),
+        sa.Column('conversion_rate', sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column('last_updated', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('stat_id')
+    )
+    op.create_table(
+        'store_inventory',
+        sa.Column('inventory_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('location', sa.String(length=50), nullable=True),
+        sa.Column('low_stock_threshold', sa.Integer(), nullable=True),
+        sa.Column('notify_low_stock', sa.Boolean(), nullable=True),
+        sa.Column('last_updated', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.ForeignKeyConstraint(['store_id'], ['stores.store_id']),
+        sa.PrimaryKeyConstraint('inventory_id')
+    )
+    op.create_table(
+        'wishlist_items',
+        sa.Column('wishlist_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('added_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['wishlist_id'], ['wishlists.wishlist_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('wishlist_id', 'product_id')
+    )
+
+
+def downgrade() -> None:
+    # La baseline no se revierte: borraría todos los datos
+    pass
@@ -0,0 +1,45 @@
+"""catalog indexes: índices compuestos para los filtros del catálogo
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:05:00
+
+Alineados con los filtros de product_gets.py (is_active + is_featured /
+product_type / price, supplier_id), category_gets.py (parent_category_id +
+is_active), el filtro por categoría sobre product_categories y las consultas
+por usuario/estado de orders y por producto/tienda del inventario.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('products', 'ix_products_active_featured', ['is_active', 'is_featured']),
+    ('products', 'ix_products_active_type_price', ['is_active', 'product_type', 'price']),
+    ('products', 'ix_products_active_price', ['is_active', 'price']),
+    ('products', 'ix_products_supplier_active', ['supplier_id', 'is_active']),
+    ('categories', 'ix_categories_parent_active', ['parent_category_id', 'is_active']),
+    ('product_categories', 'ix_product_categories_category', ['category_id', 'product_id']),
+    ('orders', 'ix_orders_user_created', ['user_id', 'created_at']),
+    ('orders', 'ix_orders_status_created', ['status', 'created_at']),
+    ('store_inventory', 'ix_store_inventory_product_store', ['product_id', 'store_id']),
+    ('store_inventory', 'ix_store_inventory_store_quantity', ['store_id', 'quantity']),
+    ('inventory_movements', 'ix_inventory_movements_product_created', ['product_id', 'created_at']),
+    ('inventory_movements', 'ix_inventory_movements_store_created', ['store_id', 'created_at']),
+)
+
+
+def upgrade() -> None:
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
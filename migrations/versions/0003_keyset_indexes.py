@@ -0,0 +1,39 @@
+"""keyset indexes: índices para la paginación por cursor
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 14:20:00
+
+Cada orden de app/database/pagination.py necesita un índice con las
+columnas de orden seguidas de la clave primaria. Los órdenes por product_id,
+category_id y user_id usan la clave primaria; por categoría se usa
+ix_product_categories_category (category_id, product_id) de 0002, y
+ix_products_active_price de 0002 ya cubre is_active + price (InnoDB agrega
+la clave primaria a los índices secundarios).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('products', 'ix_products_price_id', ['price', 'product_id']),
+    ('products', 'ix_products_created_id', ['created_at', 'product_id']),
+    ('products', 'ix_products_active_created_id', ['is_active', 'created_at', 'product_id']),
+    ('categories', 'ix_categories_active_id', ['is_active', 'category_id']),
+)
+
+
+def upgrade() -> None:
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
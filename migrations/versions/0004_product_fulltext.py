@@ -0,0 +1,34 @@
+"""product fulltext: índice FULLTEXT para la búsqueda de productos
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 16:40:00
+
+MATCH (name, description, sku) AGAINST (...) necesita un índice FULLTEXT con
+exactamente esas columnas. Solo MySQL: con otras bases la búsqueda usa el
+índice en memoria (SEARCH_BACKEND=memory) y no se crea nada.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ft_products_search'
+COLUMNS = ['name', 'description', 'sku']
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        op.create_index(INDEX_NAME, 'products', COLUMNS, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        op.drop_index(INDEX_NAME, table_name='products')
@@ -0,0 +1,83 @@
+"""category closure: jerarquía de categorías materializada
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 19:20:00
+
+Tabla category_closure (ancestro, descendiente, depth) para consultar el
+árbol, los ancestros, los descendientes y los ciclos con una sola consulta.
+Se llena desde parent_category_id (un INSERT ... SELECT por nivel, contra
+definiciones sa.table() propias de esta revisión); después la mantienen los
+eventos de Category (app/database/category_hierarchy.py).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'category_closure'
+INDEX_NAME = 'ix_category_closure_descendant_depth'
+
+# Corte del llenado (datos previos con ciclos o muy profundos)
+MAX_DEPTH = 100
+
+categories = sa.table(
+    'categories',
+    sa.column('category_id', sa.Integer()),
+    sa.column('parent_category_id', sa.Integer()),
+)
+closure = sa.table(
+    TABLE,
+    sa.column('ancestor_id', sa.Integer()),
+    sa.column('descendant_id', sa.Integer()),
+    sa.column('depth', sa.Integer()),
+)
+
+
+def fill_closure(bind) -> None:
+    """Fila propia (depth 0) y luego un INSERT por nivel hasta no agregar filas"""
+    columns = ['ancestor_id', 'descendant_id', 'depth']
+    bind.execute(closure.insert().from_select(
+        columns,
+        sa.select(categories.c.category_id, categories.c.category_id, sa.literal(0)),
+    ))
+    for depth in range(1, MAX_DEPTH + 1):
+        parent_links = closure.alias('parent_links')
+        existing = closure.alias('existing')
+        result = bind.execute(closure.insert().from_select(
+            columns,
+            sa.select(parent_links.c.ancestor_id, categories.c.category_id, sa.literal(depth))
+            .select_from(categories)
+            .join(parent_links, sa.and_(
+                parent_links.c.descendant_id == categories.c.parent_category_id,
+                parent_links.c.depth == depth - 1,
+            ))
+            # Un ciclo previo en parent_category_id no se materializa
+            .where(~sa.exists().where(
+                existing.c.ancestor_id == parent_links.c.ancestor_id,
+                existing.c.descendant_id == categories.c.category_id,
+            )),
+        ))
+        if not result.rowcount:
+            break
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE,
+        sa.Column('ancestor_id', sa.Integer(), sa.ForeignKey('categories.category_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('descendant_id', sa.Integer(), sa.ForeignKey('categories.category_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('depth', sa.Integer(), nullable=False),
+    )
+    op.create_index(INDEX_NAME, TABLE, ['descendant_id', 'depth'])
+    fill_closure(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_table(TABLE)
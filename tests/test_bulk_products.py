@@ -0,0 +1,25 @@
+# tests/test_bulk_products.py
+"""
+Upsert masivo por SKU: los SKUs se comparan como la collation de MySQL (sin
+mayúsculas ni acentos) y los choques se reportan por fila, no como un 500.
+"""
+from app.database.bulk_products import CREATED, FAILED, UPDATED, bulk_upsert_products, sku_key
+
+
+def test_sku_key_ignores_case_and_accents():
+    assert sku_key("Café-ABC") == sku_key("cafe-abc")
+    assert sku_key("SKU-1") != sku_key("SKU-2")
+
+
+def test_batch_duplicates_by_case_or_accent_fail_per_row(db, catalog):
+    rows = [
+        {"name": "Parlante", "sku": "CAFÉ-9", "price": 10, "supplier_id": catalog["supplier_id"]},
+        {"name": "Parlante", "sku": "cafe-9", "price": 12, "supplier_id": catalog["supplier_id"]},
+        {"name": "Auriculares 1", "sku": "SKU-1", "price": 60, "supplier_id": catalog["supplier_id"]},
+    ]
+
+    results = bulk_upsert_products(db, rows)
+
+    assert [result["status"] for result in results] == [CREATED, FAILED, UPDATED]
+    assert "Duplicate SKU" in results[1]["error"]
+    assert results[2]["product_id"] == catalog["product_id"]
@@ -0,0 +1,36 @@
+# tests/test_category_hierarchy.py
+"""category_closure se mantiene al cambiar el padre por columna o por relación"""
+from sqlalchemy import select
+
+from app.database.category_hierarchy import closure, rebuild_category_closure
+from app.models.product_model import Category
+
+
+def closure_rows(db):
+    return sorted(db.execute(select(closure.c.ancestor_id, closure.c.descendant_id, closure.c.depth)).all())
+
+
+def assert_matches_rebuild(db):
+    maintained = closure_rows(db)
+    rebuild_category_closure(db.connection())
+    assert closure_rows(db) == maintained
+
+
+def test_closure_follows_parent_changes(db):
+    first, second, child = Category(name="Primera"), Category(name="Segunda"), Category(name="Hija")
+    db.add_all([first, second, child])
+    db.commit()
+
+    child.parent_category_id = first.category_id
+    db.commit()
+    assert (first.category_id, child.category_id, 1) in closure_rows(db)
+
+    second.subcategories.append(child)
+    db.commit()
+    assert (second.category_id, child.category_id, 1) in closure_rows(db)
+    assert (first.category_id, child.category_id, 1) not in closure_rows(db)
+
+    child.description = "Sin cambio de padre"
+    child.is_active = False
+    db.commit()
+    assert_matches_rebuild(db)
@@ -0,0 +1,65 @@
+# tests/test_login.py
+"""
+Login con rehash de contraseña: el commit expira el usuario y la recarga debe
+hacerse en el threadpool, no con lazy loads en el event loop al armar los
+claims y la respuesta. El rehash solo sube el costo, nunca lo baja.
+"""
+import bcrypt
+from sqlalchemy import inspect
+
+import app.routes.auth.auth_users as auth_users
+from app.config import settings
+from app.core.password_hasher import bcrypt_cost
+from app.models.user_model import User
+
+PASSWORD = "Secret123!"
+
+
+def test_login_rehash_builds_claims_from_loaded_user(client, db, monkeypatch):
+    user = User(
+        username="buyer",
+        email="buyer@example.com",
+        password_hash=bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(4)).decode(),
+        user_type="common",
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+
+    expired_on_claims = []
+    token_claims = auth_users.token_claims
+
+    def checked_token_claims(user, *args, **kwargs):
+        columns = {attr.key for attr in inspect(User).column_attrs}
+        expired_on_claims.append(inspect(user).expired_attributes & columns)
+        return token_claims(user, *args, **kwargs)
+
+    monkeypatch.setattr(auth_users, "token_claims", checked_token_claims)
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": PASSWORD})
+
+    assert response.status_code == 200, response.text
+    assert expired_on_claims == [set()]
+    db.expire_all()
+    assert bcrypt_cost(db.get(User, user.user_id).password_hash) == 5
+
+
+def test_login_keeps_hash_with_higher_cost(client, db, monkeypatch):
+    # Otro worker pudo calibrar una ronda más: no se baja el costo
+    user = User(
+        username="seller",
+        email="seller@example.com",
+        password_hash=bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(5)).decode(),
+        user_type="common",
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": PASSWORD})
+
+    assert response.status_code == 200, response.text
+    db.expire_all()
+    assert bcrypt_cost(db.get(User, user.user_id).password_hash) == 5
@@ -0,0 +1,40 @@
+# tests/test_migrations.py
+"""
+Las migraciones sobre una base vacía dejan el mismo esquema que los modelos
+(salvo el índice FULLTEXT, que solo existe en MySQL) y se pueden revertir.
+"""
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.database.database import Base
+from app.database.schema import alembic_config, current_revisions, head_revisions
+
+MYSQL_ONLY_INDEXES = {"ft_products_search"}
+
+
+def schema_differences(engine):
+    with engine.connect() as connection:
+        differences = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    return [
+        difference for difference in differences
+        if not (difference[0] == "add_index" and difference[1].name in MYSQL_ONLY_INDEXES)
+        and not (difference[0] == "remove_table" and difference[1].name == "alembic_version")
+    ]
+
+
+def test_upgrade_matches_models_and_downgrades(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    engine = create_engine(url)
+    config = alembic_config(url)
+
+    command.upgrade(config, "head")
+    assert current_revisions(engine) == head_revisions()
+    assert schema_differences(engine) == []
+
+    command.downgrade(config, "0001")
+    assert current_revisions(engine) == {"0001"}
+    command.upgrade(config, "head")
+    assert schema_differences(engine) == []
+    engine.dispose()
@@ -0,0 +1,67 @@
+# tests/test_pool_metrics.py
+"""
+InstrumentedQueuePool.resize() toca internos de QueuePool: estos tests fijan
+su comportamiento con la versión de SQLAlchemy de requirements.txt.
+"""
+import sqlite3
+
+from sqlalchemy import create_engine
+
+from app.database.pool_metrics import INTERVAL_SAMPLES, InstrumentedQueuePool, PoolMonitor
+
+
+def make_pool(pool_size: int, max_overflow: int = 5) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=pool_size, max_overflow=max_overflow
+    )
+
+
+def test_resize_up_moves_overflow_connections_into_the_pool():
+    pool = make_pool(2)
+    connections = [pool.connect() for _ in range(4)]
+    assert (pool.size(), pool.checkedout(), pool.overflow()) == (2, 4, 2)
+
+    pool.resize(4)
+    assert (pool.size(), pool.checkedout(), pool.overflow()) == (4, 4, 0)
+
+    for connection in connections:
+        connection.close()
+    assert (pool.checkedin(), pool.overflow()) == (4, 0)
+
+
+def test_resize_down_closes_idle_connections():
+    pool = make_pool(4)
+    connections = [pool.connect() for _ in range(4)]
+    for connection in connections:
+        connection.close()
+    assert pool.checkedin() == 4
+
+    pool.resize(1)
+    assert (pool.size(), pool.checkedin(), pool.overflow()) == (1, 1, 0)
+    # Se puede seguir usando hasta pool_size + max_overflow
+    connections = [pool.connect() for _ in range(6)]
+    assert (pool.checkedout(), pool.overflow()) == (6, 5)
+
+
+def test_resize_down_closes_busy_connections_when_returned():
+    pool = make_pool(3)
+    connections = [pool.connect() for _ in range(3)]
+
+    pool.resize(1)
+    assert (pool.size(), pool.checkedout(), pool.overflow()) == (1, 3, 2)
+
+    for connection in connections:
+        connection.close()
+    assert (pool.checkedin(), pool.checkedout(), pool.overflow()) == (1, 0, 0)
+
+
+def test_interval_samples_are_bounded_without_autoscaler():
+    monitor = PoolMonitor("test", create_engine("sqlite://"))
+    for _ in range(INTERVAL_SAMPLES + 10):
+        monitor.record_wait(0.001, 1)
+    monitor.record_timeout()
+
+    assert len(monitor._interval_waits) == INTERVAL_SAMPLES
+    p95, peak = monitor.take_interval()
+    assert (p95, peak) == (0.001, 1)
+    assert len(monitor._interval_waits) == 0
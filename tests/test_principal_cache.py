@@ -0,0 +1,44 @@
+# tests/test_principal_cache.py
+"""
+Los tokens admin no pasan por el principal cache: un cambio de rol hecho en
+otro worker (sin eventos del ORM en este proceso) se ve en la siguiente
+petición. Para tokens de usuario esa ventana es el TTL, acotado a
+MAX_TTL_SECONDS.
+"""
+import time
+
+from sqlalchemy import update
+
+import app.core.principal_cache as principal_cache_module
+from app.core.principal_cache import MAX_TTL_SECONDS, PrincipalCache, principal_cache
+from app.models.user_model import User
+
+from .conftest import auth_headers, create_user
+
+
+def test_admin_demoted_elsewhere_is_rejected_on_next_request(client, db, catalog):
+    admin = create_user(db, "staff", user_type="admin")
+    headers = auth_headers(admin, is_admin=True)
+    url = f"/api/v1/categories/{catalog['child_id']}"
+
+    assert client.patch(url, json={"description": "Parlantes"}, headers=headers).status_code == 200
+    assert principal_cache.stats()["size"] == 0
+
+    # UPDATE con Core, como lo vería un worker distinto del que hizo el cambio
+    db.execute(update(User).where(User.user_id == admin.user_id).values(user_type="common"))
+    db.commit()
+
+    assert client.patch(url, json={"description": "Audio"}, headers=headers).status_code == 403
+
+
+def test_user_entries_expire_within_max_ttl(db, monkeypatch):
+    cache = PrincipalCache(max_size=10, ttl_seconds=3600)
+    assert cache.ttl_seconds == MAX_TTL_SECONDS
+
+    user = create_user(db, "buyer")
+    cache.set("user:token", user, time.time() + 3600, "jti")
+    assert cache.get("user:token") is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(principal_cache_module.time, "monotonic", lambda: now + MAX_TTL_SECONDS)
+    assert cache.get("user:token") is None
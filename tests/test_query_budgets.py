@@ -0,0 +1,94 @@
+# tests/test_query_budgets.py
+"""
+Presupuestos de consultas (query_budget) con QUERY_DETECTOR_MODE=raise.
+
+Cada ruta que declara un presupuesto se llama con datos válidos; si supera
+su presupuesto (o repite una sentencia en un loop) el middleware lanza
+QueryBudgetExceeded y el TestClient la propaga, así el test falla.
+"""
+import pytest
+
+from app.database.query_stats import QUERY_BUDGET_KEY, QueryBudgetExceeded
+from main import app
+
+# (método, plantilla de la ruta) -> petición: path, params/json y si requiere admin
+REQUESTS = {
+    ("GET", "/api/v1/products/"): lambda ids: ("/api/v1/products/", {"params": {"category_id": ids["child_id"]}}),
+    ("GET", "/api/v1/products/suggest"): lambda ids: ("/api/v1/products/suggest", {"params": {"q": "aur"}}),
+    ("GET", "/api/v1/products/facets"): lambda ids: ("/api/v1/products/facets", {}),
+    ("GET", "/api/v1/products/{product_id}"): lambda ids: (f"/api/v1/products/{ids['product_id']}", {}),
+    ("GET", "/api/v1/products/search/{search_term}"): lambda ids: ("/api/v1/products/search/auriculares", {}),
+    ("GET", "/api/v1/products/featured/"): lambda ids: ("/api/v1/products/featured/", {}),
+    ("GET", "/api/v1/products/by-category/{category_id}"): lambda ids: (
+        f"/api/v1/products/by-category/{ids['child_id']}", {}
+    ),
+    ("GET", "/api/v1/products/by-supplier/{supplier_id}"): lambda ids: (
+        f"/api/v1/products/by-supplier/{ids['supplier_id']}", {}
+    ),
+    ("GET", "/api/v1/categories/"): lambda ids: ("/api/v1/categories/", {}),
+    ("GET", "/api/v1/categories/{category_id}"): lambda ids: (f"/api/v1/categories/{ids['root_id']}", {}),
+    ("GET", "/api/v1/categories/{category_id}/subcategories"): lambda ids: (
+        f"/api/v1/categories/{ids['root_id']}/subcategories", {}
+    ),
+    ("GET", "/api/v1/categories/root/all"): lambda ids: ("/api/v1/categories/root/all", {}),
+    ("GET", "/api/v1/categories/search/{search_term}"): lambda ids: ("/api/v1/categories/search/audio", {}),
+    ("GET", "/api/v1/categories/{category_id}/products-count"): lambda ids: (
+        f"/api/v1/categories/{ids['root_id']}/products-count", {}
+    ),
+    ("GET", "/api/v1/categories/{category_id}/tree"): lambda ids: (f"/api/v1/categories/{ids['root_id']}/tree", {}),
+    ("GET", "/api/v1/categories/{category_id}/ancestors"): lambda ids: (
+        f"/api/v1/categories/{ids['child_id']}/ancestors", {}
+    ),
+    ("PUT", "/api/v1/categories/{category_id}"): lambda ids: (
+        f"/api/v1/categories/{ids['child_id']}",
+        {"json": {"name": "Audio y video", "parent_category_id": ids["root_id"]}},
+    ),
+    ("PUT", "/api/v1/categories/{category_id}/move"): lambda ids: (f"/api/v1/categories/{ids['child_id']}/move", {}),
+    ("PATCH", "/api/v1/categories/{category_id}"): lambda ids: (
+        f"/api/v1/categories/{ids['child_id']}", {"json": {"description": "Parlantes y auriculares"}}
+    ),
+    ("DELETE", "/api/v1/categories/bulk/deactivate"): lambda ids: (
+        "/api/v1/categories/bulk/deactivate", {"json": ids["leaf_ids"]}
+    ),
+}
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def budgeted_routes():
+    routes = []
+    for route in app.routes:
+        extra = getattr(route, "openapi_extra", None) or {}
+        if QUERY_BUDGET_KEY in extra:
+            routes.extend((method, route.path) for method in sorted(route.methods))
+    return routes
+
+
+def find_route(method: str, path: str):
+    return next(
+        route for route in app.routes
+        if getattr(route, "path", None) == path and method in getattr(route, "methods", ())
+    )
+
+
+def test_every_budgeted_route_is_exercised():
+    missing = sorted(set(budgeted_routes()) - set(REQUESTS))
+    assert not missing, f"Add a request to REQUESTS for: {missing}"
+
+
+@pytest.mark.parametrize("method,path", budgeted_routes(), ids=lambda value: value)
+def test_route_stays_within_budget(client, catalog, admin_headers, method, path):
+    url, kwargs = REQUESTS[(method, path)](catalog)
+    headers = admin_headers if method in WRITE_METHODS else {}
+
+    response = client.request(method, url, headers=headers, **kwargs)
+
+    assert response.status_code < 400, response.text
+
+
+def test_route_over_budget_fails(client, catalog, monkeypatch):
+    route = find_route("GET", "/api/v1/categories/{category_id}/tree")
+    monkeypatch.setattr(route, "openapi_extra", {**route.openapi_extra, QUERY_BUDGET_KEY: 0})
+
+    with pytest.raises(QueryBudgetExceeded, match="exceed the route budget of 0"):
+        client.get(f"/api/v1/categories/{catalog['root_id']}/tree")
@@ -0,0 +1,51 @@
+# tests/test_rate_limiter.py
+"""
+RedisRateLimitBackend.reset borra por nombre las claves de la ventana actual
+y la anterior: un email con caracteres de glob (*?[]) no toca otras claves.
+El paquete redis es opcional; se usa un cliente en memoria con los comandos
+que necesita el backend.
+"""
+from app.core.rate_limiter import RedisRateLimitBackend
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self):
+        return self
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, pattern):
+        raise AssertionError("reset must not scan the keyspace")
+
+
+def make_backend() -> RedisRateLimitBackend:
+    backend = RedisRateLimitBackend.__new__(RedisRateLimitBackend)
+    backend._client = DictRedis()
+    return backend
+
+
+def test_reset_deletes_only_the_exact_window_keys():
+    backend = make_backend()
+    backend.hit("email:a*@example.com", limit=5, window_seconds=300)
+    backend.hit("email:ab@example.com", limit=5, window_seconds=300)
+
+    backend.reset("email:a*@example.com", window_seconds=300)
+
+    assert [key.split(":")[2] for key in backend._client.data] == ["ab@example.com"]
@@ -0,0 +1,21 @@
+# tests/test_server_timing.py
+"""Server-Timing: conteo y duraciones siempre; el SQL solo con DB_TESTING_MODE"""
+from app.config import settings
+
+
+def test_server_timing_hides_statements_from_clients(client, catalog, monkeypatch):
+    monkeypatch.setattr(settings, "db_testing_mode", False)
+
+    header = client.get(f"/api/v1/categories/{catalog['root_id']}").headers["Server-Timing"]
+
+    assert 'desc="1 queries"' in header
+    assert "db-slowest;dur=" in header
+    assert "SELECT" not in header
+
+
+def test_server_timing_includes_slowest_statement_in_testing_mode(client, catalog, monkeypatch):
+    monkeypatch.setattr(settings, "db_testing_mode", True)
+
+    header = client.get(f"/api/v1/categories/{catalog['root_id']}").headers["Server-Timing"]
+
+    assert 'db-slowest' in header and 'desc="SELECT' in header
@@ -0,0 +1,28 @@
+# tests/test_suggest.py
+"""
+SuggestionIndex.apply solo invalida los prefijos cacheados que abarcan las
+claves viejas o nuevas de las entradas que cambiaron.
+"""
+from app.search.changes import PRODUCT
+from app.search.suggest import SuggestionIndex
+
+
+def labels(index: SuggestionIndex, query: str):
+    return [suggestion["label"] for suggestion in index.suggest(query)]
+
+
+def test_apply_invalidates_only_affected_prefixes():
+    index = SuggestionIndex()
+    index.apply({
+        (PRODUCT, 1): {"name": "Auriculares", "sku": "AUR-1"},
+        (PRODUCT, 2): {"name": "Parlante", "sku": "PAR-2"},
+    })
+    assert labels(index, "au") == ["Auriculares"]
+    assert labels(index, "pa") == ["Parlante"]
+
+    index.apply({(PRODUCT, 1): {"name": "Audífonos", "sku": "AUD-1"}})
+
+    assert set(index._cache) == {"pa"}
+    assert labels(index, "au") == ["Audífonos"]
+    assert labels(index, "pa") == ["Parlante"]
+    assert index.stats()["cache_hits"] == 1
@@ -0,0 +1,66 @@
+# tests/test_token_revocation.py
+"""
+Revocación con el principal cache: un logout en un worker debe rechazarse en
+otro worker que ya tenía el usuario en su cache, una vez que este sincroniza
+la lista de revocación (run_revocation_sync).
+
+Cada worker se simula con su propio PrincipalCache y RevocationList, que se
+instalan en los módulos que los usan antes de cada petición.
+"""
+from contextlib import contextmanager
+
+import app.core.security as security
+import app.routes.auth.auth_tokens as auth_tokens
+from app.core.jwt_handler import create_access_token, create_refresh_token, token_claims
+from app.core.principal_cache import PrincipalCache
+from app.core.revocation import RevocationList
+from app.models.user_model import UserProfile
+
+from .conftest import create_user
+
+PROFILE_URL = "/api/v1/users/profile"
+
+
+class Worker:
+    def __init__(self, db):
+        self.principal_cache = PrincipalCache(max_size=16, ttl_seconds=60)
+        self.revocation_list = RevocationList(capacity=100, error_rate=0.001)
+        # Carga inicial del filtro, como al arrancar el worker
+        self.revocation_list.load(db)
+
+
+@contextmanager
+def running_on(worker: Worker, monkeypatch):
+    with monkeypatch.context() as patch:
+        for module in (security, auth_tokens):
+            patch.setattr(module, "principal_cache", worker.principal_cache)
+            patch.setattr(module, "revocation_list", worker.revocation_list)
+        yield
+
+
+def test_logout_on_one_worker_is_rejected_by_another(client, db, monkeypatch):
+    user = create_user(db, "buyer")
+    db.add(UserProfile(user_id=user.user_id, first_name="Ana"))
+    db.commit()
+    claims = token_claims(user)
+    headers = {"Authorization": f"Bearer {create_access_token(claims)}"}
+    refresh_token = create_refresh_token(claims)
+
+    worker_a, worker_b = Worker(db), Worker(db)
+
+    with running_on(worker_b, monkeypatch):
+        assert client.get(PROFILE_URL, headers=headers).status_code == 200
+    assert worker_b.principal_cache.stats()["size"] == 1
+
+    with running_on(worker_a, monkeypatch):
+        response = client.post("/api/v1/auth/logout", json={"refresh_token": refresh_token}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["revoked_tokens"] == 2
+        assert client.get(PROFILE_URL, headers=headers).status_code == 401
+
+    worker_b.revocation_list.sync(db)
+    with running_on(worker_b, monkeypatch):
+        response = client.get(PROFILE_URL, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token revoked"
+    assert worker_b.principal_cache.stats()["hits"] == 1